@@ -1,13 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from brownie import network
+
 from .factory import CoboFactory
 from .gnosissafe import GnosisSafe
 from .ownable import BaseOwnable
-from .utils import FACTORY_ADDRESS, Operation, abi_encode_with_sig, printline
+from .utils import FACTORY_ADDRESS, Operation, abi_encode_with_sig
 
 
 class CoboAccount(BaseOwnable):
-    def __init__(self, account_addr, delegate=None) -> None:
-        super().__init__(account_addr)
+    def __init__(self, account_addr, delegate=None, chain=None) -> None:
+        super().__init__(account_addr, chain)
         self.delegate = delegate
+        self.hint_cache = None
+
+    def enable_hint_cache(self, ttl=None, simulator=None):
+        """
+        Reuse hints of the same call shape instead of an eth_call per
+        transaction. See `HintCache`.
+        """
+        from .hint import HINT_VERSION_TTL, HintCache
+
+        if ttl is None:
+            ttl = HINT_VERSION_TTL
+        self.hint_cache = HintCache(self, ttl, simulator)
+        return self.hint_cache
 
     @property
     def authorizer(self):
@@ -43,6 +60,15 @@ class CoboAccount(BaseOwnable):
         assert delegate, "delegate not set"
         tx = [flag, to, value, data, b"", extra]
 
+        if use_hint and self.hint_cache is not None:
+            tx[4] = self.hint_cache.get_hint(delegate, tx)
+            try:
+                return self.contract.execTransaction(tx, {"from": delegate})
+            except Exception:
+                # The hint may be stale.
+                self.hint_cache.drop(delegate, tx)
+                raise
+
         if use_hint:
             ret = self.contract.execTransaction.call(tx, {"from": delegate})
 
@@ -77,22 +103,112 @@ class CoboAccount(BaseOwnable):
         data = tx["data"]
         self.exec_transaction(to, data, value, flag, use_hint, extra, delegate)
 
+    def exec_transactions(
+        self,
+        txs,
+        use_hint=True,
+        extra=b"",
+        delegate=None,
+        multisend=False,
+        gas_limit=None,
+        required_confs=1,
+        max_workers=8,
+    ):
+        """
+        Send many transactions from one delegate back to back.
+
+        `txs` are dicts like brownie `build()` output or tuples of
+        `(to, data[, value[, flag]])`. Hints and gas are estimated in
+        parallel, transactions are sent with sequential nonces without
+        waiting, then receipts are awaited concurrently.
+
+        With `multisend`, all txs are packed into one MultiSend delegatecall.
+        """
+        from .hint import eth_call_simulator
+        from .multisend import multisend_call, normalize_tx
+
+        if delegate is None:
+            delegate = self.delegate
+        assert delegate, "delegate not set"
+
+        if multisend:
+            chain_id = self.chain.id if self.chain else network.chain.id
+            to, data = multisend_call(txs, chain_id)
+            txs = [(to, data, 0, Operation.DELEGATE_CALL)]
+        txs = [normalize_tx(tx) for tx in txs]
+
+        calls = [[flag, to, value, data, b"", extra] for flag, to, value, data in txs]
+        if use_hint:
+            if self.hint_cache is not None:
+                hints = self.hint_cache.precompute(delegate, calls)
+            else:
+                hints = eth_call_simulator(self, calls, delegate)
+            for call, hint in zip(calls, hints):
+                call[4] = hint
+
+        method = self.contract.execTransaction
+        with ThreadPoolExecutor(max_workers) as pool:
+            if gas_limit is None:
+                gas_limits = list(
+                    pool.map(
+                        lambda call: method.estimate_gas(call, {"from": delegate}),
+                        calls,
+                    )
+                )
+            else:
+                gas_limits = [gas_limit] * len(calls)
+
+            nonce = self.web3.eth.get_transaction_count(str(delegate), "pending")
+            receipts = []
+            for i, (call, gas) in enumerate(zip(calls, gas_limits)):
+                receipt = method(
+                    call,
+                    {
+                        "from": delegate,
+                        "nonce": nonce + i,
+                        "gas_limit": gas,
+                        "required_confs": 0,
+                    },
+                )
+                receipts.append(receipt)
+
+            if required_confs > 0:
+                list(pool.map(lambda r: r.wait(required_confs), receipts))
+        return receipts
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} {self.contract.address}>"
 
     def dump(self, full=False):
         super().dump(full)
-        print("Authorizer:", self.authorizer)
-        print("Role manager:", self.role_manager)
-        print("Delegates:", ",".join(self.delegates))
+        authorizer, role_manager, delegates = self._calls(
+            "authorizer", "roleManager", "getAllDelegates"
+        )
+        print("Authorizer:", authorizer.result)
+        print("Role manager:", role_manager.result)
+        print("Delegates:", ",".join(delegates.result))
+
+        if full:
+            from .fanout import dump_all
+
+            dump_all([role_manager.result, authorizer.result], full, chain=self.chain)
+
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        authorizer, role_manager, delegates = self._calls(
+            "authorizer", "roleManager", "getAllDelegates"
+        )
+        config["Authorizer"] = str(authorizer.result)
+        config["Role manager"] = str(role_manager.result)
+        config["Delegates"] = [str(x) for x in delegates.result]
 
         if full:
-            printline()
-            from .autocontract import dump
+            from .export import build_children
 
-            dump(self.role_manager, full)
-            printline()
-            dump(self.authorizer, full)
+            config["Children"] = build_children(
+                [role_manager.result, authorizer.result], full, chain=self.chain
+            )
+        return config
 
     # Implement `transfer` interface of brownie account.
     def transfer(
@@ -114,13 +230,15 @@ class CoboAccount(BaseOwnable):
 
 
 class CoboSafeAccount(CoboAccount):
-    def __init__(self, account_addr, delegate=None, safe_owner=None) -> None:
-        super().__init__(account_addr, delegate)
+    def __init__(
+        self, account_addr, delegate=None, safe_owner=None, chain=None
+    ) -> None:
+        super().__init__(account_addr, delegate, chain)
         self.safe_owner = safe_owner
 
     @property
     def safe(self):
-        return GnosisSafe(self.owner, self.safe_owner)
+        return GnosisSafe(self.owner, self.safe_owner, self.chain)
 
     def enable(self):
         self.safe.enable_module(self.address)
@@ -137,8 +255,8 @@ class CoboSafeAccount(CoboAccount):
 
 
 class CoboSmartAccount(CoboAccount):
-    def __init__(self, account_addr, delegate=None) -> None:
-        super().__init__(account_addr, delegate)
+    def __init__(self, account_addr, delegate=None, chain=None) -> None:
+        super().__init__(account_addr, delegate, chain)
 
     @classmethod
     def create(cls, owner_address, factory_address=None):
@@ -0,0 +1,589 @@
+import asyncio
+
+import eth_utils
+from hexbytes import HexBytes
+
+from .authorizer import BaseAuthorizer
+from .cache import MetadataCache, metadata_cache
+from .chains import ChainContract, ContractFunction
+from .utils import ETH_ADDRESS, FACTORY_ADDRESS, ZERO_ADDRESS, b32, s32
+
+# Never change for a deployed contract, read through the metadata cache.
+IMMUTABLE_FUNCS = ("NAME", "VERSION", "TYPE", "symbol")
+
+# Max eth_call requests in flight on one AsyncConnection.
+AIO_MAX_CONCURRENCY = 16
+
+
+class AsyncConnection(object):
+    """
+    One async web3 connection on AsyncHTTPProvider. Async wrappers take it
+    explicitly instead of the global brownie network.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri,
+        block="latest",
+        request_kwargs=None,
+        max_concurrency=AIO_MAX_CONCURRENCY,
+    ) -> None:
+        from web3 import AsyncHTTPProvider, Web3
+        from web3.eth import AsyncEth
+
+        self.endpoint_uri = endpoint_uri
+        self.block = block
+        self.max_concurrency = max_concurrency
+        self.w3 = Web3(
+            AsyncHTTPProvider(endpoint_uri, request_kwargs),
+            modules={"eth": (AsyncEth,)},
+            middlewares=[],
+        )
+        self._chain_id = None
+
+        # Created in the event loop of the first call.
+        self._semaphore = None
+
+    @property
+    async def chain_id(self):
+        if self._chain_id is None:
+            self._chain_id = await self.w3.eth.chain_id
+        return self._chain_id
+
+    async def call(self, to, data, block=None):
+        """
+        eth_call, at most `max_concurrency` in flight and within the rate
+        limit of the endpoint, however many are gathered.
+        """
+        from .fanout import get_rate_limiter
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        tx = {"to": eth_utils.to_checksum_address(to), "data": HexBytes(data)}
+        async with self._semaphore:
+            limiter = get_rate_limiter(self.endpoint_uri)
+            if limiter is not None:
+                await limiter.acquire_async()
+            return bytes(await self.w3.eth.call(tx, block or self.block))
+
+    async def cached_call(self, to, data, block=None):
+        """
+        `call()` through the persistent metadata cache, for immutable results.
+        """
+        key = MetadataCache._key(await self.chain_id, to, "0x" + data.hex())
+        ret = metadata_cache().get(*key)
+        if ret is None:
+            ret = await self.call(to, data, block)
+            metadata_cache().set(*key, ret)
+        return ret
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.endpoint_uri}>"
+
+
+class AsyncContractFunction(ContractFunction):
+    async def __call__(self, *args, block=None):
+        data = self.encode_input(*args)
+        conn = self.contract.conn
+        if not args and self.name in IMMUTABLE_FUNCS:
+            ret = await conn.cached_call(self.contract.address, data, block)
+        else:
+            ret = await conn.call(self.contract.address, data, block)
+        return self.decode_output(ret)
+
+
+class AsyncContract(ChainContract):
+    """
+    Read-only contract of a bundled ABI on an AsyncConnection.
+    `await contract.owner()` returns the same value as brownie's.
+    """
+
+    method_class = AsyncContractFunction
+
+    @property
+    def conn(self):
+        return self.chain
+
+
+async def _try(coro):
+    try:
+        return await coro
+    except Exception:
+        return None
+
+
+class AsyncBaseOwnable(object):
+    # Async wrapper classes registered by contract NAME() and authorizer TYPE().
+    _NAME_REGISTRY = {}
+    _TYPE_REGISTRY = {}
+
+    def __init__(self, conn, addr) -> None:
+        self.conn = conn
+        self.contract = AsyncContract(conn, self.abi_name(), addr)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        AsyncBaseOwnable._NAME_REGISTRY[cls.abi_name()] = cls
+
+        typ = cls.__dict__.get("TYPE")
+        if typ is not None:
+            AsyncBaseOwnable._TYPE_REGISTRY.setdefault(typ, cls)
+
+    @classmethod
+    def abi_name(cls):
+        # AsyncCoboFactory -> CoboFactory
+        return cls.__name__[len("Async") :]
+
+    @property
+    def address(self):
+        return self.contract.address
+
+    @property
+    async def name(self):
+        return s32(await _try(self.contract.NAME()))
+
+    @property
+    async def version(self):
+        return await self.contract.VERSION()
+
+    @property
+    async def owner(self):
+        return await self.contract.owner()
+
+    @property
+    async def pending_owner(self):
+        return await self.contract.pendingOwner()
+
+    async def get_config(self, full=False):
+        name, version, owner, pending = await asyncio.gather(
+            _try(self.contract.NAME()),
+            self.contract.VERSION(),
+            _try(self.contract.owner()),
+            _try(self.contract.pendingOwner()),
+        )
+        if pending and pending != ZERO_ADDRESS:
+            owner = pending
+        return {
+            "Name": s32(name),
+            "Address": str(self.address),
+            "Version": int(version),
+            "Owner": str(owner) if owner else None,
+        }
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.address}>"
+
+
+async def async_convert(conn, addr):
+    """
+    Async version of `autocontract.convert`.
+    """
+    contract = AsyncContract(conn, "BaseAuthorizer", addr)
+    name, typ = await asyncio.gather(
+        _try(contract.NAME()),
+        _try(contract.TYPE()),
+    )
+
+    if name is None:
+        # Not valid IVersion contract.
+        return None
+
+    cls = AsyncBaseOwnable._NAME_REGISTRY.get(s32(name))
+    if cls:
+        return cls(conn, addr)
+
+    if typ is None:
+        return AsyncBaseOwnable(conn, addr)
+
+    cls = AsyncBaseOwnable._TYPE_REGISTRY.get(s32(typ))
+    if cls:
+        return cls(conn, addr)
+
+    return AsyncBaseAuthorizer(conn, addr)
+
+
+async def build_model(conn, addr, full=True):
+    """
+    Async version of `export.build_model`.
+    """
+    obj = await async_convert(conn, addr)
+    if obj is None:
+        return None
+    return await obj.get_config(full)
+
+
+async def build_children(conn, addrs, full=True):
+    addrs = list(dict.fromkeys(addrs))
+    return list(await asyncio.gather(*[build_model(conn, a, full) for a in addrs]))
+
+
+class AsyncERC20(object):
+    def __init__(self, conn, addr) -> None:
+        self.conn = conn
+        self.contract = AsyncContract(conn, "ERC20", addr)
+
+    @property
+    def address(self):
+        return self.contract.address
+
+    @property
+    async def symbol(self):
+        return await self.contract.symbol()
+
+
+async def get_symbols(conn, addrs):
+    """
+    Async version of `authorizer.get_symbols`.
+    """
+
+    async def _symbol(addr):
+        if addr.lower() == ETH_ADDRESS.lower():
+            return "ETH(%s)" % addr
+        symbol = await _try(AsyncERC20(conn, addr).symbol)
+        if symbol is None:
+            return addr
+        return "%s(%s)" % (symbol, addr)
+
+    return list(await asyncio.gather(*[_symbol(addr) for addr in addrs]))
+
+
+class AsyncCoboFactory(AsyncBaseOwnable):
+    def __init__(self, conn, address=FACTORY_ADDRESS) -> None:
+        super().__init__(conn, address)
+
+    async def get_address(self, name):
+        addr = await self.contract.getLatestImplementation(b32(name))
+        if addr == ZERO_ADDRESS:
+            return None
+        return addr
+
+    async def get_all_names(self):
+        names = await self.contract.getAllNames()
+        return [s32(i) for i in names]
+
+    async def get_cobosafe(self, safe):
+        addr = await self.contract.getLastRecord(safe, b32("CoboSafeAccount"))
+        if addr == ZERO_ADDRESS:
+            return None
+        return addr
+
+    async def get_all_impls(self):
+        names = await self.get_all_names()
+        addrs = await asyncio.gather(*[self.get_address(name) for name in names])
+        return dict(zip(names, addrs))
+
+    async def get_config(self, full=False):
+        config, impls = await asyncio.gather(
+            super().get_config(full), self.get_all_impls()
+        )
+        config["Implementations"] = {
+            name: str(addr) if addr else None for name, addr in impls.items()
+        }
+        return config
+
+
+class AsyncFlatRoleManager(AsyncBaseOwnable):
+    async def get_roles(self, delegate):
+        return await self.contract.getRoles(delegate)
+
+    async def get_all_roles(self):
+        roles = await self.contract.getAllRoles()
+        return [s32(i) for i in roles]
+
+    async def get_all_delegates(self):
+        return await self.contract.getDelegates()
+
+    async def get_delegate_roles(self):
+        """
+        Returns delegate -> roles.
+        """
+        delegates = await self.get_all_delegates()
+        roles = await asyncio.gather(*[self.get_roles(d) for d in delegates])
+        return {d: [s32(i) for i in r] for d, r in zip(delegates, roles)}
+
+    async def get_config(self, full=False):
+        config, roles, delegate_roles = await asyncio.gather(
+            super().get_config(full), self.get_all_roles(), self.get_delegate_roles()
+        )
+        config["Roles"] = roles
+        config["Delegates"] = {str(d): r for d, r in delegate_roles.items()}
+        return config
+
+
+class AsyncCoboAccount(AsyncBaseOwnable):
+    @property
+    async def authorizer(self):
+        return await self.contract.authorizer()
+
+    @property
+    async def role_manager(self):
+        return await self.contract.roleManager()
+
+    @property
+    async def delegates(self):
+        return await self.contract.getAllDelegates()
+
+    @property
+    async def wallet_address(self):
+        return await self.contract.getAccountAddress()
+
+    async def get_config(self, full=False):
+        config, authorizer, role_manager, delegates = await asyncio.gather(
+            super().get_config(full),
+            self.authorizer,
+            self.role_manager,
+            self.delegates,
+        )
+        config["Authorizer"] = str(authorizer)
+        config["Role manager"] = str(role_manager)
+        config["Delegates"] = [str(x) for x in delegates]
+
+        if full:
+            config["Children"] = await build_children(
+                self.conn, [role_manager, authorizer], full
+            )
+        return config
+
+
+class AsyncCoboSafeAccount(AsyncCoboAccount):
+    @property
+    async def safe(self):
+        return await AsyncGnosisSafe.load(self.conn, await self.owner)
+
+
+class AsyncCoboSmartAccount(AsyncCoboAccount):
+    pass
+
+
+class AsyncGnosisSafe(object):
+    """
+    Read-only async GnosisSafe. Use `await AsyncGnosisSafe.load()` to fetch
+    threshold and owners.
+    """
+
+    def __init__(self, conn, address) -> None:
+        self.conn = conn
+        self.contract = AsyncContract(conn, "GnosisSafe", address)
+        self.threshold = None
+        self.owners = None
+
+    @classmethod
+    async def load(cls, conn, address):
+        safe = cls(conn, address)
+        safe.threshold, safe.owners = await asyncio.gather(
+            safe.contract.getThreshold(), safe.contract.getOwners()
+        )
+        return safe
+
+    @classmethod
+    async def load_many(cls, conn, addresses):
+        return list(await asyncio.gather(*[cls.load(conn, a) for a in addresses]))
+
+    @property
+    def address(self):
+        return self.contract.address
+
+    async def is_module_enabled(self, module):
+        return await self.contract.isModuleEnabled(module)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.address}>"
+
+
+class AsyncBaseAuthorizer(AsyncBaseOwnable):
+    @property
+    async def caller(self):
+        return await self.contract.caller()
+
+    @property
+    async def tag(self):
+        return s32(await _try(self.contract.tag()))
+
+    @property
+    async def flag(self):
+        return await self.contract.flag()
+
+    @property
+    async def type(self):
+        return s32(await _try(self.contract.TYPE()))
+
+    async def get_config(self, full=False):
+        config, caller, flag, typ, tag = await asyncio.gather(
+            super().get_config(full), self.caller, self.flag, self.type, self.tag
+        )
+        config.update(
+            {
+                "Caller": str(caller),
+                "Flags": BaseAuthorizer.format_flag(flag),
+                "Type": typ,
+                "Tag": tag,
+            }
+        )
+        return config
+
+
+class AsyncArgusRootAuthorizer(AsyncBaseAuthorizer):
+    @property
+    async def role_manager(self):
+        """
+        AsyncFlatRoleManager of the caller account, or None if the caller is
+        not a Cobo account.
+        """
+        caller = await self.caller
+        account = await async_convert(self.conn, caller)
+        if not isinstance(account, AsyncCoboAccount):
+            return None
+        return AsyncFlatRoleManager(self.conn, await account.role_manager)
+
+    async def load_role_graph(self):
+        """
+        Returns (roles, delegate -> roles).
+        """
+        role_list = []
+        delegate_to_roles = {}
+
+        roles = await _try(self.contract.getAllRoles())
+        if roles is not None:
+            role_list += [s32(i) for i in roles]
+
+        try:
+            role_mngr = await self.role_manager
+            if role_mngr is not None:
+                roles, delegate_to_roles = await asyncio.gather(
+                    role_mngr.get_all_roles(), role_mngr.get_delegate_roles()
+                )
+                role_list += roles
+        except Exception:
+            pass
+
+        return set(role_list), delegate_to_roles
+
+    async def get_authorizers(self, role, delegatecall=False):
+        return await self.contract.getAllAuthorizers(delegatecall, b32(role))
+
+    async def get_all_authorizers(self, delegatecall=False, roles=None):
+        if roles is None:
+            roles, _ = await self.load_role_graph()
+        # Roles are a set, sorted like `ArgusRootAuthorizer.get_all_authorizers`.
+        roles = sorted(roles)
+        auths = await asyncio.gather(
+            *[self.get_authorizers(role, delegatecall) for role in roles]
+        )
+        return dict(zip(roles, auths))
+
+    async def get_config(self, full=False):
+        config, (roles, delegate_to_roles) = await asyncio.gather(
+            super().get_config(full), self.load_role_graph()
+        )
+        role_auths = await self.get_all_authorizers(roles=roles)
+        config["Authorizers"] = {
+            role: [str(a) for a in auths] for role, auths in role_auths.items()
+        }
+        config["Delegates"] = {
+            str(delegate): roles for delegate, roles in delegate_to_roles.items()
+        }
+
+        if full:
+            addrs = [auth for auths in role_auths.values() for auth in auths]
+            config["Children"] = await build_children(self.conn, addrs, full)
+        return config
+
+
+class AsyncTransferAuthorizer(AsyncBaseAuthorizer):
+    TYPE = "TransferType"
+
+    @property
+    async def tokens(self):
+        return await self.contract.getAllToken()
+
+    async def get_receivers(self, token):
+        return await self.contract.getTokenReceivers(token)
+
+    async def get_config(self, full=False):
+        config, tokens = await asyncio.gather(super().get_config(full), self.tokens)
+        receivers = await asyncio.gather(*[self.get_receivers(t) for t in tokens])
+        config["Token receivers"] = {
+            str(token): [str(r) for r in rs] for token, rs in zip(tokens, receivers)
+        }
+        return config
+
+
+class AsyncFuncAuthorizer(AsyncBaseAuthorizer):
+    TYPE = "FunctionType"
+
+    @property
+    async def contracts(self):
+        return await self.contract.getAllContracts()
+
+    async def get_funcs(self, contract):
+        funcs = await self.contract.getFuncsByContract(contract)
+        return ["0x" + f.hex()[:8] for f in funcs]
+
+    async def get_config(self, full=False):
+        config, contracts = await asyncio.gather(
+            super().get_config(full), self.contracts
+        )
+        funcs = await asyncio.gather(*[self.get_funcs(c) for c in contracts])
+        config["Contract functions"] = {
+            str(contract): f for contract, f in zip(contracts, funcs)
+        }
+        return config
+
+
+class AsyncBaseACL(AsyncBaseAuthorizer):
+    TYPE = "CommonType"
+
+    @property
+    async def contracts(self):
+        return await self.contract.contracts()
+
+    async def get_config(self, full=False):
+        config, contracts = await asyncio.gather(
+            super().get_config(full), self.contracts
+        )
+        config["Contracts"] = [str(x) for x in contracts]
+        return config
+
+
+class AsyncDEXBaseACL(AsyncBaseACL):
+    TYPE = "DexType"
+
+    @property
+    async def in_tokens(self):
+        return await self.contract.getSwapInTokens()
+
+    @property
+    async def out_tokens(self):
+        return await self.contract.getSwapOutTokens()
+
+    async def get_config(self, full=False):
+        config, in_tokens, out_tokens = await asyncio.gather(
+            super().get_config(full), self.in_tokens, self.out_tokens
+        )
+        config["In tokens"] = [str(x) for x in in_tokens]
+        config["Out tokens"] = [str(x) for x in out_tokens]
+        return config
+
+
+class AsyncFarmingBaseACL(AsyncBaseACL):
+    TYPE = "CommonType"
+
+    @property
+    async def whitelist_ids(self):
+        return [str(x) for x in await self.contract.getPoolIdWhiteList()]
+
+    @property
+    async def whitelist_addresses(self):
+        return [str(x) for x in await self.contract.getPoolAddressWhiteList()]
+
+    async def get_config(self, full=False):
+        config, ids, addrs = await asyncio.gather(
+            super().get_config(full), self.whitelist_ids, self.whitelist_addresses
+        )
+        config["Whitelist IDs"] = [int(x) for x in ids]
+        config["Whitelist addresses"] = addrs
+        return config
+
+
+class AsyncStargateWithdrawAuthorizer(AsyncFarmingBaseACL):
+    pass
@@ -1,11 +1,9 @@
 from .account import CoboSafeAccount, CoboSmartAccount
+from .multicall import Call, call_many, multicall
 from .ownable import ERC20, BaseOwnable
 from .rolemanager import FlatRoleManager
-from .utils import ETH_ADDRESS, b32, printline, s32
-import yaml
-import os
+from .utils import ETH_ADDRESS, b32, s32
 
-BASE = os.getcwd()
 
 def get_symbol(addr):
     if addr.lower() == ETH_ADDRESS.lower():
@@ -16,6 +14,27 @@ def get_symbol(addr):
         return addr
 
 
+def get_symbols(addrs, chain=None):
+    """
+    Batch version of `get_symbol`.
+    """
+    tokens = [addr for addr in addrs if addr.lower() != ETH_ADDRESS.lower()]
+    try:
+        symbols = dict(zip(tokens, ERC20.get_symbols(tokens, chain)))
+    except Exception:
+        symbols = {}
+
+    r = []
+    for addr in addrs:
+        if addr.lower() == ETH_ADDRESS.lower():
+            r.append("ETH(%s)" % addr)
+        elif symbols.get(addr) is not None:
+            r.append("%s(%s)" % (symbols[addr], addr))
+        else:
+            r.append(addr)
+    return r
+
+
 class BaseAuthorizer(BaseOwnable):
     # flags
     HAS_PRE_CHECK_MASK = 0x1
@@ -41,104 +60,195 @@ class BaseAuthorizer(BaseOwnable):
 
     @property
     def flag_str(self):
-        flag = self.flag
+        return self.format_flag(self.flag)
+
+    @classmethod
+    def format_flag(cls, flag):
         flags = []
-        if flag & self.HAS_PRE_CHECK_MASK > 0:
+        if flag & cls.HAS_PRE_CHECK_MASK > 0:
             flags.append("PreCheck")
-        if flag & self.HAS_POST_CHECK_MASK > 0:
+        if flag & cls.HAS_POST_CHECK_MASK > 0:
             flags.append("PostCheck")
-        if flag & self.HAS_PRE_PROC_MASK > 0:
+        if flag & cls.HAS_PRE_PROC_MASK > 0:
             flags.append("PreProcess")
-        if flag & self.HAS_POST_PROC_MASK > 0:
+        if flag & cls.HAS_POST_PROC_MASK > 0:
             flags.append("PostProcess")
-        if flag & self.SUPPORT_HINT_MASK > 0:
+        if flag & cls.SUPPORT_HINT_MASK > 0:
             flags.append("SupportHint")
         return ",".join(flags)
 
     @property
     def type(self):
         try:
-            return s32(self.contract.TYPE())
+            return s32(Call(self.contract.TYPE, cache=True).result)
         except Exception:
             return None
 
     def dump(self, full=False):
         super().dump(full)
-        print("Caller:", self.caller)
-        print("Flags:", self.flag_str)
-        print("Type:", self.type)
-        print("Tag:", self.tag)
-
-    def export_config(self, filename=None):
-        if filename == None:
-            filename = self.contract.name
-        super().export_config(filename)
-        f = open(f'{BASE}/{filename}_config.yaml','a')
-        yaml.dump({"Caller":str(self.caller), "Flags":self.flag_str, "Type":self.type, "Tag":self.tag}, f)
+        caller, flag, typ, tag = self._calls("caller", "flag", "TYPE", "tag")
+        print("Caller:", caller.result)
+        print("Flags:", self.format_flag(flag.result))
+        print("Type:", s32(typ.result) if typ.ok else None)
+        print("Tag:", s32(tag.result) if tag.ok else None)
+
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        caller, flag, typ, tag = self._calls("caller", "flag", "TYPE", "tag")
+        config.update(
+            {
+                "Caller": str(caller.result),
+                "Flags": self.format_flag(flag.result),
+                "Type": s32(typ.result) if typ.ok else None,
+                "Tag": s32(tag.result) if tag.ok else None,
+            }
+        )
+        return config
+
 
 class ArgusRootAuthorizer(BaseAuthorizer):
+    def __init__(self, addr, chain=None) -> None:
+        super().__init__(addr, chain)
+        self._role_manager = None
+        self._role_graph = None
+
     @property
-    def roles(self):
+    def role_manager(self):
+        """
+        FlatRoleManager of the caller account, or None if the caller is not
+        a Cobo account.
+        """
+        if self._role_manager is None:
+            caller = self.caller
+            chain = self.chain
+            if CoboSafeAccount.match(caller, chain) or CoboSmartAccount.match(
+                caller, chain
+            ):
+                role_mngr = CoboSafeAccount(caller, chain=chain).role_manager
+                self._role_manager = FlatRoleManager(role_mngr, chain)
+        return self._role_manager
+
+    def refresh(self):
+        """
+        Drop the cached role graph.
+        """
+        self._role_graph = None
+
+    def load_role_graph(self):
+        """
+        Load all roles and delegate -> roles in bulk.
+        Cached until `refresh()` is called.
+        """
+        if self._role_graph is not None:
+            return self._role_graph
+
         role_list = []
-        try:
-            roles = self.contract.getAllRoles()
-            role_list += [s32(i) for i in roles]
-        except Exception:
-            pass
+        delegate_to_roles = {}
+
+        (roles,) = self._calls("getAllRoles")
+        if roles.ok:
+            role_list += [s32(i) for i in roles.result]
 
         try:
-            caller = self.caller
-            if CoboSafeAccount.match(caller) or CoboSmartAccount.match(caller):
-                role_mngr = CoboSafeAccount(caller).role_manager
-                role_list += FlatRoleManager(role_mngr).get_all_roles()
+            role_mngr = self.role_manager
+            if role_mngr is not None:
+                roles, delegates = multicall(
+                    [
+                        Call(role_mngr.contract.getAllRoles),
+                        Call(role_mngr.contract.getDelegates),
+                    ]
+                )
+                role_list += [s32(i) for i in roles.result]
+
+                delegates = delegates.result
+                calls = call_many(role_mngr.contract.getRoles, delegates)
+                for delegate, call in zip(delegates, calls):
+                    delegate_to_roles[delegate] = [s32(i) for i in call.result]
         except Exception:
             pass
-        return set(role_list)
-    
+
+        self._role_graph = (set(role_list), delegate_to_roles)
+        return self._role_graph
+
+    @property
+    def roles(self):
+        roles, _ = self.load_role_graph()
+        return roles
+
     @property
     def delegates(self):
-        delegate_to_role = {}
-        try:
-            caller = self.caller
-            if CoboSafeAccount.match(caller) or CoboSmartAccount.match(caller):
-                role_mngr = CoboSafeAccount(caller).role_manager
-                delegate_list = FlatRoleManager(role_mngr).get_all_delegates()
-                for delegate in delegate_list:
-                    roles = FlatRoleManager(role_mngr).get_roles(delegate)
-                    delegate_to_role[delegate] = ",".join(s32(i) for i in roles)
-        except Exception:
-            pass
-        return delegate_to_role
+        _, delegate_to_roles = self.load_role_graph()
+        return {
+            delegate: ",".join(roles) for delegate, roles in delegate_to_roles.items()
+        }
 
     def get_authorizers(self, role, delegatecall=False):
         return self.contract.getAllAuthorizers(delegatecall, b32(role))
 
+    def get_all_authorizers(self, delegatecall=False):
+        """
+        Returns role -> authorizers of all roles in batch.
+        """
+        # Roles are a set, sorted for a stable order.
+        roles = sorted(self.roles)
+        calls = call_many(
+            self.contract.getAllAuthorizers, [(delegatecall, b32(r)) for r in roles]
+        )
+        return {role: call.result for role, call in zip(roles, calls)}
+
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        self.refresh()
+        _, delegate_to_roles = self.load_role_graph()
+        role_auths = self.get_all_authorizers()
+        config["Authorizers"] = {
+            role: [str(a) for a in auths] for role, auths in role_auths.items()
+        }
+        config["Delegates"] = {
+            str(delegate): roles for delegate, roles in delegate_to_roles.items()
+        }
+
+        if full:
+            from .export import build_children
+
+            addrs = [auth for auths in role_auths.values() for auth in auths]
+            config["Children"] = build_children(addrs, full, chain=self.chain)
+        return config
+
     def dump(self, full=False):
-        addr = self.contract.address
         super().dump(full)
 
+        # Fetch the role graph once per dump.
+        self.refresh()
+        delegates = self.delegates
+
         print("Authorizers:")
-        addrs = []
-        for role in self.roles:
-            auths = self.get_authorizers(role)
-            addrs += auths
+        role_auths = self.get_all_authorizers()
+        addrs = [auth for auths in role_auths.values() for auth in auths]
+
+        names = {}
+        name_calls = multicall(
+            [
+                Call(BaseOwnable(auth, self.chain).contract.NAME, cache=True)
+                for auth in set(addrs)
+            ]
+        )
+        for call in name_calls:
+            names[call.target] = s32(call.result) if call.ok else None
+
+        for role, auths in role_auths.items():
             s = []
             for auth in auths:
-                name = BaseOwnable(auth).name
-                s.append(f"{name}({auth})")
+                s.append(f"{names[auth]}({auth})")
             print(f"  {role}", ", ".join(s))
         print("\nDelegates:")
-        for delegate in self.delegates.keys():
-            s = []
-            print(f"   {delegate}", self.delegates[delegate])
+        for delegate, roles in delegates.items():
+            print(f"   {delegate}", roles)
 
         if full:
-            for addr in addrs:
-                printline()
-
-                from .autocontract import dump
+            from .fanout import dump_all
 
-                dump(addr, full)
+            dump_all(addrs, full, chain=self.chain)
 
 
 class TransferAuthorizer(BaseAuthorizer):
@@ -154,10 +264,34 @@ class TransferAuthorizer(BaseAuthorizer):
     def dump(self, full=False):
         super().dump(full)
         print("Token -> Receivers:")
-        for token in self.tokens:
-            receivers = self.get_receivers(token)
-            token = get_symbol(token)
-            print(f"  {token}", ",".join(receivers))
+        tokens = self.tokens
+        calls = call_many(self.contract.getTokenReceivers, tokens)
+        for token, call in zip(get_symbols(tokens, self.chain), calls):
+            print(f"  {token}", ",".join(call.result))
+
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        tokens = self.tokens
+        calls = call_many(self.contract.getTokenReceivers, tokens)
+        config["Token receivers"] = {
+            str(token): [str(r) for r in call.result]
+            for token, call in zip(tokens, calls)
+        }
+        return config
+
+    def get_columns(self):
+        """
+        Token -> receiver rows as packed address columns.
+        """
+        from .columnar import AddressColumn
+
+        tokens = self.tokens
+        calls = call_many(self.contract.getTokenReceivers, tokens)
+        token_column, receiver_column = AddressColumn(), AddressColumn()
+        for token, call in zip(tokens, calls):
+            token_column.extend([token] * len(call.result))
+            receiver_column.extend(call.result)
+        return {"token": token_column, "receiver": receiver_column}
 
 
 class FuncAuthorizer(BaseAuthorizer):
@@ -167,18 +301,48 @@ class FuncAuthorizer(BaseAuthorizer):
     def contracts(self):
         return self.contract.getAllContracts()
 
+    @classmethod
+    def format_funcs(cls, funcs):
+        return ["0x" + f.hex()[:8] for f in funcs]
+
     def get_funcs(self, contract):
         funcs = self.contract.getFuncsByContract(contract)
-        funcs = ["0x" + f.hex()[:8] for f in funcs]
-        return funcs
+        return self.format_funcs(funcs)
 
     def dump(self, full=False):
         super().dump(full)
         print("Contract -> Functions:")
-        for contract in self.contracts:
-            funcs = self.get_funcs(contract)
+        contracts = self.contracts
+        calls = call_many(self.contract.getFuncsByContract, contracts)
+        for contract, call in zip(contracts, calls):
+            funcs = self.format_funcs(call.result)
             print(f"  {contract}", ",".join(funcs))
 
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        contracts = self.contracts
+        calls = call_many(self.contract.getFuncsByContract, contracts)
+        config["Contract functions"] = {
+            str(contract): self.format_funcs(call.result)
+            for contract, call in zip(contracts, calls)
+        }
+        return config
+
+    def get_columns(self):
+        """
+        Contract -> function rows, contracts as a packed address column
+        and selectors as a uint32 array.
+        """
+        from .columnar import AddressColumn, selector_column
+
+        contracts = self.contracts
+        calls = call_many(self.contract.getFuncsByContract, contracts)
+        contract_column, selectors = AddressColumn(), []
+        for contract, call in zip(contracts, calls):
+            contract_column.extend([contract] * len(call.result))
+            selectors += call.result
+        return {"contract": contract_column, "selector": selector_column(selectors)}
+
 
 class BaseACL(BaseAuthorizer):
     TYPE = "CommonType"
@@ -189,14 +353,19 @@ class BaseACL(BaseAuthorizer):
 
     def dump(self, full=False):
         super().dump(full)
-        print("Contracts:", ",".join(self.contracts))
+        (contracts,) = self._calls("contracts")
+        print("Contracts:", ",".join(contracts.result))
+
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        config["Contracts"] = [str(x) for x in self.contracts]
+        return config
+
+    def get_columns(self):
+        from .columnar import AddressColumn
+
+        return {"contract": AddressColumn(self.contracts)}
 
-    def export_config(self, filename=None):
-        if filename == None:
-            filename = self.contract.name
-        super().export_config(filename)
-        f = open(f'{BASE}/{filename}_config.yaml','a')
-        yaml.dump({"Contracts":[str(x) for x in self.contracts]}, f)
 
 class DEXBaseACL(BaseACL):
     TYPE = "DexType"
@@ -211,17 +380,36 @@ class DEXBaseACL(BaseACL):
 
     @property
     def in_token_symbols(self):
-        return [get_symbol(c) for c in self.in_tokens]
+        return get_symbols(self.in_tokens, self.chain)
 
     @property
     def out_token_symbols(self):
-        return [get_symbol(c) for c in self.out_tokens]
+        return get_symbols(self.out_tokens, self.chain)
 
     def dump(self, full=False):
         super().dump(full)
-
-        print("In tokens:", ",".join(self.in_token_symbols))
-        print("Out tokens:", ",".join(self.out_token_symbols))
+        in_tokens, out_tokens = self._calls("getSwapInTokens", "getSwapOutTokens")
+        in_tokens, out_tokens = list(in_tokens.result), list(out_tokens.result)
+        # Symbols of both lists in one batch.
+        symbols = get_symbols(in_tokens + out_tokens, self.chain)
+        print("In tokens:", ",".join(symbols[: len(in_tokens)]))
+        print("Out tokens:", ",".join(symbols[len(in_tokens) :]))
+
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        in_tokens, out_tokens = self._calls("getSwapInTokens", "getSwapOutTokens")
+        config["In tokens"] = [str(x) for x in in_tokens.result]
+        config["Out tokens"] = [str(x) for x in out_tokens.result]
+        return config
+
+    def get_columns(self):
+        from .columnar import AddressColumn
+
+        columns = super().get_columns()
+        in_tokens, out_tokens = self._calls("getSwapInTokens", "getSwapOutTokens")
+        columns["in_token"] = AddressColumn(in_tokens.result)
+        columns["out_token"] = AddressColumn(out_tokens.result)
+        return columns
 
 class FarmingBaseACL(BaseACL):
     TYPE = "CommonType"
@@ -236,23 +424,28 @@ class FarmingBaseACL(BaseACL):
 
     def dump(self, full=False):
         super().dump(full)
-        print("Whitelist IDs:", ", ".join(self.whitelist_ids))
-        print("Whitelist addresses:", ", ".join(self.whitelist_addresses))
+        ids, addrs = self._calls("getPoolIdWhiteList", "getPoolAddressWhiteList")
+        print("Whitelist IDs:", ", ".join(str(x) for x in ids.result))
+        print("Whitelist addresses:", ", ".join(str(x) for x in addrs.result))
+
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        ids, addrs = self._calls("getPoolIdWhiteList", "getPoolAddressWhiteList")
+        config["Whitelist IDs"] = [int(x) for x in ids.result]
+        config["Whitelist addresses"] = [str(x) for x in addrs.result]
+        return config
+
+    def get_columns(self):
+        from .columnar import AddressColumn, uint_column
+
+        columns = super().get_columns()
+        ids, addrs = self._calls("getPoolIdWhiteList", "getPoolAddressWhiteList")
+        # Pool IDs are uint256, packed in 32 bytes if they overflow uint64.
+        columns["pool_id"] = uint_column(ids.result)
+        columns["pool_address"] = AddressColumn(addrs.result)
+        return columns
 
-    def export_config(self, filename=None):
-        if filename == None:
-            filename = self.contract.name
-        super().export_config(filename)
-        f = open(f'{BASE}/{filename}_config.yaml','a')
-        yaml.dump({"Whitelist IDs":[int(x) for x in self.whitelist_ids], "Whitelist addresses":self.whitelist_addresses}, f)
 
 class StargateWithdrawAuthorizer(FarmingBaseACL):
     def dump(self, full=False):
         super().dump(full)
-
-    def export_config(self, filename=None):
-        if filename == None:
-            filename = self.contract.name
-        super().export_config(filename)
-        f = open(f'{BASE}/{filename}_config.yaml','a')
-        
\ No newline at end of file
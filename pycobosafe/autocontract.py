@@ -1,49 +1,50 @@
 from .authorizer import BaseAuthorizer
+from .multicall import Call, multicall
 from .ownable import BaseOwnable
+from .snapshot import current_snapshot, snapshot
+from .utils import load_contract, s32
 
 
-def convert(addr):
-    def _sub_classes(cls):
-        for sub_cls in cls.__subclasses__():
-            yield sub_cls
-            yield from _sub_classes(sub_cls)
+def convert(addr, chain=None):
+    # BaseAuthorizer ABI has both NAME() and TYPE(), fetch them in one batch.
+    contract = load_contract("BaseAuthorizer", addr, chain=chain)
+    name, typ = multicall(
+        [Call(contract.NAME, cache=True), Call(contract.TYPE, cache=True)]
+    )
 
-    sub_cls = set(_sub_classes(BaseOwnable))
-
-    base = BaseOwnable(addr)
-    name = base.name
-
-    if name is None:
+    if not name.ok:
         # Not valid IVersion contract.
         return None
 
-    for cls in sub_cls:
-        if cls.__name__ == name:
-            return cls(addr)
+    cls = BaseOwnable.get_class_by_name(s32(name.result))
+    if cls:
+        return cls(addr, chain=chain)
 
-    base_auth = BaseAuthorizer(addr)
-    typ = base_auth.type
+    if not typ.ok:
+        return BaseOwnable(addr, chain)
 
-    if typ is None:
-        return base
+    cls = BaseOwnable.get_class_by_type(s32(typ.result))
+    if cls:
+        return cls(addr, chain=chain)
 
-    for cls in sub_cls:
-        if getattr(cls, "TYPE", None) == typ:
-            return cls(addr)
+    return BaseAuthorizer(addr, chain)
 
-    return base_auth
 
+def dump(addr, full=False, chain=None):
+    if chain is None and current_snapshot() is None:
+        # Dump all at the same block.
+        with snapshot():
+            return dump(addr, full)
 
-def dump(addr, full=False):
-    obj = convert(addr)
+    obj = convert(addr, chain)
     if obj:
         obj.dump(full)
     else:
         print("No valid IVersion contract.")
 
-def export_config(addr):
+def export_config(addr, filename=None):
     obj = convert(addr)
     if obj:
-        obj.export_config(obj.name)
+        obj.export_config(filename or obj.name)
     else:
         print("No valid IVersion contract.")
\ No newline at end of file
@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Set PYCOBOSAFE_CACHE to empty string to disable the persistent cache.
+CACHE_PATH = os.getenv(
+    "PYCOBOSAFE_CACHE",
+    os.path.join(os.path.expanduser("~"), ".pycobosafe", "cache.db"),
+)
+
+# Seconds before an entry is re-fetched from chain.
+CACHE_TTL = 7 * 24 * 3600
+
+# Max entries kept on disk, least recently used ones are evicted first.
+CACHE_MAX_ENTRIES = 100000
+
+# Max entries kept in memory in front of the database.
+MEMORY_MAX_ENTRIES = 4096
+
+# Local dev chains (ganache, hardhat, anvil), redeployed at the same addresses
+# on every restart, so they are only cached in memory.
+DEV_CHAIN_IDS = (1337, 31337)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    chain_id INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    data BLOB NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (chain_id, address, selector)
+)
+"""
+
+
+class MetadataCache(object):
+    """
+    Persistent cache of raw eth_call results of immutable contract metadata,
+    such as NAME(), VERSION(), TYPE() and ERC20 symbol().
+    Keyed by (chain_id, address, selector).
+    """
+
+    def __init__(
+        self, path=CACHE_PATH, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(_SCHEMA)
+                self._db.commit()
+            except sqlite3.Error:
+                # Read-only or broken file system, work without persistence.
+                self._db = None
+
+    @staticmethod
+    def _key(chain_id, address, selector):
+        return (int(chain_id), str(address).lower(), str(selector).lower())
+
+    def _remember(self, key, data, created):
+        self._memory[key] = (data, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > MEMORY_MAX_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """
+        Returns {key: data} of the cached ones in `keys`.
+        """
+        keys = [self._key(*key) for key in keys]
+        r = {}
+        now = time.time()
+        with self._lock:
+            missing = []
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and now - entry[1] < self.ttl:
+                    self._memory.move_to_end(key)
+                    r[key] = entry[0]
+                else:
+                    self._memory.pop(key, None)
+                    if key[0] not in DEV_CHAIN_IDS:
+                        missing.append(key)
+
+            if self._db is None or not missing:
+                return r
+
+            found = []
+            try:
+                for key in missing:
+                    row = self._db.execute(
+                        "SELECT data, created FROM metadata "
+                        "WHERE chain_id = ? AND address = ? AND selector = ?",
+                        key,
+                    ).fetchone()
+                    if row and now - row[1] < self.ttl:
+                        r[key] = bytes(row[0])
+                        self._remember(key, r[key], row[1])
+                        found.append(key)
+
+                if found:
+                    self._db.executemany(
+                        "UPDATE metadata SET accessed = ? "
+                        "WHERE chain_id = ? AND address = ? AND selector = ?",
+                        [(now, *key) for key in found],
+                    )
+                    self._db.commit()
+            except sqlite3.Error:
+                pass
+        return r
+
+    def get(self, chain_id, address, selector):
+        key = self._key(chain_id, address, selector)
+        return self.get_many([key]).get(key)
+
+    def set(self, chain_id, address, selector, data):
+        key = self._key(chain_id, address, selector)
+        data = bytes(data)
+        now = time.time()
+        with self._lock:
+            self._remember(key, data, now)
+            if self._db is None or key[0] in DEV_CHAIN_IDS:
+                return
+
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, data, now, now),
+                )
+                self._db.commit()
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._evict(now)
+            except sqlite3.Error:
+                pass
+
+    def _evict(self, now):
+        self._db.execute("DELETE FROM metadata WHERE created < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM metadata WHERE rowid IN ("
+            "SELECT rowid FROM metadata ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self._db.commit()
+
+    def evict(self):
+        with self._lock:
+            if self._db is not None:
+                self._evict(time.time())
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM metadata")
+                self._db.commit()
+
+
+_CACHE = None
+
+
+def metadata_cache():
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = MetadataCache()
+    return _CACHE
@@ -0,0 +1,261 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import eth_abi
+import eth_utils
+import requests
+from hexbytes import HexBytes
+
+from .utils import CHAIN_ALIASES, load_abi
+
+# Keep-alive connections kept per chain endpoint.
+POOL_CONNECTIONS = 16
+
+# Timeout in seconds of one RPC request.
+RPC_TIMEOUT = 30
+
+# Max contracts of bundled ABI kept per chain.
+CHAIN_CONTRACT_CACHE_SIZE = 1024
+
+
+def _abi_type(param):
+    typ = param["type"]
+    if typ.startswith("tuple"):
+        inner = ",".join(_abi_type(c) for c in param["components"])
+        return f"({inner}){typ[len('tuple'):]}"
+    return typ
+
+
+def _checksum(typ, value):
+    if typ == "address":
+        return eth_utils.to_checksum_address(value)
+    if typ == "address[]":
+        return [eth_utils.to_checksum_address(v) for v in value]
+    return value
+
+
+class ContractFunction(object):
+    """
+    ABI encoding of one contract function, with the same `encode_input` /
+    `decode_output` interface as brownie contract methods.
+    """
+
+    def __init__(self, contract, abi) -> None:
+        self.contract = contract
+        self.abi = abi
+        self.name = abi["name"]
+        self.selector = eth_utils.function_abi_to_4byte_selector(abi)
+        self.input_types = [_abi_type(i) for i in abi["inputs"]]
+        self.output_types = [_abi_type(o) for o in abi.get("outputs", [])]
+
+    @property
+    def _address(self):
+        return self.contract.address
+
+    @property
+    def _name(self):
+        return f"{self.contract.name}.{self.name}"
+
+    @property
+    def is_view(self):
+        return self.abi.get("stateMutability") in ("view", "pure")
+
+    def encode_input(self, *args):
+        return self.selector + eth_abi.encode(self.input_types, args)
+
+    def decode_output(self, data):
+        ret = eth_abi.decode(self.output_types, HexBytes(data))
+        ret = [_checksum(t, v) for t, v in zip(self.output_types, ret)]
+        if len(ret) == 1:
+            return ret[0]
+        return tuple(ret)
+
+
+class ChainMethod(ContractFunction):
+    """
+    Read-only contract method on a `Chain`.
+    """
+
+    @property
+    def chain(self):
+        return self.contract.chain
+
+    def call(self, *args, block_identifier=None):
+        data = self.encode_input(*args)
+        data = self.chain.call(self._address, data, block_identifier)
+        return self.decode_output(data)
+
+    def __call__(self, *args):
+        if not self.is_view:
+            raise TypeError(
+                f"{self._name} is not a view function, chain handles are "
+                "read-only. Send transactions with the brownie network."
+            )
+        return self.call(*args)
+
+
+class ChainContract(object):
+    """
+    Contract of an ABI on a `Chain`, used like a brownie Contract for reads.
+    """
+
+    method_class = ChainMethod
+
+    def __init__(self, chain, name, address, abi=None) -> None:
+        self.chain = chain
+        self.name = name
+        self.address = eth_utils.to_checksum_address(str(address))
+        self._functions = {}
+        for item in abi or load_abi(name):
+            if item["type"] == "function":
+                # The first one of overloaded functions wins.
+                self._functions.setdefault(item["name"], item)
+
+    def __getattr__(self, name):
+        abi = self.__dict__.get("_functions", {}).get(name)
+        if abi is None:
+            raise AttributeError(f"{self.name} has no function {name}")
+        return self.method_class(self, abi)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name} {self.address}>"
+
+
+def get_chain_host(name):
+    """
+    RPC host of the brownie network `name`, with env vars expanded.
+    """
+    from brownie import network
+
+    from .utils import setup_brownie
+
+    setup_brownie()
+    config = network.main.CONFIG.networks[name]
+    return os.path.expandvars(config["host"])
+
+
+class Chain(object):
+    """
+    A connection to one chain with its own keep-alive HTTP session,
+    independent of the global brownie network.
+    """
+
+    def __init__(self, name, host=None, block="latest") -> None:
+        from web3 import HTTPProvider, Web3
+
+        from .fanout import RATE_LIMIT_MIDDLEWARE, rate_limit_middleware
+
+        self.name = CHAIN_ALIASES.get(name, name)
+        self.host = host or get_chain_host(self.name)
+        self.block = block
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_CONNECTIONS
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.web3 = Web3(
+            HTTPProvider(
+                self.host, request_kwargs={"timeout": RPC_TIMEOUT}, session=self.session
+            )
+        )
+        self.web3.middleware_onion.add(rate_limit_middleware, RATE_LIMIT_MIDDLEWARE)
+
+        self._id = None
+        self._contracts = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def id(self):
+        if self._id is None:
+            self._id = self.web3.eth.chain_id
+        return self._id
+
+    def warm(self):
+        """
+        Open the connection and fetch the chain id ahead of use.
+        """
+        return self.id
+
+    def call(self, to, data, block=None):
+        tx = {"to": eth_utils.to_checksum_address(str(to)), "data": HexBytes(data)}
+        return bytes(self.web3.eth.call(tx, block or self.block))
+
+    def contract(self, name, address, abi=None):
+        if abi is not None:
+            return ChainContract(self, name, address, abi)
+
+        address = eth_utils.to_checksum_address(str(address))
+        key = (name, address)
+        with self._lock:
+            contract = self._contracts.get(key)
+            if contract is not None:
+                self._contracts.move_to_end(key)
+                return contract
+
+        contract = ChainContract(self, name, address)
+        with self._lock:
+            # Another thread may have created it meanwhile.
+            contract = self._contracts.setdefault(key, contract)
+            while len(self._contracts) > CHAIN_CONTRACT_CACHE_SIZE:
+                self._contracts.popitem(last=False)
+        return contract
+
+    def close(self):
+        self.session.close()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name}>"
+
+
+class ChainPool(object):
+    """
+    One pre-warmed `Chain` per network name, shared by all threads.
+    """
+
+    def __init__(self) -> None:
+        self._chains = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        name = CHAIN_ALIASES.get(name, name)
+        with self._lock:
+            chain = self._chains.get(name)
+            if chain is None:
+                chain = Chain(name)
+                self._chains[name] = chain
+        return chain
+
+    def warm(self, names):
+        """
+        Connect to chains in parallel, returns the `Chain`s.
+        """
+        chains = [self.get(name) for name in names]
+        if chains:
+            with ThreadPoolExecutor(len(chains)) as pool:
+                list(pool.map(Chain.warm, chains))
+        return chains
+
+    def close(self):
+        with self._lock:
+            for chain in self._chains.values():
+                chain.close()
+            self._chains.clear()
+
+
+_POOL = ChainPool()
+
+
+def chain_pool():
+    return _POOL
+
+
+def get_chain(name):
+    """
+    Returns the pooled `Chain` of the network name or alias, eg: "eth".
+    """
+    return _POOL.get(name)
@@ -0,0 +1,243 @@
+import ast
+import os
+import struct
+import sys
+from array import array
+
+import eth_utils
+
+# Size of one packed address.
+ADDRESS_SIZE = 20
+
+# Size of one packed uint256.
+UINT256_SIZE = 32
+
+NPY_MAGIC = b"\x93NUMPY"
+
+# NPY headers are padded to a multiple of this for aligned memory-mapping.
+NPY_ALIGN = 64
+
+
+def selector_to_int(selector):
+    """
+    uint32 of the first 4 bytes of a selector or a bytes32 func value.
+    """
+    if isinstance(selector, str):
+        selector = bytes.fromhex(selector[2:10])
+    return int.from_bytes(bytes(selector[:4]), "big")
+
+
+def format_selector(value):
+    return "0x%08x" % value
+
+
+def selector_column(selectors):
+    """
+    Selectors as a uint32 array, 4 bytes per selector.
+    """
+    return array("I", [selector_to_int(s) for s in selectors])
+
+
+class AddressColumn(object):
+    """
+    Addresses packed in one buffer, 20 bytes each.
+    Items are checksummed when read.
+    """
+
+    def __init__(self, addrs=()) -> None:
+        self.buffer = bytearray()
+        self.extend(addrs)
+
+    @classmethod
+    def frombytes(cls, data):
+        assert len(data) % ADDRESS_SIZE == 0, "Bad packed addresses size"
+        column = cls()
+        column.buffer = bytearray(data)
+        return column
+
+    @staticmethod
+    def pack(addr):
+        if isinstance(addr, (bytes, bytearray)):
+            data = bytes(addr)
+        else:
+            data = bytes.fromhex(str(addr)[2:])
+        assert len(data) == ADDRESS_SIZE, f"Bad address {addr}"
+        return data
+
+    def append(self, addr):
+        self.buffer += self.pack(addr)
+
+    def extend(self, addrs):
+        for addr in addrs:
+            self.append(addr)
+
+    def __len__(self):
+        return len(self.buffer) // ADDRESS_SIZE
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("AddressColumn index out of range")
+        data = self.buffer[i * ADDRESS_SIZE : (i + 1) * ADDRESS_SIZE]
+        return eth_utils.to_checksum_address(bytes(data))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __contains__(self, addr):
+        data = self.pack(addr)
+        i = self.buffer.find(data)
+        while i != -1:
+            if i % ADDRESS_SIZE == 0:
+                return True
+            i = self.buffer.find(data, i + 1)
+        return False
+
+    def __eq__(self, other):
+        return isinstance(other, AddressColumn) and self.buffer == other.buffer
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {len(self)} addresses>"
+
+
+class Uint256Column(object):
+    """
+    uint256 values packed big-endian in one buffer, 32 bytes each, for
+    values which do not fit in a uint64 array.
+    """
+
+    def __init__(self, values=()) -> None:
+        self.buffer = bytearray()
+        self.extend(values)
+
+    @classmethod
+    def frombytes(cls, data):
+        assert len(data) % UINT256_SIZE == 0, "Bad packed uint256 size"
+        column = cls()
+        column.buffer = bytearray(data)
+        return column
+
+    def append(self, value):
+        self.buffer += int(value).to_bytes(UINT256_SIZE, "big")
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def __len__(self):
+        return len(self.buffer) // UINT256_SIZE
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Uint256Column index out of range")
+        data = self.buffer[i * UINT256_SIZE : (i + 1) * UINT256_SIZE]
+        return int.from_bytes(data, "big")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        return isinstance(other, Uint256Column) and self.buffer == other.buffer
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {len(self)} values>"
+
+
+def uint_column(values):
+    """
+    Values as a uint64 array, or as a `Uint256Column` if any is too large.
+    """
+    values = [int(v) for v in values]
+    if all(0 <= v < 2**64 for v in values):
+        return array("Q", values)
+    return Uint256Column(values)
+
+
+def _npy_descr(column):
+    if isinstance(column, AddressColumn):
+        return f"|V{ADDRESS_SIZE}"
+    if isinstance(column, Uint256Column):
+        return f"|V{UINT256_SIZE}"
+    kind = "u" if column.typecode.isupper() else "i"
+    if column.typecode in "fd":
+        kind = "f"
+    endian = "<" if sys.byteorder == "little" else ">"
+    return f"{endian}{kind}{column.itemsize}"
+
+
+def write_npy(path, column):
+    """
+    Write an `array` or `AddressColumn` as a 1-d NumPy .npy file, which
+    `numpy.load(path, mmap_mode="r")` maps without copying.
+    Addresses and uint256 are stored as 20-byte and 32-byte void items.
+    """
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (
+        _npy_descr(column),
+        len(column),
+    )
+    # magic + version + header length + header + "\n"
+    size = len(NPY_MAGIC) + 2 + 2 + len(header) + 1
+    header += " " * (-size % NPY_ALIGN) + "\n"
+
+    with open(path, "wb") as f:
+        f.write(NPY_MAGIC + b"\x01\x00")
+        f.write(struct.pack("<H", len(header)))
+        f.write(header.encode("latin1"))
+        if isinstance(column, (AddressColumn, Uint256Column)):
+            f.write(column.buffer)
+        else:
+            column.tofile(f)
+
+
+def read_npy(path):
+    """
+    Read a .npy file written by `write_npy`.
+    """
+    with open(path, "rb") as f:
+        assert f.read(len(NPY_MAGIC)) == NPY_MAGIC, f"{path} is not a .npy file"
+        f.read(2)
+        (size,) = struct.unpack("<H", f.read(2))
+        header = ast.literal_eval(f.read(size).decode("latin1"))
+        data = f.read()
+
+    descr = header["descr"]
+    if descr == f"|V{ADDRESS_SIZE}":
+        return AddressColumn.frombytes(data)
+    if descr == f"|V{UINT256_SIZE}":
+        return Uint256Column.frombytes(data)
+
+    kind, itemsize = descr[1], int(descr[2:])
+    for code in "BHILQbhilqfd":
+        column = array(code)
+        if column.itemsize == itemsize and kind == _npy_descr(column)[1]:
+            column.frombytes(data)
+            if descr[0] != _npy_descr(column)[0]:
+                column.byteswap()
+            return column
+    raise ValueError(f"Unsupported dtype {descr}")
+
+
+def export_columns(addr, directory, chain=None):
+    """
+    Export the whitelists of an authorizer as one .npy file per column,
+    eg: contract.npy and selector.npy of a FuncAuthorizer.
+    Returns the paths written.
+    """
+    from .autocontract import convert
+
+    obj = convert(addr, chain)
+    if not hasattr(obj, "get_columns"):
+        raise ValueError(f"{addr} has no whitelist columns")
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, column in obj.get_columns().items():
+        path = os.path.join(directory, f"{name}.npy")
+        write_npy(path, column)
+        paths.append(path)
+    return paths
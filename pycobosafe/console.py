@@ -1,12 +1,8 @@
 import cmd
 import os
 
-from web3 import Web3
-
-from .account import CoboSafeAccount, CoboSmartAccount
-from .factory import CoboFactory
-from .gnosissafe import GnosisSafe
 from .utils import (
+    CHAIN_ALIASES,
     FACTORY_ADDRESS,
     b32,
     connect_new_chain,
@@ -17,6 +13,18 @@ from .utils import (
     rand_salt,
 )
 
+# Commands run without connecting to the network.
+OFFLINE_COMMANDS = (
+    "help",
+    "exit",
+    "debug",
+    "sh",
+    "glob",
+    "chain",
+    "cobosafe",
+    "delegate",
+)
+
 
 class CoboSafeConsole(cmd.Cmd):
     """
@@ -25,9 +33,13 @@ class CoboSafeConsole(cmd.Cmd):
 
     prompt = "cobosafe > "
 
-    def __init__(self) -> None:
+    def __init__(self, chain=None) -> None:
         super().__init__()
 
+        # Network to connect on the first command that needs it.
+        self.chain = chain
+        self._connected_chain = None
+
         self.debug = False
         self.factory_address = FACTORY_ADDRESS
         self.delegate_address = None
@@ -44,10 +56,17 @@ class CoboSafeConsole(cmd.Cmd):
 
     def _arg_as_addr(self, arg, default_value=None):
         if arg:
-            assert Web3.isAddress(arg), f"{arg} is not valid address"
-            return Web3.toChecksumAddress(arg)
+            from eth_utils import is_address, to_checksum_address
+
+            assert is_address(arg), f"{arg} is not valid address"
+            return to_checksum_address(arg)
         return default_value
 
+    def _connect(self):
+        if self.chain and self.chain != self._connected_chain:
+            connect_new_chain(self.chain)
+            self._connected_chain = self.chain
+
     def onecmd(self, line):
         try:
             # ! run system shell.
@@ -57,6 +76,9 @@ class CoboSafeConsole(cmd.Cmd):
             elif line.startswith("?"):
                 line = "py " + line[1:]
 
+            words = line.split()
+            if words and words[0] not in OFFLINE_COMMANDS:
+                self._connect()
             return super().onecmd(line)
         except Exception as e:
             print("Error: ", e)
@@ -112,6 +134,10 @@ class CoboSafeConsole(cmd.Cmd):
         """
         ipython: Start ipython console.
         """
+        from .account import CoboSafeAccount
+        from .factory import CoboFactory
+        from .gnosissafe import GnosisSafe
+
         console = self  # noqa
         if self.safe_address:
             safe = GnosisSafe(self.safe_address)  # noqa
@@ -149,25 +175,18 @@ class CoboSafeConsole(cmd.Cmd):
         chain : Print current chain config.
         chain <chain> : Change chain.
         """
-        ALIAS = {
-            "eth": "mainnet",
-            "arb": "arbitrum-main",
-            "op": "optimism-main",
-            "bsc": "bsc-main",
-            "matic": "polygon-main",
-            "avax": "avax-main",
-        }
-        new_chain = ALIAS.get(arg, arg)
+        new_chain = CHAIN_ALIASES.get(arg, arg)
 
         chains = get_all_support_chains()
-        cur_chain = get_current_chain()
+        cur_chain = self.chain or get_current_chain()
         if new_chain not in chains:
             print("Current network:", cur_chain)
             print("Supported networks: ", ",".join(chains))
             return
 
         if new_chain and new_chain != cur_chain:
-            connect_new_chain(new_chain)
+            # Connected on the next command that needs the network.
+            self.chain = new_chain
             print(f"Change to {new_chain}")
 
             # Clear this if we change chain.
@@ -179,7 +198,7 @@ class CoboSafeConsole(cmd.Cmd):
         """
         glob: Print current global config.
         """
-        print("Network:", get_current_chain())
+        print("Network:", self.chain or get_current_chain())
         print("Factory:", self.factory_address)
         print("CoboSafe:", self.cobosafe_address)
         print("Safe:", self.safe_address)
@@ -209,6 +228,8 @@ class CoboSafeConsole(cmd.Cmd):
 
             # auto set cobosafe.
             try:
+                from .factory import CoboFactory
+
                 cobosafe = CoboFactory().get_cobosafe(addr)
                 if cobosafe:
                     self.do_cobosafe(cobosafe)
@@ -247,6 +268,8 @@ class CoboSafeConsole(cmd.Cmd):
         """
         factory [<address>]: Print CoboFactory information.
         """
+        from .factory import CoboFactory
+
         factory_address = self._arg_as_addr(arg)
         if factory_address and factory_address != self.factory_address:
             print(f"Factory changes from {self.factory_address} to {factory_address}")
@@ -277,7 +300,38 @@ class CoboSafeConsole(cmd.Cmd):
 
         from .autocontract import export_config
 
-        export_config(addr)
+        export_config(addr, args[1] if len(args) > 1 else None)
+
+    def do_export(self, arg):
+        """
+        export <address> <path>: Export the whole Argus tree to a JSON/YAML file.
+        """
+        addr, path = arg.split()
+        addr = self._arg_as_addr(addr)
+
+        from .export import export_model
+
+        export_model(addr, path)
+        print(f"Exported to {path}")
+
+    def do_watch(self, arg):
+        """
+        watch [<cobosafe>] [<seconds>]: Print Argus config changes until Ctrl+C.
+        """
+        from .watch import POLL_INTERVAL, Watcher
+
+        args = arg.split()
+        addr = self._arg_as_addr(args[0] if args else None, self.cobosafe_address)
+        assert addr, "cobosafe not set"
+        interval = float(args[1]) if len(args) > 1 else POLL_INTERVAL
+
+        watcher = Watcher(addr)
+        print(f"Watching {addr} from block {watcher.block}, Ctrl+C to stop.")
+        try:
+            for change in watcher.watch(interval):
+                print(change)
+        except KeyboardInterrupt:
+            print()
 
     # Cobo safe interaction commands
 
@@ -285,6 +339,8 @@ class CoboSafeConsole(cmd.Cmd):
         """
         create_cobosafe <safe>: Create CoboSafeAccount
         """
+        from .account import CoboSafeAccount
+
         safe = self._arg_as_addr(arg, self.safe_address)
         assert safe, "safe not set"
         a = CoboSafeAccount.create(safe)
@@ -295,6 +351,8 @@ class CoboSafeConsole(cmd.Cmd):
         """
         create_cobosmart <owner>: Create CoboSmartAccount
         """
+        from .account import CoboSmartAccount
+
         owner = self._arg_as_addr(arg, self.delegate_address)
         assert owner, "owner not set"
         a = CoboSmartAccount.create(owner)
@@ -302,6 +360,9 @@ class CoboSafeConsole(cmd.Cmd):
         a.dump()
 
     def _call_helper(self, func, args):
+        from .factory import CoboFactory
+        from .gnosissafe import GnosisSafe
+
         assert self.safe_address, "safe not set"
         safe = GnosisSafe(self.safe_address)
         factory = CoboFactory()
@@ -314,6 +375,8 @@ class CoboSafeConsole(cmd.Cmd):
             init argus for safe
             (Call ArgusAccountHelper.initArgus)
         """
+        from .factory import CoboFactory
+
         factory = CoboFactory()
         self._call_helper("initArgus(address,bytes32)", [factory.address, rand_salt()])
         cobosafe = factory.get_cobosafe(self.safe_address)
@@ -357,11 +420,13 @@ class CoboSafeConsole(cmd.Cmd):
             Create authorizer for CoboSafe
             (Call ArgusAccountHelper.createAuthorizer)
         """
+        from .factory import CoboFactory
+
         assert arg, "name not set"
         name = b32(arg)
-        factory = CoboFactory()
+        factory = CoboFactory(self.factory_address)
         tag = rand_salt()
-        auth_addr = factory.contract.getCreate2Address(self.safe_address, name, tag)
+        auth_addr = factory.get_create2_address(arg, tag, self.safe_address)
         self._call_helper(
             "createAuthorizer(address,address,bytes32,bytes32)",
             [self.factory_address, self.cobosafe_address, name, tag],
@@ -396,3 +461,47 @@ class CoboSafeConsole(cmd.Cmd):
             "removeAuthorizer(address,address,bool,bytes32[])",
             [self.cobosafe_address, auth, True, [role]],
         )
+
+    def _make_plan(self, path):
+        from .factory import CoboFactory
+        from .plan import load_desired, make_plan
+
+        assert self.cobosafe_address, "cobosafe not set"
+        helper = CoboFactory(self.factory_address).get_address("ArgusAccountHelper")
+        plan = make_plan(self.cobosafe_address, load_desired(path), helper)
+        print(plan)
+        return plan
+
+    def do_plan(self, arg):
+        """
+        plan <desired state file> :
+            Print changes from CoboSafe config to the desired state.
+        """
+        assert arg, "file not set"
+        self._make_plan(arg)
+
+    def do_apply(self, arg):
+        """
+        apply <desired state file> [<owner keystore> ...] :
+            Apply changes to the desired state in one Safe transaction,
+            signed by the owner keystores and sent by the default account.
+            (Batched ArgusAccountHelper calls by MultiSend)
+        """
+        from getpass import getpass
+
+        from brownie import accounts
+
+        from .gnosissafe import GnosisSafe
+        from .plan import apply_plan
+
+        args = arg.split()
+        assert args, "file not set"
+        assert self.safe_address, "safe not set"
+        plan = self._make_plan(args[0])
+        if not plan.steps:
+            print("Nothing to change.")
+            return
+
+        keystores = [(path, getpass(f"Password of {path}: ")) for path in args[1:]]
+        safe = GnosisSafe(self.safe_address)
+        apply_plan(plan, safe, keystores=keystores, sender=accounts.default)
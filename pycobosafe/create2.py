@@ -0,0 +1,148 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import eth_utils
+
+# EIP-1167 minimal proxy init code around the 20-byte implementation.
+CLONE_PREFIX = bytes.fromhex("3d602d80600a3d3981f3363d3d373d3d3d363d73")
+CLONE_SUFFIX = bytes.fromhex("5af43d82803e903d91602b57fd5bf3")
+
+# Salts tried by one worker task of `mine_salt`.
+MINE_CHUNK_SIZE = 200000
+
+
+def _addr_bytes(addr):
+    if isinstance(addr, (bytes, bytearray)):
+        return bytes(addr)
+    return bytes.fromhex(str(addr)[2:])
+
+
+def _salt_bytes(salt):
+    if isinstance(salt, int):
+        return salt.to_bytes(32, "big")
+    if isinstance(salt, str):
+        return bytes.fromhex(salt[2:] if salt.startswith("0x") else salt)
+    return bytes(salt)
+
+
+def clone_init_code(implementation):
+    """
+    Init code of the EIP-1167 proxy of `implementation`.
+    """
+    return CLONE_PREFIX + _addr_bytes(implementation) + CLONE_SUFFIX
+
+
+@lru_cache(maxsize=None)
+def clone_init_code_hash(implementation):
+    return eth_utils.keccak(clone_init_code(implementation))
+
+
+def create2_address(deployer, salt, init_code_hash):
+    """
+    Address of a contract created by `deployer` with CREATE2.
+    """
+    data = b"\xff" + _addr_bytes(deployer) + _salt_bytes(salt) + init_code_hash
+    return eth_utils.to_checksum_address(eth_utils.keccak(data)[12:])
+
+
+class Create2Engine(object):
+    """
+    Offline `CoboFactory.getCreate2Address` for one factory and one
+    implementation: the proxy is an EIP-1167 clone created with the salt
+    keccak256(abi.encode(creator, salt)).
+    """
+
+    def __init__(self, factory, implementation) -> None:
+        self.factory = eth_utils.to_checksum_address(str(factory))
+        self.implementation = eth_utils.to_checksum_address(str(implementation))
+
+        # Constant parts of the CREATE2 preimage.
+        self._prefix = b"\xff" + _addr_bytes(self.factory)
+        self._hash = clone_init_code_hash(self.implementation)
+
+    def _raw(self, creator, salt):
+        """
+        Raw 20-byte address, `creator` is 12 zero bytes + 20 address bytes.
+        """
+        keccak = eth_utils.keccak
+        salt = keccak(creator + salt)
+        return keccak(self._prefix + salt + self._hash)[12:]
+
+    def address(self, creator, salt):
+        creator = b"\0" * 12 + _addr_bytes(creator)
+        return eth_utils.to_checksum_address(self._raw(creator, _salt_bytes(salt)))
+
+    def addresses(self, creators, salts):
+        """
+        Batch version of `address`, for pairs of creators and salts.
+        """
+        padded = {}
+        r = []
+        for creator, salt in zip(creators, salts):
+            key = str(creator)
+            if key not in padded:
+                padded[key] = b"\0" * 12 + _addr_bytes(creator)
+            raw = self._raw(padded[key], _salt_bytes(salt))
+            r.append(eth_utils.to_checksum_address(raw))
+        return r
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} factory={self.factory} "
+            f"implementation={self.implementation}>"
+        )
+
+
+def _mine_range(engine, creator, prefix, start, count):
+    """
+    First salt in [start, start + count) of an address with the hex prefix.
+    """
+    creator = b"\0" * 12 + _addr_bytes(creator)
+    even = prefix[: len(prefix) // 2 * 2]
+    raw_prefix = bytes.fromhex(even)
+    odd = prefix[len(even) :]
+    for i in range(start, start + count):
+        raw = engine._raw(creator, i.to_bytes(32, "big"))
+        if raw.startswith(raw_prefix) and (not odd or raw.hex()[len(even)] == odd):
+            return i
+    return None
+
+
+def mine_salt(engine, creator, prefix, start=0, max_salts=None, workers=None):
+    """
+    Search, in worker processes, the smallest salt from `start` for which
+    the proxy address of `creator` starts with the hex `prefix`, eg: "0000".
+    Returns (salt, address), or None if not found in `max_salts` salts.
+    """
+    prefix = prefix.lower()
+    if prefix.startswith("0x"):
+        prefix = prefix[2:]
+    workers = workers or os.cpu_count()
+    end = None if max_salts is None else start + max_salts
+
+    with ProcessPoolExecutor(workers) as pool:
+        while True:
+            ranges = []
+            for _ in range(workers):
+                count = MINE_CHUNK_SIZE
+                if end is not None:
+                    count = min(count, end - start)
+                if count <= 0:
+                    break
+                ranges.append((start, count))
+                start += count
+            if not ranges:
+                return None
+
+            futures = [
+                pool.submit(_mine_range, engine, creator, prefix, s, c)
+                for s, c in ranges
+            ]
+            # In order, so the smallest salt wins.
+            for future in futures:
+                salt = future.result()
+                if salt is not None:
+                    for f in futures:
+                        f.cancel()
+                    return salt.to_bytes(32, "big"), engine.address(creator, salt)
@@ -0,0 +1,110 @@
+import json
+import os
+
+import yaml
+
+from .fanout import run_in_order
+from .snapshot import current_snapshot, snapshot
+
+
+def to_plain(value):
+    """
+    Convert brownie / web3 values into plain JSON/YAML types.
+    """
+    if isinstance(value, dict):
+        return {str(k): to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_plain(v) for v in value]
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, bytes):
+        return "0x" + bytes(value).hex()
+    return str(value)
+
+
+def build_model(addr, full=True, chain=None):
+    """
+    Build the in-memory config model of the contract. With `full`, children
+    (role manager, root authorizer, authorizers) are included recursively.
+    All reads are pinned to one block, or `chain.block` of a chain handle.
+    """
+    if chain is None and current_snapshot() is None:
+        with snapshot():
+            return build_model(addr, full)
+
+    from .autocontract import convert
+
+    obj = convert(addr, chain)
+    if obj is None:
+        return None
+    return obj.get_config(full)
+
+
+def build_children(addrs, full=True, chain=None):
+    """
+    Build models of children concurrently, in the order of `addrs`.
+    """
+    addrs = list(dict.fromkeys(addrs))
+
+    def _build(addr):
+        return lambda: build_model(addr, full, chain)
+
+    return run_in_order([_build(addr) for addr in addrs])
+
+
+def iter_models(model):
+    """
+    Yield the model and all children models, depth first.
+    """
+    if not model:
+        return
+    yield model
+    for child in model.get("Children", []):
+        yield from iter_models(child)
+
+
+def guess_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        return "json"
+    if ext == ".jsonl":
+        return "jsonl"
+    return "yaml"
+
+
+def write_model(model, f, fmt="yaml"):
+    model = to_plain(model)
+    if fmt == "json":
+        json.dump(model, f, indent=2)
+        f.write("\n")
+    elif fmt == "jsonl":
+        f.write(json.dumps(model) + "\n")
+    else:
+        yaml.safe_dump(model, f, sort_keys=False)
+
+
+def export_model(addr, path, full=True, fmt=None):
+    """
+    Export the whole Argus tree of `addr` to a JSON/YAML file in one pass.
+    """
+    model = build_model(addr, full)
+    with open(path, "w") as f:
+        write_model(model, f, fmt or guess_format(path))
+    return model
+
+
+def export_models(addrs, path, full=True):
+    """
+    Stream models of many contracts to a JSONL file, one line per contract,
+    flushed as soon as each one is built.
+    """
+    with open(path, "a") as f:
+        for addr in addrs:
+            try:
+                model = build_model(addr, full)
+            except Exception as e:
+                model = {"Address": str(addr), "Error": str(e)}
+            write_model(model, f, "jsonl")
+            f.flush()
@@ -1,14 +1,91 @@
 import random
+import threading
+import time
 
-from brownie import accounts
+from brownie import accounts, network
 
+from .multicall import call_many
 from .ownable import BaseOwnable
+from .snapshot import current_snapshot
 from .utils import FACTORY_ADDRESS, ZERO_ADDRESS, b32, s32
 
+# Name of the implementation recorded for each safe.
+COBOSAFE_NAME = "CoboSafeAccount"
+
+# Seconds the factory cache is used without checking new blocks, when reads
+# are not pinned to a block.
+FACTORY_CACHE_TTL = 15
+
+# (chain id, factory address) -> FactoryCache
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+class FactoryCache(object):
+    """
+    Implementations and records of one factory, valid up to `block`.
+
+    It is brought forward by scanning the factory logs of the new blocks:
+    ImplementationAdded drops the implementations, ProxyCreated drops the
+    records of its deployer. Nothing is dropped while nothing is deployed.
+    """
+
+    def __init__(self) -> None:
+        self.block = None
+
+        # time.monotonic() of the last check of the latest block.
+        self.checked = None
+
+        # name -> all implementations, None if not loaded.
+        self.impls = None
+
+        # (deployer, name) -> records
+        self.records = {}
+
+        self.lock = threading.Lock()
+
+    def clear(self):
+        self.impls = None
+        self.records = {}
+
+    def update(self, w3, address, block):
+        """
+        Apply the factory logs up to `block`.
+        """
+        from .indexer import decode_log
+
+        try:
+            logs = w3.eth.get_logs(
+                {"address": address, "fromBlock": self.block + 1, "toBlock": block}
+            )
+        except Exception:
+            # Logs not available, eg: range too large.
+            logs = None
+
+        if logs is None:
+            self.clear()
+        for log in logs or []:
+            event = decode_log("CoboFactory", log)
+            if event is None:
+                continue
+            name, args = event
+            if name == "ImplementationAdded":
+                self.impls = None
+            elif name == "ProxyCreated":
+                deployer = str(args["deployer"]).lower()
+                for key in [k for k in self.records if k[0] == deployer]:
+                    self.records.pop(key)
+        self.block = block
+
+
+def clear_factory_caches():
+    with _CACHES_LOCK:
+        _CACHES.clear()
+
 
 class CoboFactory(BaseOwnable):
-    def __init__(self, address=FACTORY_ADDRESS) -> None:
-        super().__init__(address)
+    def __init__(self, address=FACTORY_ADDRESS, chain=None) -> None:
+        super().__init__(address, chain)
 
     def get_address(self, name):
         addr = self.contract.getLatestImplementation(b32(name))
@@ -21,18 +98,134 @@ class CoboFactory(BaseOwnable):
         names = [s32(i) for i in names]
         return names
 
-    def get_cobosafe(self, safe):
-        addr = self.contract.getLastRecord(safe, b32("CoboSafeAccount"))
-        if addr == ZERO_ADDRESS:
+    def _pinned_block(self):
+        """
+        Block reads are pinned to, or None if they are of the latest block.
+        """
+        if self.chain is not None:
+            if isinstance(self.chain.block, int):
+                return self.chain.block
             return None
-        return addr
+        snap = current_snapshot()
+        return snap.block if snap else None
+
+    def _cache(self):
+        """
+        Returns the cache of this factory brought to the read block, or None
+        if reads are pinned before it.
+        """
+        block = self._pinned_block()
+        chain_id = self.chain.id if self.chain else network.chain.id
+        key = (chain_id, str(self.address).lower())
+        with _CACHES_LOCK:
+            cache = _CACHES.setdefault(key, FactoryCache())
+
+        with cache.lock:
+            if block is None:
+                now = time.monotonic()
+                if (
+                    cache.checked is not None
+                    and now - cache.checked < FACTORY_CACHE_TTL
+                ):
+                    return cache
+                block = self.web3.eth.block_number
+                cache.checked = now
+
+            if cache.block is None:
+                cache.block = block
+            elif block < cache.block:
+                return None
+            elif block > cache.block:
+                cache.update(self.web3, str(self.address), block)
+        return cache
+
+    def get_all_implementations(self):
+        """
+        Returns {name: all implementations}, the latest one last.
+        """
+        cache = self._cache()
+        if cache is not None:
+            with cache.lock:
+                block, impls = cache.block, cache.impls
+            if impls is not None:
+                return impls
+
+        names = self.get_all_names()
+        calls = call_many(
+            self.contract.getAllImplementations, [b32(name) for name in names]
+        )
+        impls = {name: list(call.result) for name, call in zip(names, calls)}
+        if cache is not None:
+            with cache.lock:
+                if cache.block == block:
+                    cache.impls = impls
+        return impls
+
+    def get_records(self, deployers, name=COBOSAFE_NAME):
+        """
+        Returns the records of `name` created by each deployer, in batch.
+        """
+        cache = self._cache()
+        keys = [(str(d).lower(), name) for d in deployers]
+
+        # Copied under the lock, the cache may be updated meanwhile.
+        records = {}
+        if cache is not None:
+            with cache.lock:
+                block = cache.block
+                records = {k: cache.records[k] for k in keys if k in cache.records}
+
+        missing = {}
+        for deployer, key in zip(deployers, keys):
+            if key not in records:
+                missing[key] = deployer
+        if missing:
+            calls = call_many(
+                self.contract.getAllRecord, [(d, b32(name)) for d in missing.values()]
+            )
+            found = {key: list(call.result) for key, call in zip(missing, calls)}
+            records.update(found)
+            if cache is not None:
+                with cache.lock:
+                    # Not if logs of new blocks were applied since.
+                    if cache.block == block:
+                        cache.records.update(found)
+        return [records[k] for k in keys]
+
+    def get_cobosafes(self, safes):
+        """
+        Batch version of `get_cobosafe`.
+        """
+        return [
+            records[-1] if records else None for records in self.get_records(safes)
+        ]
+
+    def get_cobosafe(self, safe):
+        return self.get_cobosafes([safe])[0]
 
     def get_all_impls(self):
         r = {}
-        for name in self.get_all_names():
-            r[name] = self.get_address(name)
+        for name, impls in self.get_all_implementations().items():
+            addr = impls[-1] if impls else ZERO_ADDRESS
+            r[name] = None if addr == ZERO_ADDRESS else addr
         return r
 
+    def create2_engine(self, name):
+        """
+        Offline CREATE2 address engine of the latest implementation `name`.
+        """
+        from .create2 import Create2Engine
+
+        impl = self.get_all_impls().get(name)
+        assert impl, f"No implementation {name}"
+        return Create2Engine(self.address, impl)
+
+    def get_create2_address(self, name, salt, creator):
+        """
+        Same as `getCreate2Address` of the factory, computed locally.
+        """
+        return self.create2_engine(name).address(creator, salt)
+
     def create(self, name_or_cls, deployer=None):
         if type(name_or_cls) is str:
             name = b32(name_or_cls)
@@ -66,7 +259,7 @@ class CoboFactory(BaseOwnable):
         if deployer is None:
             deployer = accounts.default
 
-        proxy = self.contract.getCreate2Address(deployer, name, salt)
+        proxy = self.get_create2_address(s32(name), salt, deployer)
         self.contract.create2(name, salt, {"from": deployer})
 
         if create_wrapper:
@@ -76,8 +269,15 @@ class CoboFactory(BaseOwnable):
 
     def dump(self, full=False):
         super().dump(full)
-        names = self.get_all_names()
-        print(f"Latest implementations (Total {len(names)}):")
-        for name in names:
-            addr = self.get_address(name)
+        impls = self.get_all_impls()
+        print(f"Latest implementations (Total {len(impls)}):")
+        for name, addr in impls.items():
             print(f"  {name}: {addr}")
+
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        config["Implementations"] = {
+            name: str(addr) if addr else None
+            for name, addr in self.get_all_impls().items()
+        }
+        return config
@@ -0,0 +1,265 @@
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import copy_context
+from urllib.parse import urlparse
+
+import requests
+from brownie import web3
+
+from .snapshot import current_snapshot, snapshot
+from .utils import printline
+
+# Max tasks run at the same time by all `run_in_order()`, nested ones included.
+FANOUT_WORKERS = int(os.getenv("PYCOBOSAFE_WORKERS", 8))
+
+# Requests per second allowed by public RPCs, by host.
+PUBLIC_RPC_RATE_LIMITS = {
+    "rpc.ankr.com": 25,
+}
+
+# Retries on HTTP 429 Too Many Requests.
+RATE_LIMIT_RETRIES = 5
+
+RATE_LIMIT_MIDDLEWARE = "pycobosafe_rate_limit"
+
+_lock = threading.Lock()
+_local = threading.local()
+
+# Thread pool shared by all `run_in_order()`, created on first use.
+_EXECUTOR = None
+
+
+class RateLimiter(object):
+    """
+    Token bucket shared by all threads.
+    """
+
+    def __init__(self, rate) -> None:
+        self.rate = rate
+        self.tokens = rate
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        """
+        Take a token, returns 0, or the seconds to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self.last) * self.rate
+            self.tokens = min(self.rate, self.tokens + refill)
+            self.last = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        wait = self._take()
+        while wait:
+            time.sleep(wait)
+            wait = self._take()
+
+    async def acquire_async(self):
+        import asyncio
+
+        wait = self._take()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = self._take()
+
+
+# endpoint uri -> RateLimiter, or None if not limited.
+_LIMITERS = {}
+
+
+def set_rate_limit(rate, endpoint_uri=None):
+    """
+    Limit requests per second to the endpoint, None to disable.
+    """
+    if endpoint_uri is None:
+        endpoint_uri = getattr(web3.provider, "endpoint_uri", None)
+    _LIMITERS[endpoint_uri] = RateLimiter(rate) if rate else None
+
+
+def get_rate_limiter(endpoint_uri=None):
+    uri = endpoint_uri or getattr(web3.provider, "endpoint_uri", None)
+    if uri not in _LIMITERS:
+        rate = os.getenv("PYCOBOSAFE_RPC_RATE")
+        if rate is None:
+            rate = PUBLIC_RPC_RATE_LIMITS.get(urlparse(str(uri)).hostname)
+        _LIMITERS[uri] = RateLimiter(float(rate)) if rate else None
+    return _LIMITERS[uri]
+
+
+def rate_limited(func, *args, endpoint_uri=None):
+    """
+    Call func respecting the rate limit of the endpoint (default the brownie
+    network one), retry with backoff on HTTP 429.
+    """
+    limiter = get_rate_limiter(endpoint_uri)
+    for i in range(RATE_LIMIT_RETRIES + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return func(*args)
+        except requests.HTTPError as e:
+            status = getattr(e.response, "status_code", None)
+            if status != 429 or i == RATE_LIMIT_RETRIES:
+                raise
+            time.sleep(0.5 * 2**i)
+
+
+def rate_limit_middleware(make_request, w3):
+    uri = getattr(w3.provider, "endpoint_uri", None)
+
+    def middleware(method, params):
+        return rate_limited(make_request, method, params, endpoint_uri=uri)
+
+    return middleware
+
+
+def install_rate_limiter():
+    """
+    Rate limit requests of the brownie network, done when it is connected.
+    """
+    with _lock:
+        if RATE_LIMIT_MIDDLEWARE not in web3.middleware_onion:
+            web3.middleware_onion.add(rate_limit_middleware, RATE_LIMIT_MIDDLEWARE)
+
+
+class _ThreadLocalStdout(object):
+    """
+    Routes writes of a thread to its own buffer when captured.
+    """
+
+    def __init__(self, target) -> None:
+        self.target = target
+
+    def _stream(self):
+        return getattr(_local, "buffer", None) or self.target
+
+    def write(self, s):
+        return self._stream().write(s)
+
+    def flush(self):
+        return self._stream().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+
+@contextmanager
+def thread_local_stdout():
+    """
+    Allow threads to capture their own stdout with `capture_output()`.
+    """
+    with _lock:
+        installed = not isinstance(sys.stdout, _ThreadLocalStdout)
+        if installed:
+            sys.stdout = _ThreadLocalStdout(sys.stdout)
+    try:
+        yield
+    finally:
+        if installed:
+            with _lock:
+                sys.stdout = sys.stdout.target
+
+
+def capture_output(func):
+    """
+    Run func, returns (result, error, stdout output of this thread).
+    """
+    prev = getattr(_local, "buffer", None)
+    _local.buffer = io.StringIO()
+    try:
+        return func(), None, _local.buffer.getvalue()
+    except Exception as e:
+        return None, e, _local.buffer.getvalue()
+    finally:
+        _local.buffer = prev
+
+
+def get_executor():
+    global _EXECUTOR
+    with _lock:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                FANOUT_WORKERS, thread_name_prefix="pycobosafe"
+            )
+        return _EXECUTOR
+
+
+def run_in_order(funcs, max_workers=None):
+    """
+    Run funcs in the shared thread pool, at most `max_workers` of them at
+    the same time, and print their outputs in the order of `funcs`.
+    Returns the results.
+
+    Tasks not started yet when their result is needed are run by the
+    calling thread, so nested calls from pool threads can't deadlock.
+    """
+    funcs = list(funcs)
+    if len(funcs) <= 1:
+        return [func() for func in funcs]
+
+    install_rate_limiter()
+    pool = get_executor()
+    workers = max_workers or FANOUT_WORKERS
+
+    # index -> future, at most `workers` in flight.
+    futures = {}
+
+    def _submit(i):
+        if i < len(funcs):
+            # Each task runs in a copy of the caller context, with its snapshot.
+            futures[i] = pool.submit(copy_context().run, capture_output, funcs[i])
+
+    with thread_local_stdout():
+        for i in range(workers):
+            _submit(i)
+
+        results = []
+        try:
+            for i, func in enumerate(funcs):
+                future = futures.pop(i)
+                if future.cancel():
+                    result, error, output = copy_context().run(capture_output, func)
+                else:
+                    result, error, output = future.result()
+                _submit(i + workers)
+
+                sys.stdout.write(output)
+                if error is not None:
+                    raise error
+                results.append(result)
+        finally:
+            for future in futures.values():
+                future.cancel()
+        return results
+
+
+def dump_all(addrs, full=False, max_workers=None, chain=None):
+    """
+    Dump contracts concurrently, output is printed in order.
+    """
+    if chain is None and current_snapshot() is None:
+        # Workers share one block.
+        with snapshot():
+            return dump_all(addrs, full, max_workers)
+
+    from .autocontract import dump
+
+    def _dump(addr):
+        def _run():
+            printline()
+            dump(addr, full, chain)
+
+        return _run
+
+    run_in_order([_dump(addr) for addr in addrs], max_workers)
@@ -1,41 +1,157 @@
-from functools import lru_cache
+import time
+from collections import OrderedDict
 
 import eth_abi
 
+from .multicall import Call, multicall
+from .snapshot import current_snapshot
 from .utils import ZERO_ADDRESS, Operation, abi_encode_with_sig, load_contract
 
+# Start of the Safe modules linked list.
+SENTINEL_ADDRESS = "0x0000000000000000000000000000000000000001"
+
+# Max modules read.
+MODULES_PAGE_SIZE = 50
+
+# Blocks of state kept per Safe instance.
+STATE_CACHE_SIZE = 8
+
+# Seconds the state read at the latest block is used, unless `refresh()`.
+STATE_TTL = 15
+
 
 class GnosisSafe(object):
-    def __init__(self, cobosafe_addr, owner=None) -> None:
-        self.contract = load_contract("GnosisSafe", cobosafe_addr)
-        self.owner = owner
-
-        threshold = self.threshold
-        owners = self.owners
-
-        if owner:
-            assert threshold == 1, f"threshold = {threshold} > 1, not supported now"
-            assert (
-                str(self.owner).lower() in owners
-            ), f"owner {owner} not in safe owners list {owners}"
-        else:
-            if threshold == 1:
-                self.owner = owners[0]
+    # State read in one batch: key -> (function, args)
+    STATE_FUNCS = {
+        "threshold": ("getThreshold", ()),
+        "owners": ("getOwners", ()),
+        "nonce": ("nonce", ()),
+        "modules": ("getModulesPaginated", (SENTINEL_ADDRESS, MODULES_PAGE_SIZE)),
+    }
+
+    def __init__(self, cobosafe_addr, owner=None, chain=None) -> None:
+        self.chain = chain
+        self.contract = load_contract("GnosisSafe", cobosafe_addr, chain=chain)
+        self._owner = owner
+
+        # block number, None for the latest block -> state, cleared after
+        # each tx sent.
+        self._states = OrderedDict()
+        self._latest_time = None
+        self._domain_separator = None
+
+    @classmethod
+    def load_many(cls, addresses, chain=None):
+        """
+        Safes with state of the read block loaded, in one batch.
+        """
+        safes = [cls(addr, chain=chain) for addr in addresses]
+        calls = [call for safe in safes for call in safe._state_calls()]
+        multicall(calls)
+
+        n = len(cls.STATE_FUNCS)
+        for i, safe in enumerate(safes):
+            safe._set_state(calls[i * n : (i + 1) * n])
+        return safes
+
+    def _block(self):
+        """
+        Block number reads are pinned to by the snapshot or chain handle,
+        None if they are of the latest block.
+        """
+        if self.chain is not None:
+            if isinstance(self.chain.block, int):
+                return self.chain.block
+            return None
+
+        snap = current_snapshot()
+        return snap.block if snap is not None else None
+
+    def _state_calls(self):
+        return [
+            Call(getattr(self.contract, func), *args)
+            for func, args in self.STATE_FUNCS.values()
+        ]
+
+    def _set_state(self, calls):
+        state = {}
+        for key, call in zip(self.STATE_FUNCS, calls):
+            state[key] = call.result if call.ok else None
+        if state["modules"] is not None:
+            state["modules"] = list(state["modules"][0])
+
+        block = self._block()
+        if block is None:
+            self._latest_time = time.monotonic()
+        self._states[block] = state
+        self._states.move_to_end(block)
+        while len(self._states) > STATE_CACHE_SIZE:
+            self._states.popitem(last=False)
+        return state
+
+    @property
+    def state(self):
+        """
+        Threshold, owners, nonce and modules at the read block. The latest
+        one is read again after `STATE_TTL` seconds.
+        """
+        block = self._block()
+        state = self._states.get(block)
+        if block is None and state is not None:
+            if time.monotonic() - self._latest_time > STATE_TTL:
+                state = None
+        if state is None:
+            state = self._set_state(multicall(self._state_calls()))
+        return state
+
+    def refresh(self):
+        self._states.clear()
 
     @property
-    @lru_cache(maxsize=1)
     def address(self):
         return self.contract.address
 
     @property
-    @lru_cache(maxsize=1)
+    def chain_id(self):
+        if self.chain is not None:
+            return self.chain.id
+
+        from brownie import network
+
+        return network.chain.id
+
+    @property
     def threshold(self):
-        return self.contract.getThreshold()
+        return self.state["threshold"]
 
     @property
-    @lru_cache(maxsize=1)
     def owners(self):
-        return self.contract.getOwners()
+        return self.state["owners"]
+
+    @property
+    def nonce(self):
+        return self.state["nonce"]
+
+    @property
+    def modules(self):
+        return self.state["modules"]
+
+    @property
+    def owner(self):
+        if self._owner is None and self.threshold == 1:
+            self._owner = self.owners[0]
+        return self._owner
+
+    @owner.setter
+    def owner(self, owner):
+        self._owner = owner
+
+    def check_owner(self):
+        threshold, owners = self.threshold, self.owners
+        assert threshold == 1, f"threshold = {threshold} > 1, not supported now"
+        assert str(self.owner).lower() in [
+            str(o).lower() for o in owners
+        ], f"owner {self.owner} not in safe owners list {owners}"
 
     @classmethod
     def create_single_signature(cls, address):
@@ -45,12 +161,10 @@ class GnosisSafe(object):
         self, to, data, value=0, signatures=None, call_type=Operation.CALL
     ):
         if signatures is None:
-            assert (
-                self.threshold == 1
-            ), f"Can not exec as threshold = {self.threshold} > 1"
+            self.check_owner()
             signatures = self.create_single_signature(self.owner)
 
-        return self.contract.execTransaction(
+        tx = self.contract.execTransaction(
             to,
             value,
             data,
@@ -63,6 +177,51 @@ class GnosisSafe(object):
             signatures,
             {"from": self.owner},
         )
+        self.refresh()
+        return tx
+
+    @property
+    def domain_separator(self):
+        """
+        EIP-712 domain separator, computed locally.
+        """
+        if self._domain_separator is None:
+            from .safetx import domain_separator
+
+            (version,) = multicall([Call(self.contract.VERSION, cache=True)])
+            self._domain_separator = domain_separator(
+                self.chain_id, self.address, version.result
+            )
+        return self._domain_separator
+
+    def build_tx(self, to, data=b"", value=0, call_type=Operation.CALL, nonce=None):
+        """
+        Returns a `SafeTx` to sign offline, at the current nonce by default.
+        """
+        from .safetx import SafeTx
+
+        return SafeTx(self, to, data, value, call_type, nonce)
+
+    def build_txs(self, txs, nonce=None):
+        """
+        `SafeTx`s at consecutive nonces, to be signed in one batch and
+        executed in order. See `multisend.normalize_tx` for txs.
+        """
+        from .multisend import normalize_tx
+
+        if nonce is None:
+            nonce = self.contract.nonce()
+        r = []
+        for i, tx in enumerate(txs):
+            operation, to, value, data = normalize_tx(tx)
+            r.append(self.build_tx(to, data, value, operation, nonce + i))
+        return r
+
+    def exec_safe_txs(self, safe_txs, sender=None):
+        """
+        Execute signed `SafeTx`s in nonce order.
+        """
+        return [tx.execute(sender) for tx in sorted(safe_txs, key=lambda t: t.nonce)]
 
     def exec_transaction_ex(
         self, to, func_sig, args, value=0, signatures=None, call_type=Operation.CALL
@@ -80,6 +239,16 @@ class GnosisSafe(object):
         data = abi_encode_with_sig(func_sig, args)
         return self.exec_transaction(to, data, 0, call_type=Operation.DELEGATE_CALL)
 
+    def multi_send(self, txs):
+        """
+        Execute many txs in one Safe transaction by delegatecall MultiSend.
+        See `multisend.normalize_tx` for the format of txs.
+        """
+        from .multisend import multisend_call
+
+        to, data = multisend_call(txs, self.chain_id)
+        return self.exec_transaction(to, data, 0, call_type=Operation.DELEGATE_CALL)
+
     def enable_module(self, cobo_safe_module):
         self.exec_transaction_ex(
             self.address, "enableModule(address)", [cobo_safe_module]
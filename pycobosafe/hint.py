@@ -0,0 +1,134 @@
+import threading
+import time
+
+import eth_utils
+from hexbytes import HexBytes
+
+from .multicall import Call, multicall
+
+# Seconds before the authorizer set version is checked again.
+HINT_VERSION_TTL = 60
+
+
+def eth_call_simulator(account, txs, delegate):
+    """
+    Compute hints of CallData `txs` with eth_call execTransaction, in batch.
+    """
+    calls = multicall(
+        [Call(account.contract.execTransaction, tx, sender=delegate) for tx in txs]
+    )
+    # CallData.hint = TransactionResult.hint
+    return [call.result[2] for call in calls]
+
+
+def fork_simulator(endpoint_uri):
+    """
+    Dry-run execTransaction on a local fork node (eg: anvil / ganache with
+    `--fork`) instead of the remote RPC.
+    """
+    from web3 import HTTPProvider, Web3
+
+    fork = Web3(HTTPProvider(endpoint_uri))
+
+    def _simulate(account, txs, delegate):
+        method = account.contract.execTransaction
+        hints = []
+        for tx in txs:
+            data = fork.eth.call(
+                {
+                    "from": str(delegate),
+                    "to": account.address,
+                    "data": method.encode_input(tx),
+                }
+            )
+            hints.append(method.decode_output(data)[2])
+        return hints
+
+    return _simulate
+
+
+class HintCache(object):
+    """
+    Hints of CoboAccount.execTransaction keyed by
+    (delegate, to, selector, flag, authorizer set version).
+
+    Hints are dropped when the authorizer set of the root authorizer changes,
+    or when a transaction sent with a cached hint fails.
+    """
+
+    def __init__(self, account, ttl=HINT_VERSION_TTL, simulator=None) -> None:
+        self.account = account
+        self.ttl = ttl
+        self.simulator = simulator or eth_call_simulator
+        self._hints = {}
+        self._version = None
+        self._checked = 0
+        self._lock = threading.Lock()
+
+    def authorizer_set_version(self):
+        """
+        Hash of role -> authorizers of the root authorizer.
+        """
+        from .authorizer import ArgusRootAuthorizer
+
+        root = ArgusRootAuthorizer(self.account.authorizer, self.account.chain)
+        items = []
+        for delegatecall in (False, True):
+            for role, auths in root.get_all_authorizers(delegatecall).items():
+                auths = ",".join(sorted(str(a).lower() for a in auths))
+                items.append(f"{delegatecall}:{role}:{auths}")
+        return eth_utils.keccak(text="|".join(sorted(items))).hex()
+
+    @property
+    def version(self):
+        now = time.monotonic()
+        if self._version is None or now - self._checked > self.ttl:
+            version = self.authorizer_set_version()
+            with self._lock:
+                if version != self._version:
+                    self._hints.clear()
+                self._version = version
+                self._checked = now
+        return self._version
+
+    def invalidate(self):
+        with self._lock:
+            self._hints.clear()
+            self._version = None
+
+    def key(self, delegate, tx, version=None):
+        flag, to, _, data = tx[:4]
+        selector = bytes(HexBytes(data)[:4]).hex()
+        if version is None:
+            version = self.version
+        return (str(delegate).lower(), str(to).lower(), selector, flag, version)
+
+    def precompute(self, delegate, txs):
+        """
+        Compute and cache hints of many CallData `txs` at once.
+        """
+        # One version for all keys, it may expire while they are computed.
+        version = self.version
+        keys = [self.key(delegate, tx, version) for tx in txs]
+
+        with self._lock:
+            hints = {key: self._hints[key] for key in keys if key in self._hints}
+        missing = {}
+        for key, tx in zip(keys, txs):
+            if key not in hints:
+                missing.setdefault(key, tx)
+
+        if missing:
+            simulated = self.simulator(self.account, list(missing.values()), delegate)
+            hints.update(zip(missing.keys(), simulated))
+            with self._lock:
+                self._hints.update(zip(missing.keys(), simulated))
+        return [hints[key] for key in keys]
+
+    def get_hint(self, delegate, tx):
+        return self.precompute(delegate, [tx])[0]
+
+    def drop(self, delegate, tx):
+        key = self.key(delegate, tx)
+        with self._lock:
+            self._hints.pop(key, None)
@@ -0,0 +1,491 @@
+import json
+import os
+
+import eth_abi
+import eth_utils
+from eth_abi.grammar import parse as parse_abi_type
+from hexbytes import HexBytes
+
+from .chains import _abi_type, _checksum
+from .snapshot import at_block
+from .utils import ZERO_ADDRESS, func_selector, load_abi, s32
+
+# Blocks per eth_getLogs request, halved when the provider rejects a range.
+LOG_CHUNK_SIZE = 5000
+MIN_LOG_CHUNK_SIZE = 10
+
+# Default directory of indexer state files.
+INDEX_DIR = os.path.join(os.path.expanduser("~"), ".pycobosafe", "index")
+
+# ABI name -> {topic0: event ABI}
+_EVENTS = {}
+
+
+def get_events(name):
+    """
+    Returns {topic0: event ABI} of the bundled ABI `name`.
+    """
+    events = _EVENTS.get(name)
+    if events is None:
+        events = {}
+        for abi in load_abi(name):
+            if abi["type"] == "event":
+                events[eth_utils.event_abi_to_log_topic(abi)] = abi
+        _EVENTS[name] = events
+    return events
+
+
+def decode_log(name, log):
+    """
+    Decode a raw log emitted by a contract of ABI `name`.
+    Returns (event name, {arg: value}), or None for unknown events.
+    """
+    topics = [HexBytes(t) for t in log["topics"]]
+    if not topics:
+        return None
+    abi = get_events(name).get(bytes(topics[0]))
+    if abi is None:
+        return None
+
+    args = {}
+    indexed = [i for i in abi["inputs"] if i["indexed"]]
+    for param, topic in zip(indexed, topics[1:]):
+        typ = _abi_type(param)
+        if parse_abi_type(typ).is_dynamic:
+            # Only the hash of dynamic values is in the topic.
+            args[param["name"]] = bytes(topic)
+        else:
+            args[param["name"]] = _checksum(typ, eth_abi.decode([typ], topic)[0])
+
+    others = [i for i in abi["inputs"] if not i["indexed"]]
+    types = [_abi_type(i) for i in others]
+    values = eth_abi.decode(types, HexBytes(log["data"]))
+    for param, typ, value in zip(others, types, values):
+        args[param["name"]] = _checksum(typ, value)
+    return abi["name"], args
+
+
+def _add(items, item):
+    if item not in items:
+        items.append(item)
+
+
+def _remove(items, item):
+    if item in items:
+        items.remove(item)
+
+
+def _read_account(obj):
+    authorizer, role_manager, delegates = obj._calls(
+        "authorizer", "roleManager", "getAllDelegates"
+    )
+    return {
+        "authorizer": str(authorizer.result),
+        "role_manager": str(role_manager.result),
+        "delegates": [str(x) for x in delegates.result],
+    }
+
+
+def _read_role_manager(obj):
+    config = obj.get_config()
+    return {"roles": config["Roles"], "delegates": config["Delegates"]}
+
+
+def _read_root_authorizer(obj):
+    def _to_str(role_auths):
+        return {role: [str(a) for a in auths] for role, auths in role_auths.items()}
+
+    return {
+        "call": _to_str(obj.get_all_authorizers(False)),
+        "delegatecall": _to_str(obj.get_all_authorizers(True)),
+    }
+
+
+def _read_func_authorizer(obj):
+    return {"contracts": obj.get_config()["Contract functions"]}
+
+
+def _read_transfer_authorizer(obj):
+    return {"tokens": obj.get_config()["Token receivers"]}
+
+
+def _read_factory(obj):
+    impls = obj.get_all_impls()
+    return {
+        "implementations": {name: str(addr) for name, addr in impls.items() if addr},
+        # Only proxies created after the first sync.
+        "records": {},
+    }
+
+
+# ABI name -> reader of the current state of the contract.
+_READERS = {
+    "CoboSafeAccount": _read_account,
+    "CoboSmartAccount": _read_account,
+    "FlatRoleManager": _read_role_manager,
+    "ArgusRootAuthorizer": _read_root_authorizer,
+    "FuncAuthorizer": _read_func_authorizer,
+    "TransferAuthorizer": _read_transfer_authorizer,
+    "CoboFactory": _read_factory,
+}
+
+# Event handlers update the state of the contract, and return addresses of
+# new contracts to follow.
+
+
+def _on_owner_set(state, args):
+    state["owner"] = args["owner"]
+
+
+def _on_authorizer_set(state, args):
+    state["authorizer"] = args["authorizer"]
+    return [args["authorizer"]]
+
+
+def _on_role_manager_set(state, args):
+    state["role_manager"] = args["roleManager"]
+    return [args["roleManager"]]
+
+
+def _on_account_delegate_added(state, args):
+    _add(state["delegates"], args["delegate"])
+
+
+def _on_account_delegate_removed(state, args):
+    _remove(state["delegates"], args["delegate"])
+
+
+def _on_role_added(state, args):
+    _add(state["roles"], s32(args["role"]))
+
+
+def _on_role_granted(state, args):
+    roles = state["delegates"].setdefault(args["delegate"], [])
+    _add(roles, s32(args["role"]))
+
+
+def _on_role_revoked(state, args):
+    _remove(state["delegates"].get(args["delegate"], []), s32(args["role"]))
+
+
+def _on_delegate_added(state, args):
+    state["delegates"].setdefault(args["delegate"], [])
+
+
+def _on_delegate_removed(state, args):
+    state["delegates"].pop(args["delegate"], None)
+
+
+def _authorizers(state, args):
+    kind = "delegatecall" if args["isDelegateCall"] else "call"
+    return state[kind].setdefault(s32(args["role"]), [])
+
+
+def _on_authorizer_added(state, args):
+    _add(_authorizers(state, args), args["authorizer"])
+    return [args["authorizer"]]
+
+
+def _on_authorizer_removed(state, args):
+    _remove(_authorizers(state, args), args["authorizer"])
+
+
+def _func_id(args):
+    if "funcSig" in args:
+        return "0x" + args["funcSig"].hex()
+    return "0x" + func_selector(args["func"]).hex()
+
+
+def _on_func_added(state, args):
+    funcs = state["contracts"].setdefault(args["_contract"], [])
+    _add(funcs, _func_id(args))
+
+
+def _on_func_removed(state, args):
+    funcs = state["contracts"].get(args["_contract"], [])
+    _remove(funcs, _func_id(args))
+    if not funcs:
+        state["contracts"].pop(args["_contract"], None)
+
+
+def _on_token_added(state, args):
+    state["tokens"].setdefault(args["token"], [])
+
+
+def _on_token_removed(state, args):
+    state["tokens"].pop(args["token"], None)
+
+
+def _on_receiver_added(state, args):
+    _add(state["tokens"].setdefault(args["token"], []), args["receiver"])
+
+
+def _on_receiver_removed(state, args):
+    _remove(state["tokens"].get(args["token"], []), args["receiver"])
+
+
+def _on_implementation_added(state, args):
+    state["implementations"][s32(args["name"])] = args["implementation"]
+
+
+def _on_proxy_created(state, args):
+    records = state["records"].setdefault(args["deployer"], {})
+    _add(records.setdefault(s32(args["name"]), []), args["proxy"])
+
+
+_ACCOUNT_HANDLERS = {
+    "NewOwnerSet": _on_owner_set,
+    "AuthorizerSet": _on_authorizer_set,
+    "RoleManagerSet": _on_role_manager_set,
+    "DelegateAdded": _on_account_delegate_added,
+    "DelegateRemoved": _on_account_delegate_removed,
+}
+
+# ABI name -> {event name: handler}
+_HANDLERS = {
+    "CoboSafeAccount": _ACCOUNT_HANDLERS,
+    "CoboSmartAccount": _ACCOUNT_HANDLERS,
+    "FlatRoleManager": {
+        "NewOwnerSet": _on_owner_set,
+        "RoleAdded": _on_role_added,
+        "RoleGranted": _on_role_granted,
+        "RoleRevoked": _on_role_revoked,
+        "DelegateAdded": _on_delegate_added,
+        "DelegateRemoved": _on_delegate_removed,
+    },
+    "ArgusRootAuthorizer": {
+        "NewOwnerSet": _on_owner_set,
+        "NewAuthorizerAdded": _on_authorizer_added,
+        "AuthorizerRemoved": _on_authorizer_removed,
+    },
+    "FuncAuthorizer": {
+        "NewOwnerSet": _on_owner_set,
+        "AddContractFunc": _on_func_added,
+        "AddContractFuncSig": _on_func_added,
+        "RemoveContractFunc": _on_func_removed,
+        "RemoveContractFuncSig": _on_func_removed,
+    },
+    "TransferAuthorizer": {
+        "NewOwnerSet": _on_owner_set,
+        "TokenAdded": _on_token_added,
+        "TokenRemoved": _on_token_removed,
+        "TokenReceiverAdded": _on_receiver_added,
+        "TokenReceiverRemoved": _on_receiver_removed,
+    },
+    "CoboFactory": {
+        "NewOwnerSet": _on_owner_set,
+        "ImplementationAdded": _on_implementation_added,
+        "ProxyCreated": _on_proxy_created,
+    },
+}
+
+
+class EventIndexer(object):
+    """
+    Role, delegate and authorizer state of Argus contracts, kept up to date
+    by following their events.
+
+    Contracts are read once at the block they start to be followed, then
+    only new logs are fetched with chunked eth_getLogs. Newly added
+    authorizers, role managers are followed automatically. State and the
+    last processed block are saved to `path` as JSON.
+    """
+
+    def __init__(self, path=None, chain=None) -> None:
+        self.path = path
+        self.chain = chain
+        self.chunk_size = LOG_CHUNK_SIZE
+        self.chain_id = None
+        self.block = None
+        self.contracts = {}
+        self.state = {}
+
+        if path and os.path.exists(path):
+            self.load()
+
+    @classmethod
+    def for_account(cls, addr, path=None, chain=None):
+        """
+        Indexer following the Cobo account `addr` and all of its children.
+        """
+        indexer = cls(path, chain)
+        if indexer.path is None:
+            name = f"{indexer.get_chain_id()}_{str(addr).lower()}.json"
+            indexer.path = os.path.join(INDEX_DIR, name)
+            if os.path.exists(indexer.path):
+                indexer.load()
+
+        if indexer.block is None:
+            indexer.block = indexer.web3.eth.block_number
+        indexer.watch(addr)
+        indexer.save()
+        return indexer
+
+    @property
+    def web3(self):
+        if self.chain is not None:
+            return self.chain.web3
+
+        from brownie import web3
+
+        return web3
+
+    def get_chain_id(self):
+        if self.chain is not None:
+            return self.chain.id
+        return self.web3.eth.chain_id
+
+    def watch(self, addr, name=None):
+        """
+        Follow the contract from the current block, with its children.
+        Contracts of unsupported types are ignored.
+        """
+        addr = eth_utils.to_checksum_address(str(addr))
+        if addr in self.contracts or addr == ZERO_ADDRESS:
+            return
+
+        from .autocontract import convert
+
+        with at_block(self.block, self.chain):
+            obj = convert(addr, self.chain)
+            if obj is None:
+                return
+
+            name = name or obj.__class__.__name__
+            reader = _READERS.get(name)
+            if reader is None:
+                return
+
+            state = reader(obj)
+            try:
+                state["owner"] = str(obj.owner)
+            except Exception:
+                state["owner"] = None
+
+        self.contracts[addr] = name
+        self.state[addr] = state
+        for child in self._children(name, state):
+            self.watch(child)
+
+    def _children(self, name, state):
+        if name in ("CoboSafeAccount", "CoboSmartAccount"):
+            return [state["role_manager"], state["authorizer"]]
+        if name == "ArgusRootAuthorizer":
+            auths = list(state["call"].values()) + list(state["delegatecall"].values())
+            return [auth for role_auths in auths for auth in role_auths]
+        return []
+
+    def get_logs(self, from_block, to_block, addrs=None):
+        """
+        Raw logs of all followed contracts, or of `addrs`, in order.
+        """
+        if addrs is None:
+            addrs = self.contracts
+        logs = self.web3.eth.get_logs(
+            {
+                "address": [eth_utils.to_checksum_address(a) for a in addrs],
+                "fromBlock": from_block,
+                "toBlock": to_block,
+            }
+        )
+        return sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+
+    def iter_logs(self, from_block, to_block, addrs=None):
+        """
+        Yield (last block, logs) of `get_logs` by chunks of blocks up to
+        `to_block`. Chunks are halved when the provider rejects a range.
+        """
+        start = from_block
+        while start <= to_block:
+            end = min(start + self.chunk_size - 1, to_block)
+            try:
+                logs = self.get_logs(start, end, addrs)
+            except Exception:
+                # Range too large or too many results.
+                if self.chunk_size <= MIN_LOG_CHUNK_SIZE:
+                    raise
+                self.chunk_size //= 2
+                continue
+            yield end, logs
+            start = end + 1
+
+    def apply(self, log):
+        """
+        Apply one log, returns addresses of new contracts to follow.
+        """
+        addr = eth_utils.to_checksum_address(log["address"])
+        name = self.contracts.get(addr)
+        if name is None:
+            return []
+
+        decoded = decode_log(name, log)
+        if decoded is None:
+            return []
+
+        event, args = decoded
+        handler = _HANDLERS.get(name, {}).get(event)
+        if handler is None:
+            return []
+        return handler(self.state[addr], args) or []
+
+    def sync(self, to_block=None):
+        """
+        Process new logs up to `to_block` (default the latest block).
+        Returns the number of logs applied.
+        """
+        assert self.block is not None, "Nothing to sync, watch contracts first"
+        if to_block is None:
+            to_block = self.web3.eth.block_number
+
+        count = 0
+        for end, logs in self.iter_logs(self.block + 1, to_block):
+            new_contracts = []
+            for log in logs:
+                new_contracts += self.apply(log)
+                count += 1
+
+            self.block = end
+            # New contracts are read at the end of the range, and followed
+            # from the next one.
+            for addr in new_contracts:
+                self.watch(addr)
+
+            self.save()
+        return count
+
+    def get(self, addr):
+        """
+        Indexed state of the contract, or None if it is not followed.
+        """
+        return self.state.get(eth_utils.to_checksum_address(str(addr)))
+
+    def to_dict(self):
+        return {
+            "chain_id": self.chain_id or self.get_chain_id(),
+            "block": self.block,
+            "contracts": self.contracts,
+            "state": self.state,
+        }
+
+    def save(self):
+        if not self.path:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp, self.path)
+
+    def load(self):
+        with open(self.path) as f:
+            data = json.load(f)
+
+        chain_id = self.get_chain_id()
+        assert (
+            data["chain_id"] == chain_id
+        ), f"{self.path} is indexed on chain {data['chain_id']}, not {chain_id}"
+        self.chain_id = data["chain_id"]
+        self.block = data["block"]
+        self.contracts = data["contracts"]
+        self.state = data["state"]
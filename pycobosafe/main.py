@@ -1,10 +1,10 @@
+import sys
 from argparse import ArgumentParser
 
-from pycobosafe.console import CoboSafeConsole
-from pycobosafe.utils import connect_new_chain, get_all_support_chains
+from pycobosafe.utils import get_all_support_chains
 
 
-def get_args():
+def get_args(argv=None):
     parser = ArgumentParser(
         prog="cobosafe", description="CoboSafe utilities command-line tool."
     )
@@ -35,16 +35,26 @@ def get_args():
         help="Start CoboSafe console.",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     return args
 
 
-def main():
-    args = get_args()
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
 
-    connect_new_chain(args.chain)
+    # pycobosafe scan --chains eth,matic --safes safes.txt
+    if argv and argv[0] == "scan":
+        from pycobosafe.scan import main as scan_main
 
-    console = CoboSafeConsole()
+        return scan_main(argv[1:])
+
+    args = get_args(argv)
+
+    from pycobosafe.console import CoboSafeConsole
+
+    # The network is connected on the first command that needs it.
+    console = CoboSafeConsole(args.chain)
 
     if args.debug:
         console.debug = True
@@ -0,0 +1,244 @@
+import os
+
+from brownie import network, web3
+from hexbytes import HexBytes
+
+from .cache import MetadataCache, metadata_cache
+from .rpcbatch import call_one_by_one, current_batch, rpc_batch_call
+from .snapshot import current_snapshot
+from .utils import load_contract
+
+# Multicall3 is deployed at the same address on most EVM chains.
+# https://github.com/mds1/multicall
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Max calls packed into one `aggregate3` eth_call.
+MULTICALL_CHUNK_SIZE = 100
+
+# chain id -> Multicall3 address, or None if not deployed on the chain.
+_MULTICALL_ADDRESSES = {}
+
+
+class CallError(Exception):
+    pass
+
+
+class Call(object):
+    """
+    A pending view call of a brownie contract method, which is resolved
+    together with other calls by `multicall()`.
+
+    Set `cache=True` for immutable results (eg: NAME()) to read through the
+    persistent metadata cache. Calls with `sender` are never sent through
+    Multicall3, as it would be the msg.sender.
+
+    Methods of contracts on a `Chain` handle are resolved on that chain,
+    outside of the brownie network snapshot.
+    """
+
+    def __init__(self, method, *args, cache=False, sender=None) -> None:
+        self.method = method
+        self.args = args
+        self.cache = cache
+        self.sender = sender
+        self.done = False
+        self._value = None
+        self._error = None
+        self._batch = None
+
+    @property
+    def chain(self):
+        return getattr(self.method, "chain", None)
+
+    @property
+    def target(self):
+        return self.method._address
+
+    @property
+    def data(self):
+        data = self.method.encode_input(*self.args)
+        if isinstance(data, bytes):
+            data = "0x" + bytes(data).hex()
+        return data
+
+    @property
+    def tx(self):
+        tx = {"to": self.target, "data": self.data}
+        if self.sender is not None:
+            tx["from"] = str(self.sender)
+        return tx
+
+    @property
+    def cache_key(self):
+        chain_id = self.chain.id if self.chain else network.chain.id
+        return MetadataCache._key(chain_id, self.target, self.data)
+
+    @property
+    def ok(self):
+        if not self.done:
+            if self._batch is None:
+                multicall([self])
+            batch = self._batch
+            if batch is not None:
+                # Deferred in `batched()`, resolve all together.
+                batch.flush()
+        return self._error is None
+
+    @property
+    def result(self):
+        """
+        Decoded return value. Raises if the call reverted, just like calling
+        the contract method directly.
+        """
+        if not self.ok:
+            raise self._error
+        return self._value
+
+    def resolve(self, success, data):
+        self.done = True
+        snap = current_snapshot()
+        if snap is not None and self.sender is None and self.chain is None:
+            snap.put_call(self.target, self.data, success, data)
+
+        if not success:
+            self._error = CallError(f"{self} reverted")
+            return
+
+        try:
+            self._value = self.method.decode_output(data)
+        except Exception as e:
+            self._error = CallError(f"{self} returns invalid data: {e}")
+            return
+
+        if self.cache:
+            metadata_cache().set(*self.cache_key, data)
+
+    def fail(self, error):
+        self.done = True
+        self._error = error
+
+    def __repr__(self) -> str:
+        return f"<Call {self.method._name} {self.target}>"
+
+
+def set_multicall_address(address, chain_id=None):
+    """
+    Set Multicall3 address of the chain, eg: one deployed on local test node.
+    Set None to disable multicall.
+    """
+    if chain_id is None:
+        chain_id = network.chain.id
+    _MULTICALL_ADDRESSES[chain_id] = address
+
+
+def get_multicall_address(chain=None):
+    w3 = chain.web3 if chain else web3
+    chain_id = chain.id if chain else network.chain.id
+    if chain_id not in _MULTICALL_ADDRESSES:
+        address = os.getenv("MULTICALL3_ADDRESS", MULTICALL3_ADDRESS)
+        deployed = len(w3.eth.get_code(address)) > 0
+        _MULTICALL_ADDRESSES[chain_id] = address if deployed else None
+    return _MULTICALL_ADDRESSES[chain_id]
+
+
+def _resolve_from_cache(calls):
+    """
+    Resolve cached calls, returns the calls left.
+    """
+    snap = current_snapshot()
+    if snap is not None:
+        left = []
+        for call in calls:
+            memo = None
+            if call.sender is None and call.chain is None:
+                memo = snap.get_call(call.target, call.data)
+            if memo is None:
+                left.append(call)
+            else:
+                call.resolve(*memo)
+        calls = left
+
+    keys = {call: call.cache_key for call in calls if call.cache}
+    if not keys:
+        return calls
+
+    cached = metadata_cache().get_many(keys.values())
+    left = []
+    for call in calls:
+        key = keys.get(call)
+        if key in cached:
+            call.done = True
+            call._value = call.method.decode_output(cached[key])
+        else:
+            left.append(call)
+    return left
+
+
+def multicall(calls, chunk_size=MULTICALL_CHUNK_SIZE):
+    """
+    Resolve view calls with Multicall3 `aggregate3`, `chunk_size` calls per
+    eth_call. Failures are isolated per call and raised by `Call.result`.
+
+    Inside a `batched()` context, calls are deferred and sent as JSON-RPC
+    batch requests instead. This is also the fallback if Multicall3 is not
+    deployed on the chain.
+    """
+    calls = list(calls)
+    pending = [call for call in calls if not call.done and call._batch is None]
+    pending = _resolve_from_cache(pending)
+    if not pending:
+        return calls
+
+    batch = current_batch()
+    if batch is not None:
+        batch.add(pending)
+        return calls
+
+    with_sender = [call for call in pending if call.sender is not None]
+    if with_sender:
+        rpc_batch_call(with_sender)
+        pending = [call for call in pending if call.sender is None]
+        if not pending:
+            return calls
+
+    groups = {}
+    for call in pending:
+        groups.setdefault(call.chain, []).append(call)
+    for chain, group in groups.items():
+        _aggregate(group, chunk_size, chain)
+    return calls
+
+
+def _aggregate(calls, chunk_size, chain=None):
+    address = get_multicall_address(chain)
+    if address is None:
+        rpc_batch_call(calls)
+        return
+
+    multicall3 = load_contract("Multicall3", address, chain=chain)
+    for i in range(0, len(calls), chunk_size):
+        chunk = calls[i : i + chunk_size]
+        try:
+            results = multicall3.aggregate3.call(
+                [(call.target, True, HexBytes(call.data)) for call in chunk]
+            )
+        except Exception:
+            # Whole batch failed (eg: out of gas), retry one by one.
+            call_one_by_one(chunk)
+            continue
+
+        for call, (success, data) in zip(chunk, results):
+            call.resolve(success, data)
+
+
+def call_many(method, args_list):
+    """
+    Call `method` with each args in `args_list` in batch.
+    Returns the list of resolved `Call`.
+    """
+    calls = []
+    for args in args_list:
+        if not isinstance(args, (list, tuple)):
+            args = (args,)
+        calls.append(Call(method, *args))
+    return multicall(calls)
@@ -0,0 +1,81 @@
+import eth_abi
+from hexbytes import HexBytes
+
+from .utils import Operation, abi_encode_with_sig
+
+# Safe v1.3.0 canonical deployments.
+# MultiSendCallOnly only allows CALL operations in the batch.
+MULTISEND_ADDRESS = "0xA238CBeb142c10Ef7Ad8442C6D1f9E89e07e7761"
+MULTISEND_CALL_ONLY_ADDRESS = "0x40A2aCCbd92BCA938b02010E17A5b8929b49130D"
+
+# Safe v1.3.0 eip155 deployments, used on some chains instead.
+MULTISEND_EIP155_ADDRESS = "0x998739BFdAAdde7C933B942a68053933098f9EDa"
+MULTISEND_CALL_ONLY_EIP155_ADDRESS = "0xA1dabEF33b3B82c7814B6D82A79e50F4AC44102B"
+
+# chain id -> (MultiSend, MultiSendCallOnly) of non-canonical deployments.
+_MULTISEND_ADDRESSES = {}
+
+
+def set_multisend_addresses(chain_id, multisend, call_only=None):
+    """
+    Set MultiSend addresses of the chain, eg: the eip155 deployments.
+    Without `call_only`, MultiSend is used for all batches.
+    """
+    _MULTISEND_ADDRESSES[chain_id] = (multisend, call_only or multisend)
+
+
+def get_multisend_addresses(chain_id=None):
+    """
+    Returns (MultiSend, MultiSendCallOnly) of the chain.
+    """
+    if chain_id in _MULTISEND_ADDRESSES:
+        return _MULTISEND_ADDRESSES[chain_id]
+    return MULTISEND_ADDRESS, MULTISEND_CALL_ONLY_ADDRESS
+
+
+def normalize_tx(tx):
+    """
+    Accept dict like `{"to", "data", "value", "operation"}` (eg: brownie
+    `build()` output) or tuple `(to, data[, value[, operation]])`.
+    Returns (operation, to, value, data).
+    """
+    if isinstance(tx, dict):
+        to = tx["to"]
+        data = tx.get("data", b"")
+        value = tx.get("value", 0)
+        operation = tx.get("operation", Operation.CALL)
+    else:
+        to, data, value, operation = (list(tx) + [0, Operation.CALL])[:4]
+    return operation, to, int(value or 0), bytes(HexBytes(data or b""))
+
+
+def encode_multisend(txs):
+    """
+    Pack txs as MultiSend `transactions` bytes:
+    operation (uint8) + to (address) + value (uint256) + data length (uint256) + data
+    """
+    packed = b""
+    for tx in txs:
+        operation, to, value, data = normalize_tx(tx)
+        packed += bytes([operation])
+        packed += bytes(HexBytes(to))
+        packed += eth_abi.encode(["uint256", "uint256"], [value, len(data)])
+        packed += data
+    return packed
+
+
+def multisend_call(txs, chain_id=None, address=None):
+    """
+    Returns (MultiSend address, calldata) to be delegatecalled by the Safe.
+    The address is `address`, or the MultiSend of `chain_id`.
+    """
+    operations = [normalize_tx(tx)[0] for tx in txs]
+    if address is None:
+        multisend, call_only = get_multisend_addresses(chain_id)
+        if Operation.DELEGATE_CALL in operations:
+            address = multisend
+        else:
+            address = call_only
+
+    data = abi_encode_with_sig("multiSend(bytes)", [encode_multisend(txs)])
+    return address, data
@@ -1,14 +1,42 @@
-from brownie import network
-import yaml
-from .utils import ZERO_ADDRESS, load_contract, s32
+from .multicall import Call, multicall
+from .utils import ZERO_ADDRESS, load_contract, s32, setup_brownie
 import os
 
 BASE = os.getcwd()
 
+# Wrappers run on brownie, set it up before any network is connected.
+setup_brownie()
+
 
 class BaseOwnable(object):
-    def __init__(self, addr) -> None:
-        self.contract = load_contract(self.__class__.__name__, addr)
+    # Wrapper classes registered by contract NAME() and authorizer TYPE().
+    _NAME_REGISTRY = {}
+    _TYPE_REGISTRY = {}
+
+    # Never change for a deployed contract, read through the metadata cache.
+    IMMUTABLE_FUNCS = ("NAME", "VERSION", "TYPE")
+
+    def __init__(self, addr, chain=None) -> None:
+        # Chain handle to read from, None for the brownie network.
+        self.chain = chain
+        self.contract = load_contract(self.__class__.__name__, addr, chain=chain)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BaseOwnable._NAME_REGISTRY[cls.__name__] = cls
+
+        # Only register the class that declares the TYPE, first one wins.
+        typ = cls.__dict__.get("TYPE")
+        if typ is not None:
+            BaseOwnable._TYPE_REGISTRY.setdefault(typ, cls)
+
+    @classmethod
+    def get_class_by_name(cls, name):
+        return BaseOwnable._NAME_REGISTRY.get(name)
+
+    @classmethod
+    def get_class_by_type(cls, typ):
+        return BaseOwnable._TYPE_REGISTRY.get(typ)
 
     def initialize(self, owner_address):
         self.contract.get_by_sig("initialize(address)")(owner_address)
@@ -17,60 +45,116 @@ class BaseOwnable(object):
     def address(self):
         return self.contract.address
 
+    @property
+    def web3(self):
+        """
+        web3 of the chain handle, or of the brownie network.
+        """
+        if self.chain is not None:
+            return self.chain.web3
+
+        from brownie import web3
+
+        return web3
+
     @property
     def name(self):
+        (name,) = self.defer("NAME")
         try:
-            return s32(self.contract.NAME())
+            return s32(name.result)
         except Exception:
             return None
 
     @property
     def version(self):
-        return self.contract.VERSION()
+        (version,) = self.defer("VERSION")
+        return version.result
 
     @property
     def owner(self):
-        return self.contract.owner()
+        (owner,) = self.defer("owner")
+        return owner.result
 
     @property
     def pending_owner(self):
-        return self.contract.pendingOwner()
+        (pending,) = self.defer("pendingOwner")
+        return pending.result
 
     @classmethod
-    def match(cls, addr):
-        return BaseOwnable(addr).name == cls.__name__
+    def match(cls, addr, chain=None):
+        return BaseOwnable(addr, chain).name == cls.__name__
+
+    def _calls(self, *funcs):
+        """
+        Batch view calls without arguments of this contract.
+        """
+        calls = []
+        for func in funcs:
+            cache = func in self.IMMUTABLE_FUNCS
+            calls.append(Call(getattr(self.contract, func), cache=cache))
+        return multicall(calls)
+
+    def defer(self, *funcs):
+        """
+        `Call`s of view functions without arguments, eg: "owner", "NAME".
+        Inside `batched()` they are deferred, and resolved together with
+        all pending calls when one of them is read, eg:
+
+            with batched():
+                owners = [obj.defer("owner")[0] for obj in objs]
+            owners = [call.result for call in owners]
+        """
+        return self._calls(*funcs)
 
     def dump(self, full=False):
-        print("Name:", self.name)
+        name, version, owner, pending = self._calls(
+            "NAME", "VERSION", "owner", "pendingOwner"
+        )
+        print("Name:", s32(name.result) if name.ok else None)
         print("Address:", self.address)
-        print("Version:", self.version)
+        print("Version:", version.result)
         try:
-            print("Owner:", self.owner)
-            pending = self.pending_owner
+            print("Owner:", owner.result)
+            pending = pending.result
             if pending != ZERO_ADDRESS:
                 print("Pending owner:", pending)
         except Exception:
             pass
-    
-    def export_config(self, filename=None):
-        if filename == None:
-            filename = self.contract.name
-        f = open(f'{BASE}/{filename}_config.yaml','w')
+
+    def get_config(self, full=False):
+        """
+        Config model of the contract, extended by subclasses.
+        """
+        name, version, owner, pending = self._calls(
+            "NAME", "VERSION", "owner", "pendingOwner"
+        )
         try:
-            owner = self.owner
-            pending = self.pending_owner
+            owner = owner.result
+            pending = pending.result
             if pending != ZERO_ADDRESS:
                 owner = pending
         except Exception:
-            pass
-        yaml.dump({"Name":self.name, "Address":self.address, "Version":int(self.version), "Owner":str(owner)}, f)
+            owner = None
+        return {
+            "Name": s32(name.result) if name.ok else None,
+            "Address": str(self.address),
+            "Version": int(version.result),
+            "Owner": str(owner) if owner else None,
+        }
 
+    def export_config(self, filename=None):
+        if filename == None:
+            filename = self.contract.name
+
+        from .export import write_model
+
+        with open(f"{BASE}/{filename}_config.yaml", "w") as f:
+            write_model(self.get_config(), f)
 
-class ERC20(object):
-    _CACHE = {}
 
-    def __init__(self, addr) -> None:
-        self.contract = load_contract("ERC20", addr)
+class ERC20(object):
+    def __init__(self, addr, chain=None) -> None:
+        self.contract = load_contract("ERC20", addr, chain=chain)
 
     @property
     def address(self):
@@ -78,10 +162,15 @@ class ERC20(object):
 
     @property
     def symbol(self):
-        tag = f"{network.chain.id} {self.address}"
-
         # Cache to speed.
-        if tag not in ERC20._CACHE:
-            ERC20._CACHE[tag] = self.contract.symbol()
+        return Call(self.contract.symbol, cache=True).result
 
-        return ERC20._CACHE[tag]
+    @classmethod
+    def get_symbols(cls, addrs, chain=None):
+        """
+        Batch version of `symbol`. Returns None for the failed ones.
+        """
+        calls = multicall(
+            [Call(ERC20(addr, chain).contract.symbol, cache=True) for addr in addrs]
+        )
+        return [call.result if call.ok else None for call in calls]
@@ -0,0 +1,298 @@
+import re
+
+import yaml
+
+from .export import build_model, iter_models
+from .utils import Operation, abi_encode_with_sig, b32, func_selector
+
+# Keys of the desired state file, same as in exported models.
+DELEGATES = "Delegates"
+AUTHORIZERS = "Authorizers"
+PARAMS = "Authorizer params"
+FUNCS = "Contract functions"
+RECEIVERS = "Token receivers"
+IN_TOKENS = "In tokens"
+OUT_TOKENS = "Out tokens"
+
+
+class _DesiredLoader(yaml.SafeLoader):
+    """
+    SafeLoader keeping hex scalars as strings, YAML 1.1 reads unquoted
+    addresses as ints.
+    """
+
+
+_INT_TAG = "tag:yaml.org,2002:int"
+_DesiredLoader.yaml_implicit_resolvers = {
+    ch: [(tag, regexp) for tag, regexp in resolvers if tag != _INT_TAG]
+    for ch, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+}
+# The YAML 1.1 int pattern without the 0x form.
+_DesiredLoader.add_implicit_resolver(
+    _INT_TAG,
+    re.compile(
+        r"""^(?:[-+]?0b[0-1_]+
+        |[-+]?0[0-7_]+
+        |[-+]?(?:0|[1-9][0-9_]*)
+        |[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+)$""",
+        re.X,
+    ),
+    list("-+0123456789"),
+)
+
+
+def _addr(addr):
+    return str(addr).lower()
+
+
+def _selector(func):
+    """
+    "0x" + 4 bytes hex of a selector or a function signature.
+    """
+    func = str(func)
+    if "(" in func:
+        return "0x" + func_selector(func).hex()
+    return func.lower()[:10]
+
+
+def _pairs(mapping, key=_addr, item=_addr):
+    """
+    Set of (key, item) of {key: [items]}, addresses lower cased.
+    """
+    return {(key(k), item(v)) for k, items in mapping.items() for v in items}
+
+
+def load_desired(path):
+    """
+    Read a desired state file, YAML or JSON, eg:
+
+        Delegates:
+          0xDelegate: [trader]
+        Authorizers:
+          trader: [0xFuncAuthorizer]
+        Authorizer params:
+          0xFuncAuthorizer:
+            Contract functions:
+              0xRouter: ["swap(address,uint256)", "0x12345678"]
+
+    Sections present are the full desired state of their contracts, what
+    is missing there is removed. Absent sections are left as is.
+    """
+    with open(path) as f:
+        return yaml.load(f, Loader=_DesiredLoader) or {}
+
+
+class Step(object):
+    """
+    One call of the plan, sent by the Safe.
+    """
+
+    def __init__(self, description, to, data, operation=Operation.CALL) -> None:
+        self.description = description
+        self.to = to
+        self.data = data
+        self.operation = operation
+
+    @property
+    def tx(self):
+        return {
+            "to": self.to,
+            "data": self.data,
+            "value": 0,
+            "operation": self.operation,
+        }
+
+    def __repr__(self) -> str:
+        return self.description
+
+
+class Plan(object):
+    """
+    Changes from the chain state of a CoboSafe to a desired state, grouped
+    into as few calls as the ArgusAccountHelper and authorizer array
+    functions allow. Applied in one Safe transaction by MultiSend.
+    """
+
+    def __init__(self, cobosafe, helper) -> None:
+        self.cobosafe = cobosafe
+        self.helper = helper
+        self.steps = []
+
+    @property
+    def txs(self):
+        return [step.tx for step in self.steps]
+
+    def _helper_call(self, description, func_sig, args):
+        data = abi_encode_with_sig(func_sig, args)
+        step = Step(description, self.helper, data, Operation.DELEGATE_CALL)
+        self.steps.append(step)
+
+    def _call(self, description, to, func_sig, args):
+        self.steps.append(Step(description, to, abi_encode_with_sig(func_sig, args)))
+
+    def diff_delegates(self, current, desired):
+        current, desired = _pairs(current, item=str), _pairs(desired, item=str)
+        grants = sorted(desired - current)
+        revokes = sorted(current - desired)
+        if grants:
+            self._helper_call(
+                "Grant roles: " + ", ".join(f"{role} -> {d}" for d, role in grants),
+                "grantRoles(address,bytes32[],address[])",
+                [self.cobosafe, [b32(r) for _, r in grants], [d for d, _ in grants]],
+            )
+        if revokes:
+            self._helper_call(
+                "Revoke roles: " + ", ".join(f"{role} -> {d}" for d, role in revokes),
+                "revokeRoles(address,bytes32[],address[])",
+                [self.cobosafe, [b32(r) for _, r in revokes], [d for d, _ in revokes]],
+            )
+
+    def diff_authorizers(self, current, desired):
+        current, desired = _pairs(current, key=str), _pairs(desired, key=str)
+        for func, pairs in (
+            ("addAuthorizer", desired - current),
+            ("removeAuthorizer", current - desired),
+        ):
+            # One call per authorizer, with all its roles.
+            auth_roles = {}
+            for role, auth in sorted(pairs):
+                auth_roles.setdefault(auth, []).append(role)
+            for auth, roles in auth_roles.items():
+                self._helper_call(
+                    f"{func} {auth}: {', '.join(roles)}",
+                    f"{func}(address,address,bool,bytes32[])",
+                    [self.cobosafe, auth, False, [b32(r) for r in roles]],
+                )
+
+    def diff_funcs(self, auth, current, desired):
+        current = {(_addr(c), _selector(f)) for c, fs in current.items() for f in fs}
+        # Selector -> signature, signatures can be added by the helper.
+        sigs = {}
+        for contract, funcs in desired.items():
+            for func in funcs:
+                sigs[(_addr(contract), _selector(func))] = str(func)
+
+        added = sorted(k for k in sigs if k not in current)
+        removed = sorted(current - set(sigs))
+
+        if added and all("(" in sigs[k] for k in added):
+            contracts = list(dict.fromkeys(c for c, _ in added))
+            funcs = [[sigs[k] for k in added if k[0] == c] for c in contracts]
+            self._helper_call(
+                f"Add functions of {auth}: {len(added)}",
+                "setFuncAuthorizerParams(address,address[],string[][])",
+                [auth, contracts, funcs],
+            )
+        else:
+            self._funcs_by_contract(auth, "addContractFuncsSig", added)
+        self._funcs_by_contract(auth, "removeContractFuncsSig", removed)
+
+    def _funcs_by_contract(self, auth, func, items):
+        for contract in dict.fromkeys(c for c, _ in items):
+            selectors = [s for c, s in items if c == contract]
+            self._call(
+                f"{func} {auth} {contract}: {', '.join(selectors)}",
+                auth,
+                f"{func}(address,bytes4[])",
+                [contract, [bytes.fromhex(s[2:]) for s in selectors]],
+            )
+
+    def diff_receivers(self, auth, current, desired):
+        current, desired = _pairs(current), _pairs(desired)
+        for func, pairs in (
+            ("setTransferAuthorizerParams", desired - current),
+            ("unsetTransferAuthorizerParams", current - desired),
+        ):
+            if pairs:
+                self._helper_call(
+                    f"{func} {auth}: {len(pairs)} receivers",
+                    f"{func}(address,(address,address)[])",
+                    [auth, sorted(pairs)],
+                )
+
+    def diff_tokens(self, auth, current, desired):
+        current_in = {_addr(t) for t in current.get(IN_TOKENS, [])}
+        current_out = {_addr(t) for t in current.get(OUT_TOKENS, [])}
+        desired_in = {_addr(t) for t in desired.get(IN_TOKENS, current_in)}
+        desired_out = {_addr(t) for t in desired.get(OUT_TOKENS, current_out)}
+
+        added = (desired_in - current_in, desired_out - current_out)
+        removed = (current_in - desired_in, current_out - desired_out)
+        for func, (in_tokens, out_tokens) in (
+            ("setDexAuthorizerParams", added),
+            ("unsetDexAuthorizerParams", removed),
+        ):
+            if in_tokens or out_tokens:
+                self._helper_call(
+                    f"{func} {auth}: {len(in_tokens)} in, {len(out_tokens)} out",
+                    f"{func}(address,address[],address[])",
+                    [auth, sorted(in_tokens), sorted(out_tokens)],
+                )
+
+    def __repr__(self) -> str:
+        lines = [f"Plan of {self.cobosafe} ({len(self.steps)} calls):"]
+        lines += [f"  {i}. {step}" for i, step in enumerate(self.steps, 1)]
+        return "\n".join(lines)
+
+
+def make_plan(cobosafe, desired, helper=None, chain=None):
+    """
+    Diff the desired state against the chain, returns the `Plan`.
+    Only CALL authorizers are managed, as in exported models.
+    """
+    if helper is None:
+        from .factory import CoboFactory
+
+        helper = CoboFactory(chain=chain).get_address("ArgusAccountHelper")
+
+    models = {}
+    root = None
+    for model in iter_models(build_model(cobosafe, True, chain)):
+        models[_addr(model["Address"])] = model
+        if model.get("Name") == "ArgusRootAuthorizer":
+            root = model
+    assert root, f"ArgusRootAuthorizer of {cobosafe} not found"
+
+    plan = Plan(cobosafe, helper)
+    for auth, params in desired.get(PARAMS, {}).items():
+        current = models.get(_addr(auth)) or build_model(auth, False, chain)
+        if FUNCS in params:
+            plan.diff_funcs(auth, current[FUNCS], params[FUNCS])
+        if RECEIVERS in params:
+            plan.diff_receivers(auth, current[RECEIVERS], params[RECEIVERS])
+        if IN_TOKENS in params or OUT_TOKENS in params:
+            plan.diff_tokens(auth, current, params)
+
+    if AUTHORIZERS in desired:
+        plan.diff_authorizers(root[AUTHORIZERS], desired[AUTHORIZERS])
+    if DELEGATES in desired:
+        plan.diff_delegates(root[DELEGATES], desired[DELEGATES])
+    return plan
+
+
+def plan_safe_tx(plan, safe):
+    """
+    The plan as one `SafeTx` of the GnosisSafe, delegatecalling MultiSend.
+    """
+    from .multisend import multisend_call
+
+    to, data = multisend_call(plan.txs, safe.chain_id)
+    return safe.build_tx(to, data, 0, Operation.DELEGATE_CALL)
+
+
+def apply_plan(plan, safe, keys=(), keystores=(), sender=None):
+    """
+    Sign the plan tx with owner private `keys` and (path, password)
+    `keystores`, then execute it from `sender`, an owner by default.
+    """
+    if not plan.steps:
+        return None
+
+    safe_tx = plan_safe_tx(plan, safe)
+    for key in keys:
+        safe_tx.sign(key)
+    if keystores:
+        from .safetx import sign_with_keystores
+
+        sign_with_keystores([safe_tx], keystores)
+    return safe_tx.execute(sender)
@@ -0,0 +1,170 @@
+from hexbytes import HexBytes
+
+from .export import iter_models
+from .utils import ETH_ADDRESS, func_selector
+
+ERC20_TRANSFER = func_selector("transfer(address,uint256)")
+
+
+def _addr(addr):
+    return str(addr).lower()
+
+
+def _selector(selector):
+    if selector is None:
+        return None
+    if isinstance(selector, bytes):
+        return "0x" + bytes(selector[:4]).hex()
+    return str(selector).lower()[:10]
+
+
+class Policy(object):
+    """
+    In-memory model of what the authorizers of an Argus account accept,
+    to pre-check transactions without an eth_call.
+
+    Rules of FuncAuthorizer, TransferAuthorizer and DEX ACLs are flattened
+    into hashed sets keyed by delegate, so each check is O(1) per rule kind.
+
+    `check()` returns True if an authorizer accepts the call, False if all
+    of them reject it, and None if only authorizers whose rules can not be
+    evaluated offline (eg: ACL argument checks) may accept it.
+    Only CALL transactions are covered.
+    """
+
+    def __init__(self) -> None:
+        # delegate -> roles
+        self.delegates = {}
+
+        # (delegate, to, selector)
+        self._funcs = set()
+
+        # (delegate, token, receiver)
+        self._transfers = set()
+
+        # (delegate, contract) -> [(in tokens, out tokens)], None if the ACL
+        # has no token lists.
+        self._acls = {}
+
+        # Delegates with authorizers of unknown types.
+        self._unknown = set()
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Build from the full config model of an account or its root
+        authorizer, see `export.build_model`. Works offline from an
+        exported file.
+        """
+        models = {}
+        root = None
+        for m in iter_models(model):
+            models[_addr(m["Address"])] = m
+            if m.get("Name") == "ArgusRootAuthorizer":
+                root = m
+        assert root, "ArgusRootAuthorizer not found in the model"
+
+        policy = cls()
+        for delegate, roles in root.get("Delegates", {}).items():
+            delegate = _addr(delegate)
+            policy.delegates[delegate] = list(roles)
+            for role in roles:
+                for auth in root.get("Authorizers", {}).get(role, []):
+                    policy.add_authorizer(delegate, models.get(_addr(auth)))
+        return policy
+
+    @classmethod
+    def load(cls, addr, chain=None):
+        """
+        Build from the chain, reads are batched by `build_model`.
+        """
+        from .export import build_model
+
+        return cls.from_model(build_model(addr, True, chain))
+
+    def add_authorizer(self, delegate, model):
+        """
+        Index the rules of one authorizer model for the delegate.
+        """
+        typ = model.get("Type") if model else None
+
+        if typ == "FunctionType":
+            for contract, funcs in model["Contract functions"].items():
+                for func in funcs:
+                    self._funcs.add((delegate, _addr(contract), _selector(func)))
+
+        elif typ == "TransferType":
+            for token, receivers in model["Token receivers"].items():
+                for receiver in receivers:
+                    self._transfers.add((delegate, _addr(token), _addr(receiver)))
+
+        elif typ == "DexType":
+            tokens = (
+                {_addr(t) for t in model["In tokens"]},
+                {_addr(t) for t in model["Out tokens"]},
+            )
+            for contract in model["Contracts"]:
+                self._acls.setdefault((delegate, _addr(contract)), []).append(tokens)
+
+        elif model and "Contracts" in model:
+            for contract in model["Contracts"]:
+                self._acls.setdefault((delegate, _addr(contract)), []).append(None)
+
+        else:
+            self._unknown.add(delegate)
+
+    def check(
+        self, delegate, to, selector=None, token=None, receiver=None, token_out=None
+    ):
+        """
+        Whether the authorizers accept the call from `delegate`.
+        `token` / `receiver` are of a transfer, `token` / `token_out` are
+        the in / out tokens of a swap.
+        """
+        delegate = _addr(delegate)
+        to = _addr(to)
+
+        if (delegate, to, _selector(selector)) in self._funcs:
+            return True
+
+        if token is not None and receiver is not None:
+            if (delegate, _addr(token), _addr(receiver)) in self._transfers:
+                return True
+
+        result = False
+        for tokens in self._acls.get((delegate, to), []):
+            if tokens is None:
+                result = None
+                continue
+            in_tokens, out_tokens = tokens
+            if (token is None or _addr(token) in in_tokens) and (
+                token_out is None or _addr(token_out) in out_tokens
+            ):
+                result = None
+
+        if delegate in self._unknown:
+            result = None
+        return result
+
+    def check_tx(self, delegate, to, data=b"", value=0):
+        """
+        `check()` a raw transaction, ETH and ERC20 transfers are detected
+        from `value` and `data`.
+        """
+        data = HexBytes(data or b"")
+        selector = data[:4] if len(data) >= 4 else None
+        token = receiver = None
+        if not data and value:
+            token, receiver = ETH_ADDRESS, to
+        elif selector == ERC20_TRANSFER and len(data) >= 36:
+            token, receiver = to, "0x" + bytes(data[16:36]).hex()
+        return self.check(delegate, to, selector, token, receiver)
+
+    def check_many(self, delegate, txs):
+        """
+        `check_tx()` of many txs, dicts like brownie `build()` output.
+        """
+        return [
+            self.check_tx(delegate, tx["to"], tx.get("data"), tx.get("value", 0))
+            for tx in txs
+        ]
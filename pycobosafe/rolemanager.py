@@ -1,3 +1,4 @@
+from .multicall import call_many
 from .ownable import BaseOwnable
 from .utils import s32
 
@@ -16,7 +17,19 @@ class FlatRoleManager(BaseOwnable):
     def dump(self, full=False):
         super().dump(full)
         print("Delegate", " " * 3, "Roles")
-        for delegate in self.get_all_delegates():
-            roles = self.get_roles(delegate)
-            roles = ",".join(s32(i) for i in roles)
+        delegates = self.get_all_delegates()
+        calls = call_many(self.contract.getRoles, delegates)
+        for delegate, call in zip(delegates, calls):
+            roles = ",".join(s32(i) for i in call.result)
             print(delegate, roles)
+
+    def get_config(self, full=False):
+        config = super().get_config(full)
+        config["Roles"] = self.get_all_roles()
+        delegates = self.get_all_delegates()
+        calls = call_many(self.contract.getRoles, delegates)
+        config["Delegates"] = {
+            str(delegate): [s32(i) for i in call.result]
+            for delegate, call in zip(delegates, calls)
+        }
+        return config
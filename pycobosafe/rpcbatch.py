@@ -0,0 +1,217 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import requests
+from brownie import web3
+from hexbytes import HexBytes
+
+from .fanout import rate_limited
+from .snapshot import pin_block
+
+# Max eth_call requests in one JSON-RPC batch POST.
+RPC_BATCH_SIZE = 50
+
+# Max batch POSTs in flight at the same time.
+RPC_BATCH_WORKERS = 4
+
+# JSON-RPC error code of an unknown method, some providers reply it to batches.
+METHOD_NOT_FOUND = -32601
+
+# endpoint uri -> False if the provider rejects batch requests.
+_BATCH_SUPPORTED = {}
+
+_SESSION = requests.Session()
+
+# Batch of the current thread or task, fan-out workers get it through
+# `contextvars.copy_context()`.
+_BATCH = ContextVar("pycobosafe_batch", default=None)
+
+
+class BatchRejected(Exception):
+    """
+    The provider does not accept JSON-RPC batch requests.
+    """
+
+
+class Batch(object):
+    """
+    Calls deferred inside a `batched()` context. They are resolved together
+    when any of them is read, or when the context exits.
+    """
+
+    def __init__(self, batch_size=None, max_workers=None) -> None:
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.pending = []
+        # Calls are added by fan-out workers too.
+        self._lock = threading.Lock()
+
+    def add(self, calls):
+        with self._lock:
+            for call in calls:
+                call._batch = self
+                self.pending.append(call)
+
+    def flush(self):
+        with self._lock:
+            pending, self.pending = self.pending, []
+            for call in pending:
+                call._batch = None
+        rpc_batch_call(pending, self.batch_size, self.max_workers)
+
+
+def current_batch():
+    return _BATCH.get()
+
+
+@contextmanager
+def batched(batch_size=None, max_workers=None):
+    """
+    Send view calls as JSON-RPC batch requests instead of Multicall3, eg:
+
+        with batched():
+            obj.dump()
+    """
+    batch = Batch(batch_size, max_workers)
+    token = _BATCH.set(batch)
+    try:
+        yield batch
+        batch.flush()
+    finally:
+        _BATCH.reset(token)
+
+
+def _call_web3(call, block):
+    """
+    Returns (web3, block) to send the call with.
+    """
+    if call.chain is None:
+        return web3, block
+    if block in ("latest", None):
+        block = call.chain.block
+    return call.chain.web3, block
+
+
+def call_one_by_one(calls, block="latest"):
+    for call in calls:
+        if call.done:
+            continue
+        try:
+            w3, at = _call_web3(call, block)
+            data = w3.eth.call(call.tx, at)
+            call.resolve(True, data)
+        except Exception as e:
+            call.fail(e)
+
+
+def _endpoint(w3=None):
+    return getattr((w3 or web3).provider, "endpoint_uri", None)
+
+
+def supports_batch(w3=None):
+    uri = _endpoint(w3)
+    if not uri or not str(uri).startswith("http"):
+        # Only HTTP provider is supported.
+        return False
+    return _BATCH_SUPPORTED.get(uri, True)
+
+
+def _post_batch(calls, block, w3=None):
+    w3 = w3 or web3
+    if isinstance(block, int):
+        block = hex(block)
+    payload = []
+    for i, call in enumerate(calls):
+        payload.append(
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "eth_call",
+                "params": [call.tx, block],
+            }
+        )
+
+    uri = _endpoint(w3)
+    headers = {"Content-Type": "application/json"}
+    headers.update(w3.provider.get_request_headers())
+
+    def _post():
+        resp = _SESSION.post(uri, json=payload, headers=headers, timeout=30)
+        resp.raise_for_status()
+        return resp
+
+    resp = rate_limited(_post, endpoint_uri=uri)
+    results = resp.json()
+    if not isinstance(results, list):
+        # Some providers reply a single error object for batch requests.
+        raise BatchRejected(f"Batch request rejected: {results}")
+    if results and all(
+        (r.get("error") or {}).get("code") == METHOD_NOT_FOUND for r in results
+    ):
+        raise BatchRejected(f"Batch request rejected: {results[0]['error']}")
+
+    results = {r.get("id"): r for r in results}
+    missing = []
+    for i, call in enumerate(calls):
+        r = results.get(i)
+        if r is None:
+            missing.append(call)
+        elif "error" in r:
+            call.fail(ValueError(r["error"]))
+        else:
+            call.resolve(True, HexBytes(r["result"]))
+
+    # Providers may drop requests over their batch limit.
+    call_one_by_one(missing, block)
+
+
+def rpc_batch_call(calls, batch_size=None, max_workers=None, block="latest"):
+    """
+    Resolve view calls with JSON-RPC batch requests, `batch_size` eth_call
+    per POST and at most `max_workers` POSTs in parallel.
+
+    Falls back to one eth_call per call if the provider rejects batches.
+    """
+    calls = [call for call in calls if not call.done]
+    if not calls:
+        return
+
+    groups = {}
+    for call in calls:
+        groups.setdefault(call.chain, []).append(call)
+    if len(groups) > 1:
+        # Calls of other chains go to their own endpoints.
+        for group in groups.values():
+            rpc_batch_call(group, batch_size, max_workers, block)
+        return
+
+    w3, block = _call_web3(calls[0], block)
+    if calls[0].chain is None:
+        block = pin_block(block)
+
+    if not supports_batch(w3):
+        call_one_by_one(calls, block)
+        return
+
+    batch_size = batch_size or RPC_BATCH_SIZE
+    max_workers = max_workers or RPC_BATCH_WORKERS
+    chunks = [calls[i : i + batch_size] for i in range(0, len(calls), batch_size)]
+
+    def _run(chunk):
+        try:
+            _post_batch(chunk, block, w3)
+        except BatchRejected:
+            _BATCH_SUPPORTED[_endpoint(w3)] = False
+            call_one_by_one(chunk, block)
+        except Exception:
+            # Transient errors (timeouts, HTTP 5xx, bad JSON), retry this chunk
+            # without batching, but keep batching the next ones.
+            call_one_by_one(chunk, block)
+
+    if len(chunks) == 1:
+        _run(chunks[0])
+    else:
+        with ThreadPoolExecutor(max_workers) as pool:
+            list(pool.map(_run, chunks))
@@ -0,0 +1,234 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import eth_abi
+import eth_utils
+
+from .utils import ZERO_ADDRESS, Operation
+
+# keccak256("EIP712Domain(uint256 chainId,address verifyingContract)")
+DOMAIN_SEPARATOR_TYPEHASH = bytes.fromhex(
+    "47e79534a245952e8b16893a336b85a3d9ea9fa8c573f3d803afb92a79469218"
+)
+
+# keccak256("EIP712Domain(address verifyingContract)"), Safes before 1.3.0.
+DOMAIN_SEPARATOR_TYPEHASH_OLD = bytes.fromhex(
+    "035aff83d86937d35b32e04f0ddc6ff469290eef2f1b692d8a815c89404d4749"
+)
+
+# keccak256("SafeTx(address to,uint256 value,bytes data,uint8 operation,
+# uint256 safeTxGas,uint256 baseGas,uint256 gasPrice,address gasToken,
+# address refundReceiver,uint256 nonce)")
+SAFE_TX_TYPEHASH = bytes.fromhex(
+    "bb8310d486368db6bd6f849402fdd73ad53d316b5a4b2644ad6efe0f941286d8"
+)
+
+
+def _version_tuple(version):
+    return tuple(int(x) for x in str(version).split("+")[0].split(".")[:3])
+
+
+def domain_separator(chain_id, safe, version="1.3.0"):
+    """
+    EIP-712 domain separator of the Safe, as `domainSeparator()` returns.
+    """
+    if _version_tuple(version) < (1, 3, 0):
+        data = eth_abi.encode(
+            ["bytes32", "address"], [DOMAIN_SEPARATOR_TYPEHASH_OLD, str(safe)]
+        )
+    else:
+        data = eth_abi.encode(
+            ["bytes32", "uint256", "address"],
+            [DOMAIN_SEPARATOR_TYPEHASH, chain_id, str(safe)],
+        )
+    return eth_utils.keccak(data)
+
+
+def sign_hash(key, message_hash):
+    """
+    Safe ECDSA signature (r, s, v) of a hash with a private key.
+    """
+    from eth_account import Account
+
+    sign = getattr(Account, "unsafe_sign_hash", None) or Account._sign_hash
+    signed = sign(message_hash, private_key=key)
+    r, s = signed.r.to_bytes(32, "big"), signed.s.to_bytes(32, "big")
+    return r + s + bytes([signed.v])
+
+
+def approved_signature(owner):
+    """
+    Signature of an owner who is the sender of execTransaction.
+    """
+    return eth_abi.encode(["(address,address)"], [(str(owner), str(owner))]) + b"\x01"
+
+
+class SafeTx(object):
+    """
+    A Safe transaction to be signed by owners offline and executed once.
+    """
+
+    def __init__(
+        self,
+        safe,
+        to,
+        data=b"",
+        value=0,
+        operation=Operation.CALL,
+        nonce=None,
+        safe_tx_gas=0,
+        base_gas=0,
+        gas_price=0,
+        gas_token=ZERO_ADDRESS,
+        refund_receiver=ZERO_ADDRESS,
+    ) -> None:
+        self.safe = safe
+        self.to = eth_utils.to_checksum_address(str(to))
+        self.data = eth_utils.to_bytes(hexstr=data) if isinstance(data, str) else data
+        self.value = value
+        self.operation = operation
+        # Not from the state cache, the nonce may have been used since.
+        self.nonce = safe.contract.nonce() if nonce is None else nonce
+        self.safe_tx_gas = safe_tx_gas
+        self.base_gas = base_gas
+        self.gas_price = gas_price
+        self.gas_token = gas_token
+        self.refund_receiver = refund_receiver
+
+        # owner -> signature
+        self.signatures = {}
+
+    @property
+    def struct_hash(self):
+        data = eth_abi.encode(
+            [
+                "bytes32",
+                "address",
+                "uint256",
+                "bytes32",
+                "uint8",
+                "uint256",
+                "uint256",
+                "uint256",
+                "address",
+                "address",
+                "uint256",
+            ],
+            [
+                SAFE_TX_TYPEHASH,
+                self.to,
+                self.value,
+                eth_utils.keccak(self.data),
+                self.operation,
+                self.safe_tx_gas,
+                self.base_gas,
+                self.gas_price,
+                str(self.gas_token),
+                str(self.refund_receiver),
+                self.nonce,
+            ],
+        )
+        return eth_utils.keccak(data)
+
+    @property
+    def hash(self):
+        """
+        EIP-712 SafeTx hash, as `getTransactionHash()` returns.
+        """
+        return eth_utils.keccak(
+            b"\x19\x01" + self.safe.domain_separator + self.struct_hash
+        )
+
+    def add_signature(self, owner, signature):
+        self.signatures[eth_utils.to_checksum_address(str(owner))] = bytes(signature)
+
+    def sign(self, key):
+        """
+        Sign with a private key, returns the owner address.
+        """
+        from eth_account import Account
+
+        owner = Account.from_key(key).address
+        self.add_signature(owner, sign_hash(key, self.hash))
+        return owner
+
+    def encoded_signatures(self, sender=None):
+        """
+        Signatures sorted by owner, as `execTransaction` requires. The
+        `sender` owner does not need to sign.
+        """
+        signatures = dict(self.signatures)
+        if sender is not None:
+            sender = eth_utils.to_checksum_address(str(sender))
+            owners = [str(o).lower() for o in self.safe.owners]
+            if sender not in signatures and sender.lower() in owners:
+                signatures[sender] = approved_signature(sender)
+
+        threshold = self.safe.threshold
+        assert (
+            len(signatures) >= threshold
+        ), f"{len(signatures)} signatures, threshold = {threshold}"
+        owners = sorted(signatures, key=lambda o: int(o, 16))
+        return b"".join(signatures[o] for o in owners)
+
+    def execute(self, sender=None):
+        """
+        Submit with the signatures collected, from an owner account.
+        """
+        sender = sender or self.safe.owner
+        assert sender, "sender not set"
+        tx = self.safe.contract.execTransaction(
+            self.to,
+            self.value,
+            self.data,
+            self.operation,
+            self.safe_tx_gas,
+            self.base_gas,
+            self.gas_price,
+            str(self.gas_token),
+            str(self.refund_receiver),
+            self.encoded_signatures(sender),
+            {"from": sender},
+        )
+        self.safe.refresh()
+        return tx
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.safe.address} nonce={self.nonce} "
+            f"to={self.to} signatures={len(self.signatures)}>"
+        )
+
+
+def _sign_with_keystore(path, password, hashes):
+    """
+    Decrypt one keystore and sign all hashes, in a worker process.
+    """
+    import json
+
+    from eth_account import Account
+
+    with open(path) as f:
+        key = Account.decrypt(json.load(f), password)
+    owner = Account.from_key(key).address
+    return owner, [sign_hash(key, h) for h in hashes]
+
+
+def sign_with_keystores(safe_txs, keystores, workers=None):
+    """
+    Sign all `safe_txs` with each of `keystores`, a list of (keystore JSON
+    path, password). Keystores are decrypted and used in parallel worker
+    processes, private keys never leave them. Returns the owners.
+    """
+    hashes = [tx.hash for tx in safe_txs]
+    with ProcessPoolExecutor(workers or len(keystores) or None) as pool:
+        futures = [
+            pool.submit(_sign_with_keystore, path, password, hashes)
+            for path, password in keystores
+        ]
+        owners = []
+        for future in futures:
+            owner, signatures = future.result()
+            for tx, signature in zip(safe_txs, signatures):
+                tx.add_signature(owner, signature)
+            owners.append(owner)
+    return owners
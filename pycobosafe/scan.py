@@ -0,0 +1,216 @@
+import json
+import multiprocessing
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty
+
+# Max safes scanned at the same time in one chain.
+SCAN_WORKERS = 8
+
+# Seconds to wait for a record before checking that chain processes are alive.
+SCAN_POLL_INTERVAL = 1
+
+_DONE = None
+
+
+def load_safes(path):
+    """
+    Read safe addresses, one per line. Empty lines and `#` comments are skipped.
+    """
+    safes = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#")[0].strip()
+            if line:
+                safes.append(line)
+    return safes
+
+
+def scan_safe(factory, safe, full=True, dump=False):
+    """
+    Returns the scan record of one safe.
+    """
+    from .autocontract import dump as dump_contract
+    from .export import build_model, to_plain
+    from .fanout import capture_output
+
+    chain = factory.chain
+    record = {"safe": safe}
+    cobosafe = factory.get_cobosafe(safe)
+    record["cobosafe"] = str(cobosafe) if cobosafe else None
+    if cobosafe:
+        record["model"] = to_plain(build_model(cobosafe, full, chain))
+        if dump:
+            _, error, output = capture_output(
+                lambda: dump_contract(cobosafe, full, chain)
+            )
+            record["dump"] = output if error is None else f"Error: {error}"
+    return record
+
+
+def scan_chain(chain, safes, queue, factory_address=None, workers=None, **kwargs):
+    """
+    Scan safes of one chain concurrently, put records into `queue` as each
+    safe finishes. Runs in its own process with its own chain handle.
+    """
+    try:
+        from .chains import get_chain
+        from .factory import CoboFactory
+        from .fanout import thread_local_stdout
+        from .utils import FACTORY_ADDRESS
+
+        handle = get_chain(chain)
+        # All safes of the chain are read at the same block.
+        handle.block = handle.web3.eth.block_number
+        factory = CoboFactory(factory_address or FACTORY_ADDRESS, handle)
+
+        def _scan(safe):
+            try:
+                record = scan_safe(factory, safe, **kwargs)
+            except Exception as e:
+                record = {"safe": safe, "error": str(e)}
+            record["chain"] = chain
+            queue.put(record)
+
+        with thread_local_stdout():
+            with ThreadPoolExecutor(workers or SCAN_WORKERS) as pool:
+                list(pool.map(_scan, safes))
+    except Exception as e:
+        queue.put({"chain": chain, "error": str(e)})
+    finally:
+        queue.put((_DONE, chain))
+
+
+def scan(chains, safes, out, factory_address=None, workers=None, **kwargs):
+    """
+    Scan safes across chains, one process per chain. Records are written
+    to `out` as JSON lines as soon as each safe finishes.
+    """
+    chains = list(dict.fromkeys(chains))
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    # chain -> process, until its done marker is received
+    procs = {}
+    for chain in chains:
+        proc = ctx.Process(
+            target=scan_chain,
+            args=(chain, safes, queue, factory_address, workers),
+            kwargs=kwargs,
+        )
+        proc.start()
+        procs[chain] = proc
+
+    running = dict(procs)
+    count = 0
+
+    def _handle(record):
+        nonlocal count
+        if isinstance(record, tuple) and record[0] is _DONE:
+            running.pop(record[1], None)
+            return
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+        count += 1
+
+    while running:
+        try:
+            _handle(queue.get(timeout=SCAN_POLL_INTERVAL))
+            continue
+        except Empty:
+            pass
+
+        exited = [chain for chain, proc in running.items() if not proc.is_alive()]
+        if not exited:
+            continue
+
+        # Records put just before exiting are still in the queue.
+        while True:
+            try:
+                _handle(queue.get_nowait())
+            except Empty:
+                break
+
+        for chain in exited:
+            proc = running.pop(chain, None)
+            if proc is not None and proc.exitcode:
+                # Killed or crashed before its done marker.
+                error = f"Scan process exited with code {proc.exitcode}"
+                _handle({"chain": chain, "error": error})
+
+    for proc in procs.values():
+        proc.join()
+    return count
+
+
+def get_args(argv=None):
+    parser = ArgumentParser(
+        prog="cobosafe scan", description="Bulk-inspect Safes across chains."
+    )
+
+    parser.add_argument(
+        "--chains",
+        required=True,
+        help="Comma separated chains or aliases, eg: eth,matic,arb",
+    )
+
+    parser.add_argument(
+        "--safes",
+        required=True,
+        help="File of Safe addresses, one per line.",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="JSONL output file, default stdout.",
+    )
+
+    parser.add_argument(
+        "--factory",
+        default=None,
+        help="CoboFactory address.",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SCAN_WORKERS,
+        help="Safes scanned concurrently per chain.",
+    )
+
+    parser.add_argument(
+        "--dump",
+        action="store_true",
+        help="Include dump text in records.",
+    )
+
+    parser.add_argument(
+        "--brief",
+        action="store_true",
+        help="Skip role manager and authorizers.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from .utils import CHAIN_ALIASES
+
+    args = get_args(argv)
+    chains = [CHAIN_ALIASES.get(c, c) for c in args.chains.split(",") if c]
+    safes = load_safes(args.safes)
+
+    kwargs = dict(
+        factory_address=args.factory,
+        workers=args.workers,
+        full=not args.brief,
+        dump=args.dump,
+    )
+    if args.output == "-":
+        scan(chains, safes, sys.stdout, **kwargs)
+    else:
+        with open(args.output, "a") as f:
+            count = scan(chains, safes, f, **kwargs)
+        print(f"{count} records written to {args.output}")
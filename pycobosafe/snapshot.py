@@ -0,0 +1,141 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from brownie import web3
+
+SNAPSHOT_MIDDLEWARE = "pycobosafe_snapshot"
+
+# Read methods pinned to the snapshot block: method -> index of block param.
+PINNED_METHODS = {
+    "eth_call": 1,
+    "eth_getCode": 1,
+    "eth_getBalance": 1,
+    "eth_getStorageAt": 2,
+}
+
+# Snapshot of the current thread or task, worker threads get it through
+# `contextvars.copy_context()`.
+_SNAPSHOT = ContextVar("pycobosafe_snapshot", default=None)
+_lock = threading.Lock()
+
+
+class Snapshot(object):
+    """
+    All reads pinned to one block. Results are memoized by request, so
+    repeated reads inside the snapshot cost nothing.
+    """
+
+    def __init__(self, block) -> None:
+        self.block = block
+        self.memo = {}
+
+    @property
+    def block_param(self):
+        return hex(self.block)
+
+    def get(self, key):
+        return self.memo.get(key)
+
+    def put(self, key, value):
+        self.memo[key] = value
+
+    def get_call(self, target, data):
+        """
+        Returns (success, return data) of a memoized view call, or None.
+        """
+        return self.memo.get(("call", str(target).lower(), str(data).lower()))
+
+    def put_call(self, target, data, success, ret):
+        self.memo[("call", str(target).lower(), str(data).lower())] = (success, ret)
+
+
+def current_snapshot():
+    return _SNAPSHOT.get()
+
+
+def pin_block(block="latest"):
+    """
+    Returns the snapshot block instead of `latest` inside a snapshot.
+    """
+    snap = _SNAPSHOT.get()
+    if snap is not None and block in ("latest", None):
+        return snap.block_param
+    return block
+
+
+def _request_key(method, params):
+    # Drop the block param, it's always the snapshot block.
+    params = list(params)
+    params.pop(PINNED_METHODS[method])
+    return (method, repr(params))
+
+
+def snapshot_middleware(make_request, w3):
+    def middleware(method, params):
+        snap = _SNAPSHOT.get()
+        if snap is None or method not in PINNED_METHODS:
+            return make_request(method, params)
+
+        params = list(params)
+        i = PINNED_METHODS[method]
+        if len(params) <= i:
+            params.append("latest")
+        if params[i] not in ("latest", None):
+            # Explicit block, don't pin.
+            return make_request(method, params)
+        params[i] = snap.block_param
+
+        key = _request_key(method, params)
+        resp = snap.get(key)
+        if resp is None:
+            resp = make_request(method, params)
+            if "error" not in resp:
+                snap.put(key, resp)
+        return resp
+
+    return middleware
+
+
+def _install_middleware():
+    with _lock:
+        if SNAPSHOT_MIDDLEWARE not in web3.middleware_onion:
+            web3.middleware_onion.add(snapshot_middleware, SNAPSHOT_MIDDLEWARE)
+
+
+@contextmanager
+def snapshot(block="latest"):
+    """
+    Pin every read to one block, eg:
+
+        with snapshot():
+            obj.dump()
+    """
+    _install_middleware()
+    if block == "latest":
+        block = web3.eth.block_number
+
+    snap = Snapshot(int(block))
+    token = _SNAPSHOT.set(snap)
+    try:
+        yield snap
+    finally:
+        _SNAPSHOT.reset(token)
+
+
+@contextmanager
+def at_block(block, chain=None):
+    """
+    Pin reads to `block`, of the brownie network or the chain handle.
+    """
+    if chain is None:
+        with snapshot(block):
+            yield
+        return
+
+    prev = chain.block
+    chain.block = block
+    try:
+        yield
+    finally:
+        chain.block = prev
@@ -0,0 +1,28 @@
+import eth_abi
+
+from pycobosafe.utils import abi_encode_many, abi_encode_with_sig, func_selector
+
+TOKEN = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+
+
+def test_abi_encode_with_sig():
+    data = abi_encode_with_sig("transfer(address,uint256)", [TOKEN, 1])
+    assert data == func_selector("transfer(address,uint256)") + eth_abi.encode(
+        ["address", "uint256"], [TOKEN, 1]
+    )
+
+    # Dynamic params.
+    data = abi_encode_with_sig("f(bytes,uint256[])", [b"\x01", [1, 2]])
+    assert data[4:] == eth_abi.encode(["bytes", "uint256[]"], [b"\x01", [1, 2]])
+
+
+def test_abi_encode_many():
+    args_list = [(TOKEN, i) for i in [0, 1, 7, 2**255]]
+    datas = abi_encode_many("approve(address,uint256)", args_list)
+
+    # Same as the uncached encoder.
+    selector = func_selector("approve(address,uint256)")
+    assert datas == [
+        selector + eth_abi.encode(["address", "uint256"], args) for args in args_list
+    ]
+    assert abi_encode_many("approve(address,uint256)", []) == []
@@ -0,0 +1,40 @@
+import asyncio
+
+from brownie import network
+
+from pycobosafe.aio import AsyncConnection, AsyncContract, build_model
+from pycobosafe.export import build_model as sync_build_model
+
+CHAIN = "bsc-main"
+
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+
+def get_conn():
+    return AsyncConnection(network.main.CONFIG.networks[CHAIN]["host"])
+
+
+def test_async_contract():
+    token = AsyncContract(get_conn(), "ERC20", COBO_SAFE)
+    data = token.transfer.encode_input(COBO_SAFE, 1)
+    assert data.hex()[:8] == "a9059cbb"
+    assert token.decimals.decode_output(b"\x00" * 31 + b"\x12") == 18
+
+
+def test_build_model():
+    async def _build():
+        conn = get_conn()
+        conn.block = await conn.w3.eth.block_number
+        return conn.block, await build_model(conn, COBO_SAFE)
+
+    block, model = asyncio.run(_build())
+    assert model["Name"] == "CoboSafeAccount"
+    assert [c["Address"] for c in model["Children"]] == [
+        model["Role manager"],
+        model["Authorizer"],
+    ]
+
+    from pycobosafe.snapshot import snapshot
+
+    with snapshot(block):
+        assert model == sync_build_model(COBO_SAFE)
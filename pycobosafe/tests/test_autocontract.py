@@ -0,0 +1,21 @@
+from pycobosafe.account import CoboSafeAccount
+from pycobosafe.authorizer import BaseACL, FuncAuthorizer, TransferAuthorizer
+from pycobosafe.autocontract import convert
+from pycobosafe.ownable import BaseOwnable
+from pycobosafe.utils import ZERO_ADDRESS
+
+CHAIN = "bsc-main"
+
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+
+def test_registry():
+    assert BaseOwnable.get_class_by_name("CoboSafeAccount") is CoboSafeAccount
+    assert BaseOwnable.get_class_by_type("FunctionType") is FuncAuthorizer
+    assert BaseOwnable.get_class_by_type("TransferType") is TransferAuthorizer
+    assert BaseOwnable.get_class_by_type("CommonType") is BaseACL
+
+
+def test_convert():
+    assert isinstance(convert(COBO_SAFE), CoboSafeAccount)
+    assert convert(ZERO_ADDRESS) is None
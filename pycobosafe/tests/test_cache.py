@@ -0,0 +1,45 @@
+import time
+
+from pycobosafe.cache import MetadataCache
+
+ADDR = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+
+
+def test_metadata_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = MetadataCache(path)
+    assert cache.get(1, ADDR, "0xa3f4df7e") is None
+
+    cache.set(1, ADDR, "0xa3f4df7e", b"\x01" * 32)
+    assert cache.get(1, ADDR.upper(), "0xA3F4DF7E") == b"\x01" * 32
+    assert cache.get(56, ADDR, "0xa3f4df7e") is None
+
+    # Persistent across instances.
+    assert MetadataCache(path).get(1, ADDR, "0xa3f4df7e") == b"\x01" * 32
+
+    # Expired.
+    assert MetadataCache(path, ttl=0).get(1, ADDR, "0xa3f4df7e") is None
+    cache.ttl = 0
+    assert cache.get(1, ADDR, "0xa3f4df7e") is None
+
+
+def test_metadata_cache_dev_chain(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = MetadataCache(path)
+    cache.set(31337, ADDR, "0xa3f4df7e", b"\x01" * 32)
+    assert cache.get(31337, ADDR, "0xa3f4df7e") == b"\x01" * 32
+
+    # Not persisted.
+    assert MetadataCache(path).get(31337, ADDR, "0xa3f4df7e") is None
+
+
+def test_metadata_cache_evict(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache.db"), max_entries=2)
+    for i in range(3):
+        cache.set(1, ADDR, hex(i), b"\x00")
+        time.sleep(0.01)
+    cache.evict()
+
+    cache = MetadataCache(cache.path)
+    assert cache.get(1, ADDR, hex(0)) is None
+    assert cache.get(1, ADDR, hex(2)) == b"\x00"
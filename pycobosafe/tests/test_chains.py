@@ -0,0 +1,49 @@
+from pycobosafe.autocontract import convert
+from pycobosafe.chains import chain_pool, get_chain
+from pycobosafe.export import build_model
+from pycobosafe.factory import CoboFactory
+from pycobosafe.multicall import Call, multicall
+from pycobosafe.ownable import ERC20
+
+ETH = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+
+BSC_COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+
+def test_chain_pool():
+    eth, bsc = chain_pool().warm(["eth", "bsc"])
+    assert get_chain("mainnet") is eth
+    assert eth.id == 1
+    assert bsc.id == 56
+    assert eth.contract("ERC20", ETH) is eth.contract("ERC20", ETH.upper()[2:])
+
+
+def test_cross_chain():
+    eth = get_chain("eth")
+    bsc = get_chain("bsc")
+
+    assert ERC20(ETH, eth).symbol == "WETH"
+
+    # Calls of two chains in one batch.
+    weth, factory_name = multicall(
+        [
+            Call(ERC20(ETH, eth).contract.symbol),
+            Call(CoboFactory(chain=bsc).contract.NAME),
+        ]
+    )
+    assert weth.result == "WETH"
+    assert factory_name.result.rstrip(b"\x00") == b"CoboFactory"
+
+    assert convert(BSC_COBO_SAFE, bsc).__class__.__name__ == "CoboSafeAccount"
+    model = build_model(BSC_COBO_SAFE, chain=bsc)
+    assert model["Name"] == "CoboSafeAccount"
+    assert len(model["Children"]) == 2
+
+
+def test_chain_read_only():
+    token = ERC20(ETH, get_chain("eth")).contract
+    try:
+        token.approve(ETH, 1)
+        assert False, "should raise"
+    except TypeError:
+        pass
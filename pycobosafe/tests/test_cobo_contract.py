@@ -1,4 +1,5 @@
 from pycobosafe.account import CoboSafeAccount
+from pycobosafe.authorizer import ArgusRootAuthorizer
 from pycobosafe.factory import CoboFactory
 from pycobosafe.gnosissafe import GnosisSafe
 
@@ -24,3 +25,16 @@ def test_cobo_contract():
     r = f.get_all_impls()
     print(r)
     assert len(r) > 0
+
+
+def test_root_authorizer():
+    c = CoboSafeAccount(COBO_SAFE)
+    auth = ArgusRootAuthorizer(c.authorizer)
+
+    # Role graph is loaded once and reused.
+    graph = auth.load_role_graph()
+    assert auth.load_role_graph() is graph
+    roles, delegate_to_roles = graph
+    for delegate, delegate_roles in delegate_to_roles.items():
+        assert set(delegate_roles) <= roles
+        assert auth.delegates[delegate] == ",".join(delegate_roles)
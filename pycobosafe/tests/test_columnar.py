@@ -0,0 +1,58 @@
+from array import array
+
+from pycobosafe.columnar import (
+    NPY_ALIGN,
+    AddressColumn,
+    Uint256Column,
+    format_selector,
+    read_npy,
+    selector_column,
+    uint_column,
+    write_npy,
+)
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+DEAD = "0x000000000000000000000000000000000000dEaD"
+
+
+def test_address_column():
+    column = AddressColumn([WETH, DEAD.lower(), WETH])
+    assert len(column) == 3
+    assert len(column.buffer) == 60
+    assert list(column) == [WETH, DEAD, WETH]
+    assert column[-1] == WETH
+    assert DEAD in column
+    assert "0x" + "00" * 20 not in column
+
+
+def test_selector_column():
+    selectors = selector_column(["0x095ea7b3", bytes.fromhex("a9059cbb") + b"\0" * 28])
+    assert selectors.itemsize == 4
+    assert [format_selector(s) for s in selectors] == ["0x095ea7b3", "0xa9059cbb"]
+
+
+def test_uint_column():
+    assert uint_column([1, 2**64 - 1]) == array("Q", [1, 2**64 - 1])
+
+    column = uint_column([1, 2**64, 2**256 - 1])
+    assert isinstance(column, Uint256Column)
+    assert len(column.buffer) == 96
+    assert list(column) == [1, 2**64, 2**256 - 1]
+    assert column[-1] == 2**256 - 1
+
+
+def test_npy(tmp_path):
+    for column in (
+        AddressColumn([WETH, DEAD]),
+        selector_column(["0x095ea7b3"]),
+        array("Q", [1, 2**40]),
+        Uint256Column([1, 2**128]),
+    ):
+        path = str(tmp_path / "column.npy")
+        write_npy(path, column)
+        with open(path, "rb") as f:
+            data = f.read()
+        assert data.startswith(b"\x93NUMPY")
+        header_size = 10 + int.from_bytes(data[8:10], "little")
+        assert header_size % NPY_ALIGN == 0
+        assert read_npy(path) == column
@@ -1,4 +1,4 @@
-from pycobosafe.utils import abi_encode_with_sig, load_contract
+from pycobosafe.utils import abi_encode_with_sig, load_abi, load_contract
 
 CHAIN = "mainnet"
 
@@ -20,3 +20,11 @@ def test_contract_wrapper():
     assert tx["from"] == token.address
     transfer_data = abi_encode_with_sig("transfer(address,uint256)", [token.address, 0])
     assert tx["data"] == "0x" + transfer_data.hex()
+
+
+def test_contract_cache():
+    assert load_abi("ERC20") is load_abi("ERC20")
+
+    token = load_contract("ERC20", ETH)
+    assert load_contract("ERC20", ETH.upper().replace("0X", "0x")) is token
+    assert load_contract("BaseOwnable", ETH) is not token
@@ -0,0 +1,40 @@
+from eth_utils import keccak
+
+from pycobosafe.create2 import Create2Engine, create2_address, mine_salt
+from pycobosafe.factory import CoboFactory
+from pycobosafe.utils import b32
+
+CHAIN = "bsc-main"
+
+COBO_FACTORY = "0x51e6540A5E766EB864aa32F548433D892Fd6008a"
+SAFE = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+IMPL = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+
+def test_create2_address():
+    # Example 0 of EIP-1014.
+    addr = create2_address("0x" + "00" * 20, 0, keccak(b"\0"))
+    assert addr == "0x4D1A2e2bB4F88F0250f26Ffff098B0b30B26BF38"
+
+
+def test_create2_batch():
+    engine = Create2Engine(COBO_FACTORY, IMPL)
+    salts = list(range(100))
+    addrs = engine.addresses([SAFE] * len(salts), salts)
+    assert addrs[7] == engine.address(SAFE, 7)
+    assert len(set(addrs)) == len(salts)
+
+
+def test_mine_salt():
+    engine = Create2Engine(COBO_FACTORY, IMPL)
+    salt, addr = mine_salt(engine, SAFE, "0x0", max_salts=10000, workers=2)
+    assert addr.lower().startswith("0x0")
+    assert engine.address(SAFE, salt) == addr
+    assert mine_salt(engine, SAFE, "00" * 20, max_salts=1000, workers=2) is None
+
+
+def test_factory_create2_address():
+    f = CoboFactory(COBO_FACTORY)
+    salt = b"\1" * 32
+    expected = f.contract.getCreate2Address(SAFE, b32("FuncAuthorizer"), salt)
+    assert f.get_create2_address("FuncAuthorizer", salt, SAFE) == expected
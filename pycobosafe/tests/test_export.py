@@ -0,0 +1,35 @@
+import json
+
+import yaml
+from hexbytes import HexBytes
+
+from pycobosafe.export import export_model, to_plain
+
+CHAIN = "bsc-main"
+
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+
+def test_to_plain():
+    class Addr(str):
+        pass
+
+    assert to_plain({Addr("a"): [b"\x01", 2, True, None, (Addr("b"),)]}) == {
+        "a": ["0x01", 2, True, None, ["b"]]
+    }
+    assert to_plain(HexBytes("0x0102")) == "0x0102"
+
+
+def test_export_model(tmp_path):
+    path = str(tmp_path / "cobosafe.json")
+    model = export_model(COBO_SAFE, path)
+    assert model["Name"] == "CoboSafeAccount"
+    assert [c["Address"] for c in model["Children"]] == [
+        model["Role manager"],
+        model["Authorizer"],
+    ]
+    assert json.load(open(path)) == to_plain(model)
+
+    path = str(tmp_path / "cobosafe.yaml")
+    export_model(COBO_SAFE, path, full=False)
+    assert yaml.safe_load(open(path))["Address"] == COBO_SAFE
@@ -0,0 +1,50 @@
+from pycobosafe.factory import CoboFactory, FactoryCache
+from pycobosafe.rpcbatch import batched
+
+CHAIN = "bsc-main"
+
+COBO_FACTORY = "0x51e6540A5E766EB864aa32F548433D892Fd6008a"
+SAFE = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+
+def test_factory_bulk():
+    f = CoboFactory(COBO_FACTORY)
+    impls = f.get_all_implementations()
+    assert impls["CoboSafeAccount"]
+    assert f.get_all_implementations() is impls
+
+    latest = f.get_all_impls()
+    assert latest["CoboSafeAccount"] == f.get_address("CoboSafeAccount")
+
+    assert f.get_cobosafes([SAFE, COBO_SAFE]) == [COBO_SAFE, None]
+    assert f.get_cobosafe(SAFE) == COBO_SAFE
+
+
+def test_factory_defer():
+    f = CoboFactory(COBO_FACTORY)
+    with batched():
+        owner, name = f.defer("owner", "NAME")
+        # Resolved together when the context exits.
+        assert not owner.done and not name.done
+    assert owner.done and name.done
+    assert owner.result == f.owner
+
+
+class _NoLogs(object):
+    class eth(object):
+        @staticmethod
+        def get_logs(params):
+            raise ValueError("block range too large")
+
+
+def test_factory_cache_update():
+    cache = FactoryCache()
+    cache.block = 100
+    cache.impls = {"CoboSafeAccount": [COBO_SAFE]}
+    cache.records[(SAFE.lower(), "CoboSafeAccount")] = [COBO_SAFE]
+
+    cache.update(_NoLogs, COBO_FACTORY, 200)
+    assert cache.block == 200
+    assert cache.impls is None
+    assert cache.records == {}
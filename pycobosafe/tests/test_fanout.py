@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+
+from pycobosafe.fanout import FANOUT_WORKERS, RateLimiter, run_in_order
+
+
+def test_run_in_order(capsys):
+    def _task(i):
+        def _run():
+            # Later tasks finish first.
+            time.sleep(0.05 * (3 - i))
+            print("task", i)
+            return i
+
+        return _run
+
+    assert run_in_order([_task(i) for i in range(3)]) == [0, 1, 2]
+    assert capsys.readouterr().out == "task 0\ntask 1\ntask 2\n"
+
+
+def test_run_in_order_nested():
+    threads = set()
+
+    def _inner(i):
+        def _run():
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            return i
+
+        return _run
+
+    def _outer():
+        return run_in_order([_inner(i) for i in range(10)])
+
+    assert run_in_order([_outer] * 20) == [list(range(10))] * 20
+    # One bounded pool, plus the calling thread.
+    assert len(threads) <= FANOUT_WORKERS + 1
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(20)
+    start = time.monotonic()
+    for _ in range(30):
+        limiter.acquire()
+    # 20 burst, 10 more at 20/s.
+    assert time.monotonic() - start >= 0.4
+
+
+def test_rate_limiter_async():
+    limiter = RateLimiter(20)
+
+    async def _acquire():
+        await asyncio.gather(*[limiter.acquire_async() for _ in range(30)])
+
+    start = time.monotonic()
+    asyncio.run(_acquire())
+    assert time.monotonic() - start >= 0.4
@@ -0,0 +1,31 @@
+from pycobosafe.gnosissafe import GnosisSafe
+from pycobosafe.snapshot import snapshot
+
+CHAIN = "bsc-main"
+
+SAFE = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+
+def test_safe_lazy_state():
+    s = GnosisSafe(SAFE)
+    # Nothing read until used.
+    assert not s._states
+
+    assert s.threshold > 0
+    assert len(s.owners) > 0
+    assert s.nonce >= 0
+    assert COBO_SAFE in s.modules
+    # One read of the latest block.
+    assert list(s._states) == [None]
+
+    with snapshot() as snap:
+        assert s.owners == s.contract.getOwners()
+        assert snap.block in s._states
+
+
+def test_safe_load_many():
+    a, b = GnosisSafe.load_many([SAFE, SAFE])
+    assert a is not b
+    assert a.state == b.state
+    assert a.state["owners"] == GnosisSafe(SAFE).owners
@@ -0,0 +1,57 @@
+from pycobosafe.hint import HintCache
+
+DELEGATE = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+TOKEN = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+
+
+class FakeHintCache(HintCache):
+    authorizers = "v1"
+
+    def authorizer_set_version(self):
+        return self.authorizers
+
+
+def test_hint_cache():
+    simulated = []
+
+    def _simulate(account, txs, delegate):
+        simulated.extend(txs)
+        return [b"hint" + bytes.fromhex(tx[3][2:10]) for tx in txs]
+
+    cache = FakeHintCache(None, ttl=0, simulator=_simulate)
+    transfer = [0, TOKEN, 0, "0xa9059cbb" + "00" * 64, b"", b""]
+    approve = [0, TOKEN, 0, "0x095ea7b3" + "00" * 64, b"", b""]
+
+    assert cache.precompute(DELEGATE, [transfer, approve, transfer]) == [
+        b"hint\xa9\x05\x9c\xbb",
+        b"hint\x09\x5e\xa7\xb3",
+        b"hint\xa9\x05\x9c\xbb",
+    ]
+    assert len(simulated) == 2
+
+    # Same call shape with other args hits the cache.
+    transfer2 = [0, TOKEN, 0, "0xa9059cbb" + "11" * 64, b"", b""]
+    assert cache.get_hint(DELEGATE, transfer2) == b"hint\xa9\x05\x9c\xbb"
+    assert len(simulated) == 2
+
+    # Authorizer set changes.
+    cache.authorizers = "v2"
+    cache.get_hint(DELEGATE, transfer)
+    assert len(simulated) == 3
+
+    cache.drop(DELEGATE, transfer)
+    cache.get_hint(DELEGATE, transfer)
+    assert len(simulated) == 4
+
+
+def test_hint_cache_version_change():
+    cache = FakeHintCache(None, ttl=0)
+
+    def _simulate(account, txs, delegate):
+        # The authorizer set changes while hints are computed.
+        cache.authorizers = "v2"
+        return [b"hint"] * len(txs)
+
+    cache.simulator = _simulate
+    transfer = [0, TOKEN, 0, "0xa9059cbb" + "00" * 64, b"", b""]
+    assert cache.precompute(DELEGATE, [transfer]) == [b"hint"]
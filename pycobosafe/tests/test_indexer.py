@@ -0,0 +1,45 @@
+import eth_utils
+
+from pycobosafe.indexer import EventIndexer, decode_log, get_events
+from pycobosafe.utils import b32
+
+CHAIN = "bsc-main"
+
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+DELEGATE = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+
+
+def _topic(addr):
+    return "0x" + "00" * 12 + addr[2:].lower()
+
+
+def test_decode_log():
+    events = get_events("FlatRoleManager")
+    (topic,) = [t for t, abi in events.items() if abi["name"] == "RoleGranted"]
+    log = {
+        "topics": [topic, b32("trader"), _topic(DELEGATE), _topic(COBO_SAFE)],
+        "data": "0x",
+    }
+    event, args = decode_log("FlatRoleManager", log)
+    assert event == "RoleGranted"
+    assert args["role"] == b32("trader")
+    assert args["delegate"] == eth_utils.to_checksum_address(DELEGATE)
+    assert args["sender"] == COBO_SAFE
+
+
+def test_indexer(tmp_path):
+    path = str(tmp_path / "index.json")
+    indexer = EventIndexer.for_account(COBO_SAFE.lower(), path)
+    account = indexer.get(COBO_SAFE)
+    assert indexer.get(COBO_SAFE.lower()) == account
+    assert indexer.contracts[account["role_manager"]] == "FlatRoleManager"
+    assert indexer.contracts[account["authorizer"]] == "ArgusRootAuthorizer"
+
+    indexer.sync()
+    block = indexer.block
+
+    # Resumes from the saved state.
+    indexer = EventIndexer(path)
+    assert indexer.block == block
+    assert indexer.get(COBO_SAFE) == account
+    assert indexer.sync(block) == 0
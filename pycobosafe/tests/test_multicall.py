@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from pycobosafe.multicall import Call, call_many, multicall
+from pycobosafe.rpcbatch import batched, current_batch
+from pycobosafe.utils import ZERO_ADDRESS, load_contract
+
+CHAIN = "mainnet"
+
+ETH = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+
+
+def test_multicall():
+    token = load_contract("ERC20", ETH)
+    symbol, decimals = multicall([Call(token.symbol), Call(token.decimals)])
+    assert symbol.result == token.symbol()
+    assert decimals.result == 18
+
+    (balance,) = call_many(token.balanceOf, [token.address])
+    assert balance.result == token.balanceOf(token.address)
+
+    # Failure is isolated to the failed call.
+    not_token = load_contract("ERC20", ZERO_ADDRESS)
+    ok, failed = multicall([Call(token.decimals), Call(not_token.decimals)])
+    assert ok.ok and ok.result == 18
+    assert not failed.ok
+    try:
+        failed.result
+        assert False, "should raise"
+    except Exception:
+        pass
+
+
+def test_batched():
+    token = load_contract("ERC20", ETH)
+    with batched():
+        symbol, decimals = multicall([Call(token.symbol), Call(token.decimals)])
+        # Deferred until read.
+        assert not symbol.done and not decimals.done
+        assert decimals.result == 18
+        assert symbol.done
+        assert symbol.result == token.symbol()
+
+    with batched():
+        # Read at once, not left pending.
+        assert Call(token.decimals).result == 18
+
+        # Seen by workers running in a copy of the context.
+        with ThreadPoolExecutor(1) as pool:
+            assert pool.submit(copy_context().run, current_batch).result()
@@ -0,0 +1,44 @@
+from pycobosafe.multisend import (
+    MULTISEND_ADDRESS,
+    MULTISEND_CALL_ONLY_ADDRESS,
+    MULTISEND_CALL_ONLY_EIP155_ADDRESS,
+    MULTISEND_EIP155_ADDRESS,
+    encode_multisend,
+    multisend_call,
+    set_multisend_addresses,
+)
+from pycobosafe.utils import Operation
+
+TOKEN = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+
+
+def test_encode_multisend():
+    packed = encode_multisend(
+        [
+            (TOKEN, "0x1234"),
+            {"to": TOKEN, "data": b"", "value": 5, "operation": 1},
+        ]
+    )
+    addr = bytes.fromhex(TOKEN[2:])
+    assert packed == (
+        b"\x00" + addr + (0).to_bytes(32, "big") + (2).to_bytes(32, "big") + b"\x12\x34"
+    ) + (b"\x01" + addr + (5).to_bytes(32, "big") + (0).to_bytes(32, "big"))
+
+
+def test_multisend_call():
+    to, data = multisend_call([(TOKEN, b"")])
+    assert to == MULTISEND_CALL_ONLY_ADDRESS
+    assert data[:4].hex() == "8d80ff0a"  # multiSend(bytes)
+
+    to, _ = multisend_call([(TOKEN, b"", 0, Operation.DELEGATE_CALL)])
+    assert to == MULTISEND_ADDRESS
+
+
+def test_multisend_addresses():
+    set_multisend_addresses(
+        1337, MULTISEND_EIP155_ADDRESS, MULTISEND_CALL_ONLY_EIP155_ADDRESS
+    )
+    assert multisend_call([(TOKEN, b"")], 1337)[0] == MULTISEND_CALL_ONLY_EIP155_ADDRESS
+    txs = [(TOKEN, b"", 0, Operation.DELEGATE_CALL)]
+    assert multisend_call(txs, 1337)[0] == MULTISEND_EIP155_ADDRESS
+    assert multisend_call(txs, address=TOKEN)[0] == TOKEN
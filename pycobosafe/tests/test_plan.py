@@ -0,0 +1,91 @@
+from pycobosafe.export import build_model, iter_models
+from pycobosafe.multisend import MULTISEND_ADDRESS, encode_multisend, multisend_call
+from pycobosafe.plan import Plan, load_desired, make_plan
+from pycobosafe.utils import Operation
+
+CHAIN = "bsc-main"
+
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+HELPER = "0x000000000000000000000000000000000000bEEF"
+
+DELEGATE = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+AUTH = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+TOKEN = "0x10ED43C718714eb63d5aA57B78B54704E256024E"
+
+
+def test_plan_diff():
+    plan = Plan(COBO_SAFE, HELPER)
+    plan.diff_delegates({DELEGATE: ["trader"]}, {DELEGATE: ["trader", "Viewer"]})
+    plan.diff_authorizers({"trader": [AUTH]}, {"trader": [AUTH], "Viewer": [AUTH]})
+    plan.diff_funcs(
+        AUTH,
+        {TOKEN: ["0x095ea7b3", "0x12345678"]},
+        {TOKEN: ["approve(address,uint256)", "transfer(address,uint256)"]},
+    )
+    plan.diff_receivers(AUTH, {TOKEN: []}, {TOKEN: [DELEGATE]})
+
+    # Role names keep their case.
+    assert "Viewer" in repr(plan.steps[0])
+    assert [step.operation for step in plan.steps] == [
+        Operation.DELEGATE_CALL,  # grantRoles
+        Operation.DELEGATE_CALL,  # addAuthorizer
+        Operation.DELEGATE_CALL,  # setFuncAuthorizerParams with the new signature
+        Operation.CALL,  # removeContractFuncsSig 0x12345678
+        Operation.DELEGATE_CALL,  # setTransferAuthorizerParams
+    ]
+    assert plan.steps[3].to == AUTH
+
+    same = Plan(COBO_SAFE, HELPER)
+    same.diff_delegates({DELEGATE: ["trader"]}, {DELEGATE.lower(): ["trader"]})
+    assert not same.steps
+
+
+def test_plan_multisend():
+    plan = Plan(COBO_SAFE, HELPER)
+    plan.diff_delegates({}, {DELEGATE: ["trader"]})
+    plan.diff_funcs(AUTH, {TOKEN: ["0x12345678"]}, {})
+
+    to, data = multisend_call(plan.txs)
+    assert to == MULTISEND_ADDRESS
+    assert data[:4].hex() == "8d80ff0a"  # multiSend(bytes)
+
+    packed = encode_multisend(plan.txs)
+    assert packed in data
+    grant, remove = plan.steps
+    assert packed.endswith(remove.data)
+
+    # operation + to of each tx.
+    def head(operation, to):
+        return bytes([operation]) + bytes.fromhex(to[2:])
+
+    assert packed.startswith(head(Operation.DELEGATE_CALL, HELPER))
+    offset = 1 + 20 + 32 + 32 + len(grant.data)
+    assert packed[offset : offset + 21] == head(Operation.CALL, AUTH)
+
+
+def test_load_desired(tmp_path):
+    path = tmp_path / "desired.yaml"
+    path.write_text(
+        f"Delegates:\n  {DELEGATE}: [trader]\n"
+        f"Authorizers:\n  trader: [{AUTH}]\n"
+        f"Authorizer params:\n  {AUTH}:\n"
+        f"    Contract functions:\n      {TOKEN}: [0x095ea7b3]\n"
+        f"    Limit: 10\n"
+    )
+    # Unquoted addresses and selectors are kept as strings.
+    assert load_desired(str(path)) == {
+        "Delegates": {DELEGATE: ["trader"]},
+        "Authorizers": {"trader": [AUTH]},
+        "Authorizer params": {
+            AUTH: {"Contract functions": {TOKEN: ["0x095ea7b3"]}, "Limit": 10}
+        },
+    }
+
+
+def test_make_plan_noop():
+    root = None
+    for model in iter_models(build_model(COBO_SAFE, True)):
+        if model.get("Name") == "ArgusRootAuthorizer":
+            root = model
+    desired = {"Delegates": root["Delegates"], "Authorizers": root["Authorizers"]}
+    assert make_plan(COBO_SAFE, desired, HELPER).steps == []
@@ -0,0 +1,74 @@
+from hexbytes import HexBytes
+
+from pycobosafe.policy import Policy
+from pycobosafe.utils import ETH_ADDRESS, abi_encode_with_sig
+
+CHAIN = "bsc-main"
+
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+DELEGATE = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+TOKEN = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+ROUTER = "0x10ED43C718714eb63d5aA57B78B54704E256024E"
+RECEIVER = "0x000000000000000000000000000000000000dEaD"
+
+MODEL = {
+    "Name": "CoboSafeAccount",
+    "Address": COBO_SAFE,
+    "Children": [
+        {
+            "Name": "ArgusRootAuthorizer",
+            "Address": "0x1",
+            "Authorizers": {"trader": ["0x2", "0x3", "0x4"], "viewer": ["0x5"]},
+            "Delegates": {DELEGATE: ["trader"], RECEIVER: ["viewer"]},
+            "Children": [
+                {
+                    "Address": "0x2",
+                    "Type": "FunctionType",
+                    "Contract functions": {TOKEN: ["0x095ea7b3"]},
+                },
+                {
+                    "Address": "0x3",
+                    "Type": "TransferType",
+                    "Token receivers": {TOKEN: [RECEIVER], ETH_ADDRESS: [RECEIVER]},
+                },
+                {
+                    "Address": "0x4",
+                    "Type": "DexType",
+                    "Contracts": [ROUTER],
+                    "In tokens": [TOKEN],
+                    "Out tokens": [ETH_ADDRESS],
+                },
+                {"Address": "0x5", "Type": "CustomType"},
+            ],
+        }
+    ],
+}
+
+
+def test_policy_model():
+    policy = Policy.from_model(MODEL)
+
+    approve = abi_encode_with_sig("approve(address,uint256)", [ROUTER, 1])
+    transfer = abi_encode_with_sig("transfer(address,uint256)", [RECEIVER, 1])
+    assert policy.check_tx(DELEGATE, TOKEN, approve) is True
+    assert policy.check_tx(DELEGATE.lower(), TOKEN, transfer) is True
+    assert policy.check_tx(DELEGATE, TOKEN, HexBytes(transfer)) is True
+    assert policy.check(DELEGATE, TOKEN, HexBytes(approve)[:4]) is True
+    assert policy.check_tx(DELEGATE, RECEIVER, value=1) is True
+    assert policy.check_tx(DELEGATE, ROUTER, value=1) is False
+    assert policy.check_tx(DELEGATE, ROUTER, "0x12345678") is None
+    assert policy.check(DELEGATE, ROUTER, token=RECEIVER) is False
+    assert policy.check_tx(DELEGATE, RECEIVER, approve) is False
+
+    # Authorizer of unknown type.
+    assert policy.check_tx(RECEIVER, TOKEN, approve) is None
+    assert policy.check_tx(TOKEN, TOKEN, approve) is False
+
+    txs = [{"to": TOKEN, "data": approve}, {"to": RECEIVER, "data": approve}]
+    assert policy.check_many(DELEGATE, txs) == [True, False]
+
+
+def test_policy_load():
+    policy = Policy.load(COBO_SAFE)
+    assert policy.delegates
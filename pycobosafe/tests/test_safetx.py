@@ -0,0 +1,48 @@
+import json
+
+from eth_account import Account
+
+from pycobosafe.gnosissafe import GnosisSafe
+from pycobosafe.safetx import sign_with_keystores
+from pycobosafe.utils import Operation
+
+CHAIN = "bsc-main"
+
+SAFE = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+
+def test_safe_tx_hash():
+    s = GnosisSafe(SAFE)
+    assert s.domain_separator == bytes(s.contract.domainSeparator())
+
+    tx = s.build_tx(COBO_SAFE, "0x1234", 1, Operation.DELEGATE_CALL)
+    assert tx.nonce == s.nonce
+    expected = s.contract.getTransactionHash(
+        COBO_SAFE, 1, "0x1234", 1, 0, 0, 0, tx.gas_token, tx.refund_receiver, tx.nonce
+    )
+    assert tx.hash == bytes(expected)
+
+
+def test_sign_with_keystores(tmp_path):
+    keystores = []
+    for i in range(2):
+        account = Account.create()
+        path = tmp_path / f"key{i}.json"
+        path.write_text(json.dumps(Account.encrypt(account.key, "pass")))
+        keystores.append((str(path), "pass"))
+
+    s = GnosisSafe(SAFE)
+    txs = s.build_txs([(COBO_SAFE, b""), (COBO_SAFE, "0x12")])
+    assert [tx.nonce for tx in txs] == [s.nonce, s.nonce + 1]
+
+    owners = sign_with_keystores(txs, keystores)
+    for tx in txs:
+        assert set(tx.signatures) == set(owners)
+        for owner, signature in tx.signatures.items():
+            assert Account._recover_hash(tx.hash, signature=signature) == owner
+
+    # Sorted by owner address.
+    sigs = txs[0].encoded_signatures()
+    first = txs[0].signatures[min(owners, key=lambda o: int(o, 16))]
+    assert sigs[:65] == first
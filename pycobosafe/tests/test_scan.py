@@ -0,0 +1,23 @@
+import io
+import json
+
+from pycobosafe.scan import load_safes, scan
+
+SAFE = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+
+
+def test_load_safes(tmp_path):
+    path = tmp_path / "safes.txt"
+    path.write_text(f"# bsc safes\n{SAFE}\n\n{COBO_SAFE}  # not a safe\n")
+    assert load_safes(str(path)) == [SAFE, COBO_SAFE]
+
+
+def test_scan():
+    out = io.StringIO()
+    assert scan(["bsc-main"], [SAFE], out, full=False) == 1
+
+    record = json.loads(out.getvalue())
+    assert record["chain"] == "bsc-main"
+    assert record["cobosafe"] == COBO_SAFE
+    assert record["model"]["Name"] == "CoboSafeAccount"
@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from brownie import web3
+
+from pycobosafe.multicall import Call
+from pycobosafe.snapshot import current_snapshot, snapshot
+from pycobosafe.utils import load_contract
+
+CHAIN = "mainnet"
+
+ETH = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+
+
+def test_snapshot():
+    token = load_contract("ERC20", ETH)
+    block = web3.eth.block_number - 10
+    with snapshot(block) as snap:
+        assert current_snapshot() is snap
+        supply = token.totalSupply()
+        assert supply == token.totalSupply(block_identifier=block)
+        assert len(snap.memo) > 0
+
+        # Memoized, no more requests.
+        size = len(snap.memo)
+        assert token.totalSupply() == supply
+        assert Call(token.totalSupply).result == supply
+        assert len(snap.memo) <= size + 1
+
+    assert current_snapshot() is None
+
+
+def test_snapshot_threads():
+    with snapshot(1) as snap:
+        with ThreadPoolExecutor(1) as pool:
+            # Not shared with other threads, unless the context is copied.
+            assert pool.submit(current_snapshot).result() is None
+            assert pool.submit(copy_context().run, current_snapshot).result() is snap
+
+            with snapshot(2) as inner:
+                assert current_snapshot() is inner
+            assert current_snapshot() is snap
@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Seconds allowed to start the CLI, without any network command.
+STARTUP_BUDGET = 1.0
+
+HEAVY_MODULES = ("brownie", "web3", "eth_abi", "yaml", "IPython")
+
+CODE = """
+import json, sys
+from pycobosafe.main import get_args
+from pycobosafe.console import CoboSafeConsole
+
+args = get_args(["-c", "bsc-main"])
+CoboSafeConsole(args.chain).single_command("glob")
+print(json.dumps([m for m in %r if m in sys.modules]))
+""" % (
+    HEAVY_MODULES,
+)
+
+
+def test_cli_startup(tmp_path):
+    # Cached chain list in a fresh home, no brownie network config.
+    os.makedirs(tmp_path / ".pycobosafe")
+    with open(tmp_path / ".pycobosafe" / "chains.json", "w") as f:
+        json.dump({"mtime": None, "chains": ["mainnet", "bsc-main"]}, f)
+
+    env = dict(os.environ, HOME=str(tmp_path))
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", CODE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    elapsed = time.perf_counter() - start
+    print(f"CLI startup: {elapsed:.3f}s")
+
+    assert "Network: bsc-main" in out
+    assert json.loads(out.splitlines()[-1]) == []
+    assert elapsed < STARTUP_BUDGET
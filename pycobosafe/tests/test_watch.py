@@ -0,0 +1,44 @@
+from pycobosafe.watch import Change, Watcher, diff_models
+
+CHAIN = "bsc-main"
+
+COBO_SAFE = "0x70bcb58b10f24bc2d95E77C9facBB276a7b4c150"
+AUTH = "0xeaF95b67170Fca1E5C026880287e77b3638b2F81"
+ROLE_MANAGER = "0x000000000000000000000000000000000000dEaD"
+
+
+def test_diff_models():
+    old = {"Owner": "a", "Authorizers": {"trader": [AUTH]}, "Delegates": {"d": []}}
+    new = {"Owner": "b", "Authorizers": {"trader": []}, "Roles": ["trader"]}
+    assert diff_models(COBO_SAFE, old, new) == [
+        Change(COBO_SAFE, ("Owner",), "changed", "a", "b"),
+        Change(COBO_SAFE, ("Authorizers", "trader"), "removed", old=AUTH),
+        Change(COBO_SAFE, ("Delegates",), "removed", old={"d": []}),
+        Change(COBO_SAFE, ("Roles",), "added", new=["trader"]),
+    ]
+    assert diff_models(COBO_SAFE, new, new) == []
+
+
+def test_watcher():
+    watcher = Watcher(COBO_SAFE.lower())
+    account = watcher.models[COBO_SAFE]
+    assert account["Role manager"] in watcher.models
+    assert account["Authorizer"] in watcher.models
+    assert watcher.poll() == []
+
+
+class _RoleManagerLogs(object):
+    def iter_logs(self, from_block, to_block, addrs=None):
+        yield to_block, [{"address": ROLE_MANAGER.lower()}]
+
+
+def test_role_manager_changes():
+    # The root authorizer is read again for its delegates.
+    watcher = Watcher.__new__(Watcher)
+    watcher.indexer = _RoleManagerLogs()
+    watcher.models = {
+        COBO_SAFE: {"Role manager": ROLE_MANAGER, "Authorizer": AUTH},
+        ROLE_MANAGER: {},
+        AUTH: {},
+    }
+    assert watcher.changed_contracts(1, 2) == [ROLE_MANAGER, AUTH]
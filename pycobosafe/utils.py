@@ -1,28 +1,52 @@
 import json
 import os
 import random
-import warnings
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 
-import eth_abi
-import eth_utils
-from brownie import Contract, accounts, network, web3
-from brownie.network.contract import _ContractMethod, _get_tx
+# brownie, web3 and eth_abi are imported on first use, so the CLI starts fast.
 
 BASE = os.path.dirname(__file__)
 ABI_DIR = os.path.join(BASE, "abi")
 
+# Cached brownie network names, refreshed when the brownie network config
+# changes.
+CHAINS_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".pycobosafe", "chains.json")
+BROWNIE_NETWORK_CONFIG = os.path.join(
+    os.path.expanduser("~"), ".brownie", "network-config.yaml"
+)
+
 
 def printline():
     print("-" * 40)
 
 
+# ABI name -> parsed ABI. Each ABI is parsed once on first use.
+_ABI_CACHE = {}
+
+# (chain id, name, address, sender) -> brownie Contract, least recently used
+# ones are dropped first.
+CONTRACT_CACHE_SIZE = 1024
+_CONTRACT_CACHE = OrderedDict()
+
+_cache_lock = threading.Lock()
+
+
 def load_abi(name):
-    path = os.path.join(ABI_DIR, f"{name}.json")
-    assert os.path.exists(path), f"{path} not exists"
-    return json.load(open(path))
+    abi = _ABI_CACHE.get(name)
+    if abi is None:
+        path = os.path.join(ABI_DIR, f"{name}.json")
+        assert os.path.exists(path), f"{path} not exists"
+        with open(path) as f:
+            abi = json.load(f)
+        _ABI_CACHE[name] = abi
+    return abi
 
 
 def b32(name):
+    import eth_abi
+
     if type(name) is str:
         name = bytes(name, "ascii")
 
@@ -35,21 +59,40 @@ def s32(data):
     return data
 
 
+@lru_cache(maxsize=4096)
 def func_selector(func_signature: str):
+    import eth_utils
+
     return eth_utils.keccak(text=func_signature)[:4]
 
 
-def abi_encode_with_sig(func_signature, args=[]):
-    selector = func_selector(func_signature)
+@lru_cache(maxsize=4096)
+def get_encoder(func_signature):
+    """
+    Returns (selector, encoder of the argument tuple) of the function,
+    the signature is hashed and parsed only once.
+    """
+    from eth_abi.registry import registry
+
     arg_sig = func_signature[func_signature.index("(") :]
 
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=DeprecationWarning)
-        return selector + eth_abi.encode_single(arg_sig, args)
+    # The arguments are encoded as one tuple `arg_sig`, like the deprecated
+    # `eth_abi.encode_single(arg_sig, args)`, so dynamic params get the
+    # same head/tail layout as calldata.
+    return func_selector(func_signature), registry.get_encoder(arg_sig)
+
 
-    # Can NOT replace with eth_abi.encode([arg_sig], [args]) due to dynamic paras abi-encoding.
-    # eth_abi.encode will treat `arg_sig` as a tuple, not args list.
-    # but encode_single warns DeprecationWarning, catch it.
+def abi_encode_with_sig(func_signature, args=[]):
+    selector, encoder = get_encoder(func_signature)
+    return selector + encoder(args)
+
+
+def abi_encode_many(func_signature, args_list):
+    """
+    Batch version of `abi_encode_with_sig`, returns calldata of each args.
+    """
+    selector, encoder = get_encoder(func_signature)
+    return [selector + encoder(args) for args in args_list]
 
 
 def rand_salt():
@@ -69,6 +112,8 @@ def load_account(prikey_or_name):
     if not prikey_or_name:
         return None
 
+    from brownie import accounts
+
     try:
         return accounts.load(prikey_or_name)
     except Exception:
@@ -81,49 +126,146 @@ def load_account(prikey_or_name):
                 return prikey_or_name
 
 
+CHAIN_ALIASES = {
+    "eth": "mainnet",
+    "arb": "arbitrum-main",
+    "op": "optimism-main",
+    "bsc": "bsc-main",
+    "matic": "polygon-main",
+    "avax": "avax-main",
+}
+
+
 def get_current_chain():
+    from brownie import network
+
     return network.show_active()
 
 
 def connect_new_chain(new_chain):
+    from brownie import network
+
+    from .fanout import install_rate_limiter
+
+    setup_brownie()
     current_chain = get_current_chain()
     if new_chain and current_chain != new_chain:
         if network.is_connected():
             network.disconnect()
         network.connect(new_chain)
+    # All requests are limited, not only those of concurrent dumps.
+    install_rate_limiter()
+
+
+def _network_config_mtime():
+    try:
+        return os.path.getmtime(BROWNIE_NETWORK_CONFIG)
+    except OSError:
+        return None
 
 
 def get_all_support_chains():
-    return list(network.main.CONFIG.networks.keys())
+    """
+    Network names of brownie config. Cached in CHAINS_CACHE_PATH, so the
+    CLI can list them without loading brownie.
+    """
+    mtime = _network_config_mtime()
+    try:
+        with open(CHAINS_CACHE_PATH) as f:
+            cached = json.load(f)
+        if cached["mtime"] == mtime:
+            return cached["chains"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
 
+    from brownie import network
 
-def load_contract(name, address, abi=None, sender=None):
-    if abi is None:
-        abi = load_abi(name)
-    assert type(abi) is list, f"Invalid ABI {abi}"
+    setup_brownie()
+    chains = list(network.main.CONFIG.networks.keys())
+    try:
+        os.makedirs(os.path.dirname(CHAINS_CACHE_PATH), exist_ok=True)
+        with open(CHAINS_CACHE_PATH, "w") as f:
+            json.dump({"mtime": mtime, "chains": chains}, f)
+    except OSError:
+        pass
+    return chains
+
+
+def load_contract(name, address, abi=None, sender=None, chain=None):
+    if chain is not None:
+        # Read-only contract on the chain handle, see `chains.Chain`.
+        return chain.contract(name, address, abi)
 
+    from brownie import Contract, accounts, network
+
+    setup_brownie()
     if sender is None:
         sender = accounts.default
 
-    return Contract.from_abi(name, address, abi, sender)
+    if abi is not None:
+        assert type(abi) is list, f"Invalid ABI {abi}"
+        return Contract.from_abi(name, address, abi, sender)
+
+    # Contracts of bundled ABI are shared.
+    key = (network.chain.id, name, str(address).lower(), str(sender))
+    with _cache_lock:
+        contract = _CONTRACT_CACHE.get(key)
+        if contract is not None:
+            _CONTRACT_CACHE.move_to_end(key)
+            return contract
+
+    abi = load_abi(name)
+    assert type(abi) is list, f"Invalid ABI {abi}"
+    contract = Contract.from_abi(name, address, abi, sender)
+
+    with _cache_lock:
+        _CONTRACT_CACHE[key] = contract
+        while len(_CONTRACT_CACHE) > CONTRACT_CACHE_SIZE:
+            _CONTRACT_CACHE.popitem(last=False)
+    return contract
 
 
 FACTORY_ADDRESS = "0xC0B00000e19D71fA50a9BB1fcaC2eC92fac9549C"
 
-network.main.CONFIG.networks["avax-main"]["host"] = "https://rpc.ankr.com/avalanche"
-network.main.CONFIG.networks["polygon-main"]["host"] = "https://rpc.ankr.com/polygon"
-network.main.CONFIG.networks["mainnet"]["host"] = "https://rpc.ankr.com/eth"
+# Public RPCs used instead of the brownie defaults.
+CHAIN_HOSTS = {
+    "avax-main": "https://rpc.ankr.com/avalanche",
+    "polygon-main": "https://rpc.ankr.com/polygon",
+    "mainnet": "https://rpc.ankr.com/eth",
+}
+
+_brownie_ready = False
 
 
 # Add `build()` support to brownie contract container.
 def _build_tx(self, *args):
+    from brownie.network.contract import _get_tx
+
     args, tx = _get_tx(self._owner, args)
     tx["to"] = self._address
     tx["data"] = self.encode_input(*args)
     return tx
 
 
-_ContractMethod.build = _build_tx
+def setup_brownie():
+    """
+    Set RPC hosts of brownie config and patch brownie contracts. Runs once,
+    before brownie is used.
+    """
+    global _brownie_ready
+    if _brownie_ready:
+        return
+
+    from brownie import network
+    from brownie.network.contract import _ContractMethod
+
+    with _cache_lock:
+        if not _brownie_ready:
+            for name, host in CHAIN_HOSTS.items():
+                network.main.CONFIG.networks[name]["host"] = host
+            _ContractMethod.build = _build_tx
+            _brownie_ready = True
+
 
 SCAN_URLS = {
     1: "https://etherscan.io/address/",  # mainnet
@@ -136,6 +278,8 @@ SCAN_URLS = {
 
 
 def get_address_url(addr):
+    from brownie import web3
+
     chainid = web3.chain_id
     assert chainid in SCAN_URLS, f"Unsupport chain {chainid} {get_current_chain()}"
     return SCAN_URLS[chainid] + str(addr)
@@ -0,0 +1,210 @@
+import time
+
+import eth_utils
+
+from .export import to_plain
+from .indexer import EventIndexer
+from .snapshot import at_block
+
+# Seconds between two polls.
+POLL_INTERVAL = 12
+
+
+class Change(object):
+    """
+    One difference of a contract model, eg: a role granted to a delegate.
+    `op` is one of "added", "removed" and "changed".
+    """
+
+    def __init__(self, address, path, op, old=None, new=None) -> None:
+        self.address = address
+        self.path = path
+        self.op = op
+        self.old = old
+        self.new = new
+
+    def __eq__(self, other):
+        return isinstance(other, Change) and vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        path = ".".join(self.path)
+        if self.op == "added":
+            return f"+ {self.address} {path}: {self.new}"
+        if self.op == "removed":
+            return f"- {self.address} {path}: {self.old}"
+        return f"~ {self.address} {path}: {self.old} -> {self.new}"
+
+
+def diff_models(address, old, new, path=()):
+    """
+    Returns the list of `Change` from model `old` to `new`.
+    Lists are compared as sets, as in the contracts.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in list(old) + [k for k in new if k not in old]:
+            sub = path + (str(key),)
+            if key not in new:
+                changes.append(Change(address, sub, "removed", old=old[key]))
+            elif key not in old:
+                changes.append(Change(address, sub, "added", new=new[key]))
+            else:
+                changes += diff_models(address, old[key], new[key], sub)
+        return changes
+
+    if isinstance(old, list) and isinstance(new, list):
+        changes = [Change(address, path, "removed", old=x) for x in old if x not in new]
+        changes += [Change(address, path, "added", new=x) for x in new if x not in old]
+        return changes
+
+    if old != new:
+        return [Change(address, path, "changed", old, new)]
+    return []
+
+
+def get_children(model):
+    """
+    Addresses of children contracts referred by a flat model.
+    """
+    children = []
+    for key in ("Role manager", "Authorizer"):
+        if model.get(key):
+            children.append(model[key])
+    for auths in model.get("Authorizers", {}).values():
+        children += auths
+    return children
+
+
+class Watcher(object):
+    """
+    Follow the roles, delegates, authorizers and authorizer whitelists of
+    a Cobo account, and report what changes.
+
+    Each poll fetches the logs of the watched contracts since the last
+    poll with the chunked log reader of `EventIndexer`, and reads again
+    only the contracts that emitted events. Root authorizers are read again
+    too when the role manager of their account does, for their delegates.
+    """
+
+    def __init__(self, addr, chain=None) -> None:
+        self.address = eth_utils.to_checksum_address(str(addr))
+        self.chain = chain
+        self.block = None
+        self.indexer = EventIndexer(chain=chain)
+
+        # address -> flat model, without children.
+        self.models = {}
+        self.start()
+
+    @property
+    def web3(self):
+        if self.chain is not None:
+            return self.chain.web3
+
+        from brownie import web3
+
+        return web3
+
+    def read(self, addrs):
+        """
+        Read flat models of contracts, and the new children they refer to.
+        """
+        from .autocontract import convert
+        from .fanout import run_in_order
+
+        addrs = list(dict.fromkeys(addrs))
+
+        def _read(addr):
+            def _run():
+                obj = convert(addr, self.chain)
+                return None if obj is None else to_plain(obj.get_config())
+
+            return _run
+
+        models = {}
+        with at_block(self.block, self.chain):
+            while addrs:
+                results = run_in_order([_read(addr) for addr in addrs])
+                models.update(zip(addrs, results))
+                addrs = [
+                    child
+                    for model in results
+                    if model
+                    for child in get_children(model)
+                    if child not in models and child not in self.models
+                ]
+                addrs = list(dict.fromkeys(addrs))
+        return models
+
+    def start(self):
+        self.block = self.web3.eth.block_number
+        self.models = self.read([self.address])
+
+    def changed_contracts(self, from_block, to_block):
+        """
+        Addresses of watched contracts with logs in the block range, and
+        root authorizers of changed role managers.
+        """
+        changed = []
+        for _, logs in self.indexer.iter_logs(from_block, to_block, self.models):
+            changed += [eth_utils.to_checksum_address(log["address"]) for log in logs]
+
+        # Delegates of a root authorizer are read from the role manager of
+        # its account.
+        for model in self.models.values():
+            if model and model.get("Role manager") in changed:
+                changed.append(model.get("Authorizer"))
+        return [addr for addr in dict.fromkeys(changed) if addr]
+
+    def _tree(self, models):
+        """
+        Addresses reachable from the account in `models`.
+        """
+        found = []
+        todo = [self.address]
+        while todo:
+            addr = todo.pop(0)
+            if addr in found or models.get(addr) is None:
+                continue
+            found.append(addr)
+            todo += get_children(models[addr])
+        return found
+
+    def poll(self):
+        """
+        Returns the list of `Change` since the last poll.
+        """
+        head = self.web3.eth.block_number
+        if head <= self.block:
+            return []
+
+        try:
+            changed = self.changed_contracts(self.block + 1, head)
+        except Exception:
+            # Logs not available, read everything again.
+            changed = list(self.models)
+
+        self.block = head
+        if not changed:
+            return []
+
+        models = dict(self.models)
+        models.update(self.read(changed))
+
+        changes = []
+        tree = self._tree(models)
+        for addr in list(models):
+            if addr not in tree:
+                models.pop(addr)
+            elif addr in changed and addr in self.models:
+                changes += diff_models(addr, self.models[addr], models[addr])
+        self.models = models
+        return changes
+
+    def watch(self, interval=POLL_INTERVAL):
+        """
+        Yield `Change`s as they happen, forever.
+        """
+        while True:
+            yield from self.poll()
+            time.sleep(interval)